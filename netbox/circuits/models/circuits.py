@@ -165,6 +165,8 @@ class CircuitGroup(OrganizationalModel):
         null=True
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('circuit group')
@@ -37,6 +37,8 @@ class Provider(ContactsMixin, PrimaryModel):
 
     clone_fields = ()
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         verbose_name = _('provider')
@@ -115,6 +117,8 @@ class ProviderNetwork(PrimaryModel):
         verbose_name=_('service ID')
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('provider', 'name')
         constraints = (
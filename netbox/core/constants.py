@@ -4,9 +4,17 @@ from django.utils.translation import gettext_lazy as _
 from rq.job import JobStatus
 
 __all__ = (
+    'CHANGELOG_PARTITION_PREMAKE',
+    'EXPORT_FILE_PATH',
     'RQ_TASK_STATUSES',
 )
 
+# Number of future monthly partitions to maintain for a partitioned changelog table
+CHANGELOG_PARTITION_PREMAKE = 3
+
+# Storage path (relative to MEDIA_ROOT or the configured storage backend) under which export job output is saved
+EXPORT_FILE_PATH = 'exports'
+
 
 @dataclass
 class Status:
@@ -1,8 +1,17 @@
+import gzip
 import logging
+import tempfile
 
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from extras.models import ExportTemplate, Notification
 from netbox.jobs import JobRunner
 from netbox.search.backends import search_backend
+from utilities.export import stream_table_csv, stream_yaml
 from .choices import DataSourceStatusChoices
+from .constants import EXPORT_FILE_PATH
+from .events import JOB_COMPLETED, JOB_ERRORED
 from .exceptions import SyncError
 from .models import DataSource
 
@@ -31,3 +40,81 @@ class SyncDataSourceJob(JobRunner):
             if type(e) is SyncError:
                 logging.error(e)
             raise e
+
+
+class ExportJob(JobRunner):
+    """
+    Render an export of a set of objects (as CSV, YAML, or using an export template) and save it to a file.
+    """
+
+    class Meta:
+        name = 'Export'
+
+    def get_content(self, queryset, table=None, exclude_columns=None, template=None):
+        """
+        Return an iterator yielding the rendered export, along with the number of lines which precede the first
+        object (if the number of objects can be derived from the output).
+        """
+        if table is not None:
+            table = table(queryset, user=self.job.user)
+            return stream_table_csv(table, exclude_columns=exclude_columns), 1
+        if template is not None:
+            template = ExportTemplate.objects.get(pk=template)
+            return template.render_stream(queryset), None
+        return stream_yaml(queryset), 0
+
+    def notify(self, event_type):
+        if self.job.user:
+            Notification(user=self.job.user, object=self.job, event_type=event_type).save()
+
+    def run(self, model, query, filename, content_type, table=None, exclude_columns=None, template=None,
+            compress=False, *args, **kwargs):
+        """
+        Args:
+            model: The model being exported
+            query: The Query of the QuerySet to be exported (QuerySets themselves cannot be pickled without evaluating
+                them)
+            filename: The name of the file to be saved
+            content_type: The MIME type of the rendered output
+            table: The Table class used to render CSV output
+            exclude_columns: Names of table columns to omit from CSV output
+            template: The ID of the ExportTemplate used to render the output
+            compress: Compress the output file using gzip
+        """
+        queryset = model._default_manager.all()
+        queryset.query = query
+
+        try:
+            content, header_lines = self.get_content(queryset, table, exclude_columns, template)
+            if compress:
+                filename = f'{filename}.gz'
+                content_type = 'application/gzip'
+
+            # Write the output to a temporary file as it is rendered, then hand the file off to the storage backend
+            chunks = 0
+            with tempfile.TemporaryFile() as f:
+                output = gzip.GzipFile(filename=filename, mode='wb', fileobj=f) if compress else f
+                for chunk in content:
+                    output.write(chunk.encode('utf-8'))
+                    chunks += 1
+                if compress:
+                    output.close()
+                size = f.tell()
+                f.seek(0)
+                path = default_storage.save(f'{EXPORT_FILE_PATH}/{self.job.job_id}_{filename}', File(f))
+
+        except Exception:
+            self.notify(JOB_ERRORED)
+            raise
+
+        self.job.data = {
+            'export': {
+                'filename': filename,
+                'path': path,
+                'content_type': content_type,
+                'compressed': compress,
+                'size': size,
+                'rows': chunks - header_lines if header_lines is not None else None,
+            }
+        }
+        self.notify(JOB_COMPLETED)
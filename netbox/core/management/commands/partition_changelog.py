@@ -0,0 +1,204 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.constants import CHANGELOG_PARTITION_PREMAKE
+from core.models import ObjectChange
+from utilities.partitioning import (
+    create_default_partition, ensure_monthly_partitions, is_partitioned, month_start, next_month,
+)
+
+
+class Command(BaseCommand):
+    help = "Convert the changelog (ObjectChange) table to a table partitioned by month"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=50000, dest='batch_size',
+            help="Number of records to copy per transaction (default: 50000)"
+        )
+        parser.add_argument(
+            '--drop-old', action='store_true', dest='drop_old',
+            help="Drop the original (unpartitioned) table once the migration has completed"
+        )
+        parser.add_argument(
+            "--no-input", action='store_true', dest='no_input',
+            help="Do not prompt user for any input/confirmation"
+        )
+
+    def execute_sql(self, sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            if cursor.description:
+                return cursor.fetchall()
+
+    def get_indexes(self, table):
+        """
+        Return the name and definition of each non-primary key index on the given table.
+        """
+        return self.execute_sql(
+            "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = %s::regclass AND NOT i.indisprimary",
+            [table]
+        )
+
+    def get_foreign_keys(self, table):
+        """
+        Return the name and definition of each foreign key constraint on the given table.
+        """
+        return self.execute_sql(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table]
+        )
+
+    def copy_rows(self, source, target, after, until):
+        return self.execute_sql(
+            f'INSERT INTO "{target}" SELECT * FROM "{source}" WHERE id > %s AND id <= %s',
+            [after, until]
+        )
+
+    def copy_missing_rows(self, source, target, after=0):
+        """
+        Copy all rows with IDs greater than `after` not yet present in the target table. This catches any rows which
+        were committed only after the batch spanning their IDs had been copied (as IDs are allocated before a
+        transaction commits).
+        """
+        return self.execute_sql(
+            f'INSERT INTO "{target}" SELECT * FROM "{source}" s '
+            f'WHERE s.id > %s AND NOT EXISTS (SELECT 1 FROM "{target}" t WHERE t.id = s.id)',
+            [after]
+        )
+
+    def get_watermark(self, table):
+        """
+        Return the highest ID allocated thus far for the given table, once every transaction which may have been
+        allocated an ID up to it has completed. Any records committed subsequently will have greater IDs.
+        """
+        sequence = self.execute_sql("SELECT pg_get_serial_sequence(%s, 'id')", [table])[0][0]
+        watermark = self.execute_sql(
+            f'SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END FROM {sequence}'
+        )[0][0]
+
+        # A transaction which has been allocated an ID holds a ROW EXCLUSIVE lock on the table until it completes.
+        # Acquiring a SHARE lock waits for all such transactions; writes are blocked only until it has been granted.
+        with transaction.atomic():
+            self.execute_sql(f'LOCK TABLE "{table}" IN SHARE MODE')
+
+        return watermark
+
+    def handle(self, *args, **options):
+        table = ObjectChange._meta.db_table
+        new_table = f'{table}_partitioned'
+        old_table = f'{table}_old'
+        batch_size = options['batch_size']
+
+        if is_partitioned(table):
+            self.stdout.write(self.style.SUCCESS(f"The {table} table is already partitioned; nothing to do."))
+            return
+        for name in (new_table, old_table):
+            if self.execute_sql("SELECT to_regclass(%s)", [name])[0][0] is not None:
+                raise CommandError(
+                    f"Table {name} already exists. It may be left over from an earlier attempt and must be removed "
+                    f"before proceeding."
+                )
+
+        first_time, max_id = self.execute_sql(f'SELECT MIN(time), MAX(id) FROM "{table}"')[0]
+        max_id = max_id or 0
+        if not options['no_input']:
+            self.stdout.write(self.style.WARNING(
+                f"This will copy all changelog records (up to ID {max_id}) into a new partitioned table and swap it "
+                f"in place of {table}. Writes to the changelog are blocked only during the final check for missed "
+                f"records and the swap."
+            ))
+            confirmation = input("Type yes to confirm: ")
+            if confirmation != 'yes':
+                self.stdout.write(self.style.SUCCESS("Aborting"))
+                return
+
+        # Create the new partitioned table. The partition key must be included in the primary key, and PostgreSQL
+        # does not support identity columns on partitioned tables, so a regular sequence is used instead.
+        self.stdout.write(f"Creating partitioned table {new_table}...")
+        indexes = self.get_indexes(table)
+        foreign_keys = self.get_foreign_keys(table)
+        with transaction.atomic():
+            self.execute_sql(
+                f'CREATE TABLE "{new_table}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+                f'PARTITION BY RANGE (time)'
+            )
+            self.execute_sql(f'CREATE SEQUENCE "{new_table}_id_seq" OWNED BY "{new_table}".id')
+            self.execute_sql(
+                f'ALTER TABLE "{new_table}" ALTER COLUMN id SET DEFAULT nextval(%s)',
+                [f'{new_table}_id_seq']
+            )
+            self.execute_sql(
+                f'ALTER TABLE "{new_table}" ADD CONSTRAINT "{new_table}_pkey" PRIMARY KEY (id, time)'
+            )
+            for name, definition in foreign_keys:
+                self.execute_sql(f'ALTER TABLE "{new_table}" ADD CONSTRAINT "{name}" {definition}')
+            for name, definition in indexes:
+                definition = definition.replace(f'INDEX {name} ON', f'INDEX "{name}_p" ON', 1)
+                definition = definition.replace(f' {table} USING', f' "{new_table}" USING', 1)
+                definition = definition.replace(f'.{table} USING', f'."{new_table}" USING', 1)
+                self.execute_sql(definition)
+
+            # Create monthly partitions spanning all existing records, plus a default partition as a safety net
+            now = timezone.now()
+            ensure_monthly_partitions(
+                table,
+                start=first_time or now,
+                end=next_month(month_start(now), CHANGELOG_PARTITION_PREMAKE),
+                parent=new_table
+            )
+            create_default_partition(table, parent=new_table)
+
+        # Copy existing records in batches, each in its own short transaction
+        self.stdout.write(f"Copying records with IDs up to {max_id}...")
+        copied = 0
+        while copied < max_id:
+            until = min(copied + batch_size, max_id)
+            with transaction.atomic():
+                self.copy_rows(table, new_table, copied, until)
+            copied = until
+            self.stdout.write(f"\r  {copied}/{max_id}", ending='')
+            self.stdout.flush()
+        self.stdout.write('')
+
+        # Copy any records created (or committed) in the meantime, once without blocking writes, and again once the
+        # table has been locked to catch those which remain. As all records up to the watermark have been committed
+        # by the time of the first pass, the second (which blocks writes) need only consider records beyond it. Then
+        # swap the tables.
+        self.stdout.write("Copying records created during the migration...")
+        watermark = self.get_watermark(table)
+        with transaction.atomic():
+            self.copy_missing_rows(table, new_table)
+        self.stdout.write("Swapping tables...")
+        with transaction.atomic():
+            self.execute_sql(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE')
+            self.copy_missing_rows(table, new_table, after=watermark)
+            final_id = self.execute_sql(f'SELECT COALESCE(MAX(id), 0) FROM "{table}"')[0][0]
+
+            # Continue numbering from where the original table's sequence left off
+            old_sequence = self.execute_sql("SELECT pg_get_serial_sequence(%s, 'id')", [table])[0][0]
+            last_id = self.execute_sql(f'SELECT last_value FROM {old_sequence}')[0][0]
+            self.execute_sql("SELECT setval(%s, %s, false)", [f'{new_table}_id_seq', max(last_id, final_id) + 1])
+
+            self.execute_sql(f'ALTER TABLE "{table}" RENAME TO "{old_table}"')
+            self.execute_sql(f'ALTER TABLE "{old_table}" RENAME CONSTRAINT "{table}_pkey" TO "{old_table}_pkey"')
+            for name, _ in indexes:
+                self.execute_sql(f'ALTER INDEX "{name}" RENAME TO "{name}_old"')
+            self.execute_sql(f'ALTER TABLE "{new_table}" RENAME TO "{table}"')
+            self.execute_sql(f'ALTER TABLE "{table}" RENAME CONSTRAINT "{new_table}_pkey" TO "{table}_pkey"')
+            for name, _ in indexes:
+                self.execute_sql(f'ALTER INDEX "{name}_p" RENAME TO "{name}"')
+
+        self.execute_sql(f'ANALYZE "{table}"')
+        if options['drop_old']:
+            self.stdout.write(f"Dropping table {old_table}...")
+            self.execute_sql(f'DROP TABLE "{old_table}"')
+            self.execute_sql(f'ALTER SEQUENCE "{new_table}_id_seq" RENAME TO "{table}_id_seq"')
+        else:
+            self.stdout.write(f"The original table has been retained as {old_table}; it may be dropped once verified.")
+
+        self.stdout.write(self.style.SUCCESS("Finished."))
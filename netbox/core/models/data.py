@@ -299,6 +299,8 @@ class DataFile(models.Model):
 
     objects = RestrictedQuerySet.as_manager()
 
+    display_field = 'path'
+
     class Meta:
         ordering = ('source', 'path')
         constraints = (
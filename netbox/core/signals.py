@@ -2,8 +2,9 @@ import logging
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.db.models.fields.reverse_related import ManyToManyRel
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import model_deletes, model_inserts, model_updates
@@ -16,6 +17,7 @@ from extras.utils import run_validators
 from netbox.config import get_config
 from netbox.context import current_request, events_queue
 from netbox.models.features import ChangeLoggingMixin
+from utilities.changes import increment_change_counter
 from utilities.exceptions import AbortRequest
 from .models import ConfigRevision
 
@@ -178,6 +180,28 @@ def clear_events_queue(sender, **kwargs):
     events_queue.set({})
 
 
+#
+# Change counters
+#
+
+@receiver((post_save, post_delete))
+def handle_change_counter(sender, **kwargs):
+    """
+    Increment the change counter for the model of an object which has been created, updated, or deleted.
+    """
+    increment_change_counter(sender)
+
+
+@receiver(m2m_changed)
+def handle_m2m_change_counter(sender, instance, action, model, **kwargs):
+    """
+    Increment the change counters for the models on both sides of a modified many-to-many relationship.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        increment_change_counter(type(instance))
+        increment_change_counter(model)
+
+
 #
 # DataSource handlers
 #
@@ -199,3 +223,16 @@ def update_config(sender, instance, **kwargs):
     Update the cached NetBox configuration when a new ConfigRevision is created.
     """
     instance.activate()
+
+
+#
+# Job handlers
+#
+
+@receiver(post_delete, sender='core.Job')
+def delete_export_file(sender, instance, **kwargs):
+    """
+    Delete any file generated by an export job when the job is deleted.
+    """
+    if isinstance(instance.data, dict) and (export := instance.data.get('export')):
+        default_storage.delete(export['path'])
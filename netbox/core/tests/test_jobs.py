@@ -0,0 +1,139 @@
+import gzip
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from django_rq import get_queue
+
+from core.choices import JobStatusChoices
+from core.events import JOB_COMPLETED
+from core.jobs import ExportJob
+from core.models import Job, ObjectType
+from dcim.models import DeviceType, Manufacturer, Site
+from dcim.tables import SiteTable
+from extras.models import ExportTemplate, Notification
+from utilities.testing import TestCase
+
+
+class ExportJobTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        DeviceType.objects.bulk_create([
+            DeviceType(manufacturer=manufacturer, model=f'Device Type {i}', slug=f'device-type-{i}')
+            for i in range(1, 3)
+        ])
+
+    def setUp(self):
+        super().setUp()
+
+        # Save exported files to a temporary directory
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def tearDown(self):
+        super().tearDown()
+
+        # Clear all queues after running each test
+        get_queue('default').connection.flushall()
+
+    def run_export(self, queryset, **kwargs):
+        job = ExportJob.enqueue(
+            immediate=True,
+            user=self.user,
+            model=queryset.model,
+            query=queryset.query,
+            content_type='text/plain',
+            **kwargs
+        )
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED, job.error)
+        return job
+
+    def read_export(self, job):
+        with default_storage.open(job.data['export']['path']) as f:
+            return f.read()
+
+    def test_export_table(self):
+        queryset = Site.objects.order_by('name')
+        job = self.run_export(
+            queryset,
+            filename='sites.csv',
+            table=SiteTable,
+            exclude_columns={'pk', 'actions'}
+        )
+        content = self.read_export(job).decode()
+        export = job.data['export']
+
+        self.assertEqual(export['filename'], 'sites.csv')
+        self.assertEqual(export['rows'], 3)
+        self.assertEqual(export['size'], len(content.encode()))
+        self.assertEqual(len(content.splitlines()), 4)
+        self.assertIn('Site 3', content.splitlines()[3])
+
+        # The user should be notified upon completion
+        notification = Notification.objects.get(user=self.user)
+        self.assertEqual(notification.object, job)
+        self.assertEqual(notification.event_type, JOB_COMPLETED)
+
+    def test_export_yaml_compressed(self):
+        queryset = DeviceType.objects.order_by('model')
+        job = self.run_export(queryset, filename='device_types.yaml', compress=True)
+        export = job.data['export']
+
+        self.assertEqual(export['filename'], 'device_types.yaml.gz')
+        self.assertEqual(export['rows'], 2)
+        self.assertTrue(export['compressed'])
+        self.assertEqual(
+            gzip.decompress(self.read_export(job)).decode(),
+            '---\n'.join(device_type.to_yaml() for device_type in queryset)
+        )
+
+    def test_export_template(self):
+        export_template = ExportTemplate.objects.create(
+            name='Test',
+            template_code='{% for site in queryset %}{{ site.name }}\n{% endfor %}'
+        )
+        export_template.object_types.set([ObjectType.objects.get_for_model(Site)])
+        job = self.run_export(Site.objects.order_by('name'), filename='sites.txt', template=export_template.pk)
+
+        self.assertEqual(self.read_export(job).decode(), 'Site 1\nSite 2\nSite 3\n')
+        self.assertIsNone(job.data['export']['rows'])
+
+    def test_delete_job(self):
+        job = self.run_export(DeviceType.objects.all(), filename='device_types.yaml')
+        path = job.data['export']['path']
+        self.assertTrue(default_storage.exists(path))
+
+        job.delete()
+        self.assertFalse(default_storage.exists(path))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_export_view(self):
+        response = self.client.get(f'{reverse("dcim:site_list")}?name=Site 1&export=table&background=true')
+        self.assertHttpStatus(response, 302)
+        self.assertEqual(response.url, f'{reverse("dcim:site_list")}?name=Site+1')
+
+        job = Job.objects.get(name=ExportJob.name)
+        self.assertEqual(job.user, self.user)
+        self.assertEqual(job.status, JobStatusChoices.STATUS_PENDING)
+
+    def test_download(self):
+        job = self.run_export(DeviceType.objects.all(), filename='device_types.yaml')
+        url = reverse('core:job_download', kwargs={'pk': job.pk})
+
+        response = self.client.get(url)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.read_export(job))
+        self.assertIn('filename="device_types.yaml"', response['Content-Disposition'])
+
+        # Exports may be downloaded only by the user who requested them
+        Job.objects.filter(pk=job.pk).update(user=None)
+        self.assertHttpStatus(self.client.get(url), 404)
@@ -0,0 +1,123 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.choices import ObjectChangeActionChoices
+from core.management.commands.partition_changelog import Command as PartitionChangelogCommand
+from core.models import ObjectChange, ObjectType
+from dcim.models import Site
+from extras.management.commands.housekeeping import Command as HousekeepingCommand
+from utilities.partitioning import get_partitions, is_partitioned, month_start
+
+TABLE = ObjectChange._meta.db_table
+
+
+class PartitionChangelogTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        object_type = ObjectType.objects.get_for_model(Site)
+        ObjectChange.objects.bulk_create([
+            ObjectChange(
+                user_name='user1',
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+                changed_object_type=object_type,
+                changed_object_id=i,
+                object_repr=f'Site {i}'
+            ) for i in range(1, 11)
+        ])
+
+        # Spread the records across the past ten months
+        now = timezone.now()
+        for i, pk in enumerate(ObjectChange.objects.order_by('pk').values_list('pk', flat=True)):
+            ObjectChange.objects.filter(pk=pk).update(time=now - timedelta(days=30 * i))
+
+    def partition_changelog(self):
+        call_command('partition_changelog', no_input=True, batch_size=3, stdout=StringIO())
+
+    def test_partition_changelog(self):
+        expected = list(ObjectChange.objects.order_by('pk').values_list('pk', 'time', 'object_repr'))
+        self.partition_changelog()
+
+        self.assertTrue(is_partitioned(TABLE))
+        self.assertEqual(list(ObjectChange.objects.order_by('pk').values_list('pk', 'time', 'object_repr')), expected)
+
+        # New records continue the original numbering
+        changed_object = ObjectChange.objects.first()
+        changed_object.pk = None
+        changed_object.save()
+        self.assertEqual(changed_object.pk, expected[-1][0] + 1)
+
+    def test_partition_changelog_late_commit(self):
+        """
+        Records which are committed only after the batch spanning their IDs has been copied must not be lost.
+        """
+        expected = list(ObjectChange.objects.order_by('pk').values_list('pk', flat=True))
+        copy_rows = PartitionChangelogCommand.copy_rows
+
+        def copy_rows_but_one(self, source, target, after, until):
+            # Simulate a record which is not yet visible while the first batch is copied
+            copy_rows(self, source, target, after, until)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM "{target}" WHERE id = %s', [expected[1]])
+
+        with patch.object(PartitionChangelogCommand, 'copy_rows', copy_rows_but_one):
+            self.partition_changelog()
+
+        self.assertEqual(list(ObjectChange.objects.order_by('pk').values_list('pk', flat=True)), expected)
+
+    def test_partition_changelog_locked_pass(self):
+        """
+        Once writes have been blocked, only records beyond the watermark recorded before the first pass are copied.
+        """
+        expected = list(ObjectChange.objects.order_by('pk').values_list('pk', flat=True))
+        copy_missing_rows = PartitionChangelogCommand.copy_missing_rows
+        watermarks = []
+
+        def copy_missing_rows_and_create(self, source, target, after=0):
+            copy_missing_rows(self, source, target, after)
+            watermarks.append(after)
+            if len(watermarks) == 1:
+                # Simulate a record created after the first pass
+                changed_object = ObjectChange.objects.first()
+                changed_object.pk = None
+                changed_object.save()
+                expected.append(changed_object.pk)
+
+        with patch.object(PartitionChangelogCommand, 'copy_missing_rows', copy_missing_rows_and_create):
+            self.partition_changelog()
+
+        self.assertEqual(watermarks[0], 0)
+        self.assertGreaterEqual(watermarks[1], expected[-2])
+        self.assertLess(watermarks[1], expected[-1])
+        self.assertEqual(list(ObjectChange.objects.order_by('pk').values_list('pk', flat=True)), expected)
+
+    def test_housekeeping(self):
+        self.partition_changelog()
+        cutoff = timezone.now() - timedelta(days=100)
+
+        # Partitions cannot be dropped while the checks of deferred constraints (deferred until the test transaction
+        # commits) are pending
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+        HousekeepingCommand(stdout=StringIO()).maintain_changelog_partitions(
+            SimpleNamespace(CHANGELOG_RETENTION=100), {'verbosity': 1}
+        )
+
+        # Expired partitions have been dropped, and any remaining expired records deleted
+        partitions = [p for p in get_partitions(TABLE) if not p.is_default]
+        self.assertEqual(partitions[0].start, month_start(cutoff))
+        self.assertFalse(ObjectChange.objects.filter(time__lt=cutoff).exists())
+        self.assertEqual(ObjectChange.objects.count(), 4)
+
+        # Partitions have been created for the upcoming months
+        self.assertGreater(partitions[-1].start, timezone.now())
@@ -24,6 +24,7 @@ urlpatterns = (
     path('jobs/delete/', views.JobBulkDeleteView.as_view(), name='job_bulk_delete'),
     path('jobs/<int:pk>/', views.JobView.as_view(), name='job'),
     path('jobs/<int:pk>/delete/', views.JobDeleteView.as_view(), name='job_delete'),
+    path('jobs/<int:pk>/download/', views.JobDownloadView.as_view(), name='job_download'),
 
     # Change logging
     path('changelog/', views.ObjectChangeListView.as_view(), name='objectchange_list'),
@@ -4,10 +4,11 @@ import platform
 from django import __version__ as DJANGO_VERSION
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.db import connection, ProgrammingError
-from django.http import HttpResponse, HttpResponseForbidden, Http404
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +26,7 @@ from rq.worker import Worker
 from rq.worker_registration import clean_worker_registry
 
 from netbox.config import get_config, PARAMS
+from netbox.graphql.extensions import get_heaviest_queries
 from netbox.views import generic
 from netbox.views.generic.base import BaseObjectView
 from netbox.views.generic.mixins import TableMixin
@@ -174,6 +176,23 @@ class JobView(generic.ObjectView):
     queryset = Job.objects.all()
 
 
+class JobDownloadView(LoginRequiredMixin, View):
+    """
+    Download the file generated by an export job. Files may be retrieved only by the user who requested the export.
+    """
+    def get(self, request, pk):
+        job = get_object_or_404(Job, pk=pk)
+        export = job.data.get('export') if isinstance(job.data, dict) else None
+        if not export or (job.user != request.user and not request.user.is_superuser):
+            raise Http404
+        try:
+            file = default_storage.open(export['path'])
+        except FileNotFoundError:
+            raise Http404
+
+        return FileResponse(file, as_attachment=True, filename=export['filename'], content_type=export['content_type'])
+
+
 class JobDeleteView(generic.ObjectDeleteView):
     queryset = Job.objects.all()
 
@@ -650,6 +669,7 @@ class SystemView(UserPassesTestMixin, View):
         return render(request, 'core/system.html', {
             'stats': stats,
             'config': config,
+            'graphql_queries': get_heaviest_queries(),
         })
 
 
@@ -1,3 +1,5 @@
+from rest_framework import serializers
+
 from dcim.choices import *
 from dcim.models import PowerFeed, PowerPanel
 from netbox.api.fields import ChoiceField, RelatedObjectCountField
@@ -64,13 +66,18 @@ class PowerFeedSerializer(NetBoxModelSerializer, CabledObjectSerializer, Connect
         required=False,
         allow_null=True
     )
+    allocated_power = serializers.IntegerField(
+        source='get_allocated_power',
+        read_only=True
+    )
 
     class Meta:
         model = PowerFeed
         fields = [
             'id', 'url', 'display_url', 'display', 'power_panel', 'rack', 'name', 'status', 'type', 'supply',
-            'phase', 'voltage', 'amperage', 'max_utilization', 'mark_connected', 'cable', 'cable_end', 'link_peers',
-            'link_peers_type', 'connected_endpoints', 'connected_endpoints_type', 'connected_endpoints_reachable',
-            'description', 'tenant', 'comments', 'tags', 'custom_fields', 'created', 'last_updated', '_occupied',
+            'phase', 'voltage', 'amperage', 'max_utilization', 'available_power', 'allocated_power', 'mark_connected',
+            'cable', 'cable_end', 'link_peers', 'link_peers_type', 'connected_endpoints', 'connected_endpoints_type',
+            'connected_endpoints_reachable', 'description', 'tenant', 'comments', 'tags', 'custom_fields', 'created',
+            'last_updated', '_occupied',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description', 'cable', '_occupied')
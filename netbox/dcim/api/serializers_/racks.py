@@ -14,6 +14,8 @@ from .sites import LocationSerializer, SiteSerializer
 
 __all__ = (
     'RackElevationDetailFilterSerializer',
+    'RackElevationListFilterSerializer',
+    'RackElevationSerializer',
     'RackReservationSerializer',
     'RackRoleSerializer',
     'RackSerializer',
@@ -186,3 +188,35 @@ class RackElevationDetailFilterSerializer(serializers.Serializer):
         required=False,
         default=True
     )
+
+
+class RackElevationListFilterSerializer(serializers.Serializer):
+    face = serializers.ChoiceField(
+        choices=DeviceFaceChoices,
+        default=DeviceFaceChoices.FACE_FRONT
+    )
+    unit_width = serializers.IntegerField(
+        default=ConfigItem('RACK_ELEVATION_DEFAULT_UNIT_WIDTH')
+    )
+    unit_height = serializers.IntegerField(
+        default=ConfigItem('RACK_ELEVATION_DEFAULT_UNIT_HEIGHT')
+    )
+    legend_width = serializers.IntegerField(
+        default=RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
+    )
+    margin_width = serializers.IntegerField(
+        default=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+    )
+    include_images = serializers.BooleanField(
+        required=False,
+        default=True
+    )
+
+
+class RackElevationSerializer(serializers.Serializer):
+    """
+    The elevation of one face of a rack, rendered as an SVG document.
+    """
+    rack = RackSerializer(nested=True, read_only=True)
+    face = ChoiceField(choices=DeviceFaceChoices, read_only=True)
+    svg = serializers.CharField(read_only=True)
@@ -1,24 +1,31 @@
+from django.db import transaction
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.routers import APIRootView
 from rest_framework.viewsets import ViewSet
 
+from circuits.models import Circuit, CircuitTermination, Provider, ProviderNetwork
+from core.api.serializers_.jobs import JobSerializer
 from dcim import filtersets
 from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
+from dcim.jobs import DeviceProvisioningJob
 from dcim.models import *
-from dcim.svg import CableTraceSVG
+from dcim.provisioning import defer_component_instantiation
+from dcim.svg import get_cable_trace_svg, get_rack_elevation_svgs
+from dcim.utils import get_cached_trace
 from extras.api.mixins import ConfigContextQuerySetMixin, RenderConfigMixin
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.metadata import ContentTypeMetadata
 from netbox.api.pagination import StripCountAnnotationsPaginator
 from netbox.api.viewsets import NetBoxModelViewSet, MPTTLockedMixin
-from netbox.api.viewsets.mixins import SequentialBulkCreatesMixin
 from utilities.api import get_serializer_for_model
 from utilities.query_functions import CollateAsChar
+from utilities.request import copy_safe_request
 from . import serializers
 from .exceptions import MissingFilterException
 
@@ -33,7 +40,15 @@ class DCIMRootView(APIRootView):
 
 # Mixins
 
+# Models whose objects may be represented as the link peers or connected endpoints of a cabled object
+CABLED_OBJECT_ETAG_MODELS = (
+    Cable, CablePath, CableTermination, Circuit, CircuitTermination, ConsolePort, ConsoleServerPort, Device,
+    FrontPort, Interface, PowerFeed, PowerOutlet, PowerPanel, PowerPort, Provider, ProviderNetwork, RearPort,
+)
+
+
 class PathEndpointMixin(object):
+    etag_models = CABLED_OBJECT_ETAG_MODELS
 
     @action(detail=True, url_path='trace')
     def trace(self, request, pk):
@@ -41,9 +56,7 @@ class PathEndpointMixin(object):
         Trace a complete cable path and return each segment as a three-tuple of (termination, cable, termination).
         """
         obj = get_object_or_404(self.queryset, pk=pk)
-
-        # Initialize the path array
-        path = []
+        base_url = request.build_absolute_uri('/')
 
         # Render SVG image if requested
         if request.GET.get('render', None) == 'svg':
@@ -51,10 +64,20 @@ class PathEndpointMixin(object):
                 width = int(request.GET.get('width', CABLE_TRACE_SVG_DEFAULT_WIDTH))
             except (ValueError, TypeError):
                 width = CABLE_TRACE_SVG_DEFAULT_WIDTH
-            drawing = CableTraceSVG(obj, base_url=request.build_absolute_uri('/'), width=width)
-            return HttpResponse(drawing.render().tostring(), content_type='image/svg+xml')
+            svg = get_cable_trace_svg(obj, base_url=base_url, width=width)
+            return HttpResponse(svg, content_type='image/svg+xml')
+
+        path = get_cached_trace(obj, ('json', base_url), lambda: self._serialize_trace(obj, request))
+
+        return Response(path)
+
+    @staticmethod
+    def _serialize_trace(obj, request):
+        """
+        Serialize the path objects of a trace, iterating over each three-tuple in the path.
+        """
+        path = []
 
-        # Serialize path objects, iterating over each three-tuple in the path
         for near_ends, cable, far_ends in obj.trace():
             if near_ends:
                 serializer_a = get_serializer_for_model(near_ends[0])
@@ -68,12 +91,14 @@ class PathEndpointMixin(object):
                 serializer_b = get_serializer_for_model(far_ends[0])
                 far_ends = serializer_b(far_ends, nested=True, many=True, context={'request': request}).data
 
-            path.append((near_ends, cable, far_ends))
+            # Discard the references of the serialized data to its serializers, so that it may be cached
+            path.append((list(near_ends), dict(cable) if cable else cable, list(far_ends)))
 
-        return Response(path)
+        return path
 
 
 class PassThroughPortMixin(object):
+    etag_models = CABLED_OBJECT_ETAG_MODELS
 
     @action(detail=True, url_path='paths')
     def paths(self, request, pk):
@@ -207,7 +232,8 @@ class RackViewSet(NetBoxModelViewSet):
                     pass
 
             # Render and return the elevation as an SVG drawing with the correct content type
-            drawing = rack.get_elevation_svg(
+            drawing = get_rack_elevation_svgs(
+                [rack],
                 face=data['face'],
                 user=request.user,
                 unit_width=data['unit_width'],
@@ -216,8 +242,8 @@ class RackViewSet(NetBoxModelViewSet):
                 include_images=data['include_images'],
                 base_url=request.build_absolute_uri('/'),
                 highlight_params=highlight_params
-            )
-            return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
+            )[rack.pk]
+            return HttpResponse(drawing, content_type='image/svg+xml')
 
         else:
             # Return a JSON representation of the rack units in the elevation
@@ -238,6 +264,49 @@ class RackViewSet(NetBoxModelViewSet):
                 rack_units = serializers.RackUnitSerializer(page, many=True, context={'request': request})
                 return self.get_paginated_response(rack_units.data)
 
+    @extend_schema(
+        operation_id='dcim_racks_elevations_list',
+        parameters=[serializers.RackElevationListFilterSerializer],
+        responses={200: serializers.RackElevationSerializer(many=True)}
+    )
+    @action(detail=False)
+    def elevations(self, request):
+        """
+        Render the elevations of all racks matching the given filters (e.g. all racks within a location) as SVG
+        documents. The devices and reservations of all racks in each page are retrieved together.
+        """
+        serializer = serializers.RackElevationListFilterSerializer(data=request.GET)
+        if not serializer.is_valid():
+            return Response(serializer.errors, 400)
+        data = serializer.validated_data
+
+        highlight_params = []
+        for param in request.GET.getlist('highlight'):
+            try:
+                highlight_params.append(param.split(':', 1))
+            except ValueError:
+                pass
+
+        racks = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        drawings = get_rack_elevation_svgs(
+            racks,
+            face=data['face'],
+            user=request.user,
+            unit_width=data['unit_width'],
+            unit_height=data['unit_height'],
+            legend_width=data['legend_width'],
+            margin_width=data['margin_width'],
+            include_images=data['include_images'],
+            base_url=request.build_absolute_uri('/'),
+            highlight_params=highlight_params
+        )
+        elevations = serializers.RackElevationSerializer(
+            [{'rack': rack, 'face': data['face'], 'svg': drawings[rack.pk]} for rack in racks],
+            many=True,
+            context={'request': request}
+        )
+        return self.get_paginated_response(elevations.data)
+
 
 #
 # Rack reservations
@@ -364,7 +433,6 @@ class PlatformViewSet(NetBoxModelViewSet):
 #
 
 class DeviceViewSet(
-    SequentialBulkCreatesMixin,
     ConfigContextQuerySetMixin,
     RenderConfigMixin,
     NetBoxModelViewSet
@@ -375,6 +443,41 @@ class DeviceViewSet(
     filterset_class = filtersets.DeviceFilterSet
     pagination_class = StripCountAnnotationsPaginator
 
+    def create(self, request, *args, **kwargs):
+        """
+        Devices in a list are validated and created sequentially, so that validation accounts for those created
+        earlier (e.g. when checking for free space within a rack). The components of all devices are instantiated
+        together once all devices have been created. Lists may be provisioned in a background job by passing
+        `?background=true`.
+        """
+        if not isinstance(request.data, list):
+            # Creating a single object
+            return super().create(request, *args, **kwargs)
+
+        if request.GET.get('background', '').lower() == 'true':
+            job = DeviceProvisioningJob.enqueue(
+                user=request.user,
+                data=request.data,
+                request=copy_safe_request(request)
+            )
+            serializer = JobSerializer(job, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+        instances = []
+        with transaction.atomic(), defer_component_instantiation():
+            for data in request.data:
+                serializer = self.get_serializer(data=data)
+                serializer.is_valid(raise_exception=True)
+                self.perform_create(serializer)
+                instances.append(serializer.instance)
+
+        # Retrieve the devices again to reflect their components
+        devices = self.get_queryset().in_bulk([instance.pk for instance in instances])
+        serializer = self.get_serializer([devices[instance.pk] for instance in instances], many=True)
+        headers = self.get_success_headers(serializer.data)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
     def get_serializer_class(self):
         """
         Select the specific serializer based on the request context.
@@ -546,9 +649,12 @@ class PowerPanelViewSet(NetBoxModelViewSet):
 class PowerFeedViewSet(PathEndpointMixin, NetBoxModelViewSet):
     queryset = PowerFeed.objects.prefetch_related(
         '_path', 'cable__terminations',
-    )
+    ).with_allocated_power()
     serializer_class = serializers.PowerFeedSerializer
     filterset_class = filtersets.PowerFeedFilterSet
+    # The allocated power of a feed is the sum of the allocated draw of the PowerPorts connected to it (directly or
+    # through PowerOutlets)
+    etag_models = CABLED_OBJECT_ETAG_MODELS
 
 
 #
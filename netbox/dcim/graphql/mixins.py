@@ -1,6 +1,9 @@
 from typing import Annotated, List, Union
 
 import strawberry
+import strawberry_django
+
+from .prefetch import prefetch_connected_endpoints, prefetch_link_peers
 
 __all__ = (
     'CabledObjectMixin',
@@ -12,7 +15,10 @@ __all__ = (
 class CabledObjectMixin:
     cable: Annotated["CableType", strawberry.lazy('dcim.graphql.types')] | None  # noqa: F821
 
-    link_peers: List[Annotated[Union[
+    prefetchers = (prefetch_link_peers,)
+
+    @strawberry_django.field(only=['cable', 'cable_end'])
+    def link_peers(self) -> List[Annotated[Union[
         Annotated["CircuitTerminationType", strawberry.lazy('circuits.graphql.types')],  # noqa: F821
         Annotated["ConsolePortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
         Annotated["ConsoleServerPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
@@ -22,13 +28,16 @@ class CabledObjectMixin:
         Annotated["PowerOutletType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
         Annotated["PowerPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
         Annotated["RearPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
-    ], strawberry.union("LinkPeerType")]]
+    ], strawberry.union("LinkPeerType")]]:
+        return self.link_peers
 
 
 @strawberry.type
 class PathEndpointMixin:
+    prefetchers = (prefetch_connected_endpoints,)
 
-    connected_endpoints: List[Annotated[Union[
+    @strawberry_django.field(only=['_path'])
+    def connected_endpoints(self) -> List[Annotated[Union[
         Annotated["CircuitTerminationType", strawberry.lazy('circuits.graphql.types')],  # noqa: F821
         Annotated["ConsolePortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
         Annotated["ConsoleServerPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
@@ -39,4 +48,5 @@ class PathEndpointMixin:
         Annotated["PowerPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
         Annotated["ProviderNetworkType", strawberry.lazy('circuits.graphql.types')],  # noqa: F821
         Annotated["RearPortType", strawberry.lazy('dcim.graphql.types')],  # noqa: F821
-    ], strawberry.union("ConnectedEndpointType")]]
+    ], strawberry.union("ConnectedEndpointType")]]:
+        return self.connected_endpoints
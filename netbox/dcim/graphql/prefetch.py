@@ -0,0 +1,46 @@
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db.models import Prefetch
+
+from dcim.models import CablePath, CableTermination
+from netbox.graphql.prefetch import get_union_querysets
+
+__all__ = (
+    'prefetch_cable_terminations',
+    'prefetch_connected_endpoints',
+    'prefetch_link_peers',
+)
+
+
+def _prefetch_terminations(info, field_nodes, lookup):
+    """
+    Return a Prefetch of the CableTerminations of cables (to `_prefetched_terminations`), along with their termination
+    objects (using one query per type) for resolving the given fields.
+    """
+    terminations = CableTermination.objects.prefetch_related(
+        GenericPrefetch('termination', get_union_querysets(info, field_nodes))
+    )
+    return Prefetch(lookup, terminations, to_attr='_prefetched_terminations')
+
+
+def prefetch_cable_terminations(info, fields):
+    """
+    Prefetch the A and B terminations of cables.
+    """
+    if field_nodes := fields.get('a_terminations', []) + fields.get('b_terminations', []):
+        return _prefetch_terminations(info, field_nodes, 'terminations')
+
+
+def prefetch_link_peers(info, fields):
+    """
+    Prefetch the link peers of cabled objects, by way of the terminations of their cables.
+    """
+    if field_nodes := fields.get('link_peers'):
+        return _prefetch_terminations(info, field_nodes, 'cable__terminations')
+
+
+def prefetch_connected_endpoints(info, fields):
+    """
+    Prefetch the CablePaths of path endpoints, resolving the objects of all paths at once.
+    """
+    if 'connected_endpoints' in fields:
+        return Prefetch('_path', CablePath.objects.with_path_objects())
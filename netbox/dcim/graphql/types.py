@@ -13,6 +13,7 @@ from netbox.graphql.scalars import BigInt
 from netbox.graphql.types import BaseObjectType, NetBoxObjectType, OrganizationalObjectType
 from .filters import *
 from .mixins import CabledObjectMixin, PathEndpointMixin
+from .prefetch import prefetch_cable_terminations
 
 __all__ = (
     'CableType',
@@ -117,7 +118,8 @@ class ModularComponentTemplateType(ComponentTemplateType):
 )
 class CableTerminationType(NetBoxObjectType):
 
-    termination: Annotated[Union[
+    @strawberry_django.field(only=['termination_type', 'termination_id'])
+    def termination(self) -> Annotated[Union[
         Annotated["CircuitTerminationType", strawberry.lazy('circuits.graphql.types')],
         Annotated["ConsolePortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["ConsoleServerPortType", strawberry.lazy('dcim.graphql.types')],
@@ -127,7 +129,8 @@ class CableTerminationType(NetBoxObjectType):
         Annotated["PowerOutletType", strawberry.lazy('dcim.graphql.types')],
         Annotated["PowerPortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["RearPortType", strawberry.lazy('dcim.graphql.types')],
-    ], strawberry.union("CableTerminationTerminationType")] | None
+    ], strawberry.union("CableTerminationTerminationType")] | None:
+        return self.termination
 
 
 @strawberry_django.type(
@@ -136,6 +139,8 @@ class CableTerminationType(NetBoxObjectType):
     filters=CableFilter
 )
 class CableType(NetBoxObjectType):
+    prefetchers = (prefetch_cable_terminations,)
+
     color: str
     tenant: Annotated["TenantType", strawberry.lazy('tenancy.graphql.types')] | None
 
@@ -292,7 +297,8 @@ class InventoryItemTemplateType(ComponentTemplateType):
 
     child_items: List[Annotated["InventoryItemTemplateType", strawberry.lazy('dcim.graphql.types')]]
 
-    component: Annotated[Union[
+    @strawberry_django.field(only=['component_type', 'component_id'])
+    def component(self) -> Annotated[Union[
         Annotated["ConsolePortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["ConsoleServerPortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["FrontPortType", strawberry.lazy('dcim.graphql.types')],
@@ -300,7 +306,8 @@ class InventoryItemTemplateType(ComponentTemplateType):
         Annotated["PowerOutletType", strawberry.lazy('dcim.graphql.types')],
         Annotated["PowerPortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["RearPortType", strawberry.lazy('dcim.graphql.types')],
-    ], strawberry.union("InventoryItemTemplateComponentType")] | None
+    ], strawberry.union("InventoryItemTemplateComponentType")] | None:
+        return self.component
 
 
 @strawberry_django.type(
@@ -421,7 +428,8 @@ class InventoryItemType(ComponentType):
     def parent(self) -> Annotated["InventoryItemType", strawberry.lazy('dcim.graphql.types')] | None:
         return self.parent
 
-    component: Annotated[Union[
+    @strawberry_django.field(only=['component_type', 'component_id'])
+    def component(self) -> Annotated[Union[
         Annotated["ConsolePortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["ConsoleServerPortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["FrontPortType", strawberry.lazy('dcim.graphql.types')],
@@ -429,7 +437,8 @@ class InventoryItemType(ComponentType):
         Annotated["PowerOutletType", strawberry.lazy('dcim.graphql.types')],
         Annotated["PowerPortType", strawberry.lazy('dcim.graphql.types')],
         Annotated["RearPortType", strawberry.lazy('dcim.graphql.types')],
-    ], strawberry.union("InventoryItemComponentType")] | None
+    ], strawberry.union("InventoryItemComponentType")] | None:
+        return self.component
 
 
 @strawberry_django.type(
@@ -0,0 +1,62 @@
+import logging
+
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from core.signals import clear_events
+from netbox.context_managers import event_tracking
+from netbox.jobs import JobRunner
+from .models import Device
+from .provisioning import defer_component_instantiation
+
+__all__ = (
+    'DeviceProvisioningJob',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceProvisioningJob(JobRunner):
+    """
+    Create a list of Devices submitted to the REST API, instantiating the components of all Devices together (see
+    instantiate_components()). Each Device is validated and created in turn, within a single transaction.
+    """
+
+    class Meta:
+        name = 'Device provisioning'
+
+    def run(self, data, request, *args, **kwargs):
+        """
+        Args:
+            data: A list of dictionaries representing the Devices to create, as accepted by the REST API
+            request: The request which submitted the Devices (a copy made by copy_safe_request())
+        """
+        from .api.serializers import DeviceSerializer
+
+        logger.info(f"Provisioning {len(data)} devices")
+        devices = []
+        with event_tracking(request):
+            try:
+                with transaction.atomic(), defer_component_instantiation():
+                    for i, device_data in enumerate(data):
+                        serializer = DeviceSerializer(data=device_data, context={'request': request})
+                        if not serializer.is_valid():
+                            self.job.data = {'index': i, 'errors': serializer.errors}
+                            raise ValidationError(serializer.errors)
+                        devices.append(serializer.save())
+
+                    # Enforce object-level permissions
+                    permitted = Device.objects.restrict(request.user, 'add').filter(pk__in=[d.pk for d in devices])
+                    if permitted.count() != len(devices):
+                        raise PermissionDenied()
+
+            except Exception:
+                # Clear all pending events. Job termination (including setting the status) is handled by the job
+                # framework.
+                clear_events.send(request)
+                raise
+
+        self.job.data = {
+            'devices': [device.pk for device in devices],
+        }
@@ -2,6 +2,7 @@ import itertools
 from collections import defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Sum
@@ -13,6 +14,8 @@ from core.models import ObjectType
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import PathField
+from dcim.prefetch import get_termination_queryset
+from dcim.querysets import CablePathQuerySet
 from dcim.utils import decompile_path_node, object_to_path_node
 from netbox.models import ChangeLoggedModel, PrimaryModel
 from utilities.conversion import to_meters
@@ -127,9 +130,8 @@ class Cable(PrimaryModel):
         if not self.pk:
             return []
 
-        # Query self.terminations.all() to leverage cached results
         return [
-            ct.termination for ct in self.terminations.all() if ct.cable_end == CableEndChoices.SIDE_A
+            ct.termination for ct in self.get_terminations() if ct.cable_end == CableEndChoices.SIDE_A
         ]
 
     @a_terminations.setter
@@ -146,9 +148,8 @@ class Cable(PrimaryModel):
         if not self.pk:
             return []
 
-        # Query self.terminations.all() to leverage cached results
         return [
-            ct.termination for ct in self.terminations.all() if ct.cable_end == CableEndChoices.SIDE_B
+            ct.termination for ct in self.get_terminations() if ct.cable_end == CableEndChoices.SIDE_B
         ]
 
     @b_terminations.setter
@@ -157,6 +158,17 @@ class Cable(PrimaryModel):
             self._terminations_modified = True
         self._b_terminations = value
 
+    def get_terminations(self):
+        """
+        Return all CableTerminations of the cable, preferring any which have been prefetched (along with their
+        termination objects) to `_prefetched_terminations`.
+        """
+        if hasattr(self, '_prefetched_terminations'):
+            return self._prefetched_terminations
+
+        # Query self.terminations.all() to leverage cached results
+        return self.terminations.all()
+
     def clean(self):
         super().clean()
 
@@ -458,9 +470,15 @@ class CablePath(models.Model):
     )
     _nodes = PathField()
 
+    objects = CablePathQuerySet.as_manager()
+
     _netbox_private = True
 
     class Meta:
+        indexes = (
+            # Supports the retrieval of all CablePaths which traverse an object (_nodes__contains)
+            GinIndex(fields=('_nodes',), name='dcim_cablepath_nodes'),
+        )
         verbose_name = _('cable path')
         verbose_name_plural = _('cable paths')
 
@@ -744,27 +762,35 @@ class CablePath(models.Model):
             self.delete()
     retrace.alters_data = True
 
-    def _get_path(self):
+    @staticmethod
+    def _prefetch_nodes(nodes):
         """
-        Return the path as a list of prefetched objects.
+        Return a dictionary mapping content type IDs to objects by ID for the given path nodes.
         """
         # Compile a list of IDs to prefetch for each type of model in the path
-        to_prefetch = defaultdict(list)
-        for node in self._nodes:
+        to_prefetch = defaultdict(set)
+        for node in nodes:
             ct_id, object_id = decompile_path_node(node)
-            to_prefetch[ct_id].append(object_id)
+            to_prefetch[ct_id].add(object_id)
 
-        # Prefetch path objects using one query per model type. Prefetch related devices where appropriate.
+        # Prefetch path objects using one query per model type, along with their parent objects where appropriate
         prefetched = {}
         for ct_id, object_ids in to_prefetch.items():
             model_class = ObjectType.objects.get_for_id(ct_id).model_class()
-            queryset = model_class.objects.filter(pk__in=object_ids)
-            if hasattr(model_class, 'device'):
-                queryset = queryset.prefetch_related('device')
+            queryset = get_termination_queryset(model_class).filter(pk__in=object_ids)
             prefetched[ct_id] = {
                 obj.id: obj for obj in queryset
             }
 
+        return prefetched
+
+    def _get_path(self, prefetched=None):
+        """
+        Return the path as a list of prefetched objects.
+        """
+        if prefetched is None:
+            prefetched = self._prefetch_nodes(self._nodes)
+
         # Replicate the path using the prefetched objects.
         path = []
         for step in self.path:
@@ -780,6 +806,16 @@ class CablePath(models.Model):
 
         return path
 
+    @classmethod
+    def prefetch_path_objects(cls, cable_paths):
+        """
+        Populate the path objects of multiple CablePaths at once, using one query per model type for all paths.
+        """
+        cable_paths = [cp for cp in cable_paths if not hasattr(cp, '_path_objects')]
+        prefetched = cls._prefetch_nodes(itertools.chain.from_iterable(cp._nodes for cp in cable_paths))
+        for cable_path in cable_paths:
+            cable_path._path_objects = cable_path._get_path(prefetched)
+
     def get_cable_ids(self):
         """
         Return all Cable IDs within the path.
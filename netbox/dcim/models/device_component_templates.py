@@ -371,10 +371,18 @@ class PowerOutletTemplate(ModularComponentTemplateModel):
                     _("Parent power port ({power_port}) must belong to the same module type").format(power_port=self.power_port)
                 )
 
-    def instantiate(self, **kwargs):
+    def instantiate(self, components=None, **kwargs):
+        """
+        Args:
+            components: A dictionary mapping (model, name) to the components already instantiated on the Device or
+                Module, used to resolve the PowerPort rather than querying the database (optional)
+        """
         if self.power_port:
             power_port_name = self.power_port.resolve_name(kwargs.get('module'))
-            power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
+            if components is not None:
+                power_port = components[(PowerPort, power_port_name)]
+            else:
+                power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
         else:
             power_port = None
         return self.component_model(
@@ -575,10 +583,18 @@ class FrontPortTemplate(ModularComponentTemplateModel):
         except RearPortTemplate.DoesNotExist:
             pass
 
-    def instantiate(self, **kwargs):
+    def instantiate(self, components=None, **kwargs):
+        """
+        Args:
+            components: A dictionary mapping (model, name) to the components already instantiated on the Device or
+                Module, used to resolve the RearPort rather than querying the database (optional)
+        """
         if self.rear_port:
             rear_port_name = self.rear_port.resolve_name(kwargs.get('module'))
-            rear_port = RearPort.objects.get(name=rear_port_name, **kwargs)
+            if components is not None:
+                rear_port = components[(RearPort, rear_port_name)]
+            else:
+                rear_port = RearPort.objects.get(name=rear_port_name, **kwargs)
         else:
             rear_port = None
         return self.component_model(
@@ -787,11 +803,23 @@ class InventoryItemTemplate(MPTTModel, ComponentTemplateModel):
         verbose_name = _('inventory item template')
         verbose_name_plural = _('inventory item templates')
 
-    def instantiate(self, **kwargs):
-        parent = InventoryItem.objects.get(name=self.parent.name, **kwargs) if self.parent else None
+    def instantiate(self, components=None, **kwargs):
+        """
+        Args:
+            components: A dictionary mapping (model, name) to the components already instantiated on the Device, used
+                to resolve the parent InventoryItem and the assigned component rather than querying the database
+                (optional)
+        """
+        if components is not None:
+            parent = components[(InventoryItem, self.parent.name)] if self.parent else None
+        else:
+            parent = InventoryItem.objects.get(name=self.parent.name, **kwargs) if self.parent else None
         if self.component:
             model = self.component.component_model
-            component = model.objects.get(name=self.component.name, **kwargs)
+            if components is not None:
+                component = components[(model, self.component.name)]
+            else:
+                component = model.objects.get(name=self.component.name, **kwargs)
         else:
             component = None
         return self.component_model(
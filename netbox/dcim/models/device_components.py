@@ -4,7 +4,6 @@ from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelatio
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Sum
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
@@ -12,6 +11,7 @@ from mptt.models import MPTTModel, TreeForeignKey
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import MACAddressField, WWNField
+from dcim.topology import get_power_draws
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.fields import ColorField, NaturalOrderingField
@@ -188,6 +188,8 @@ class CabledObjectModel(models.Model):
     @cached_property
     def link_peers(self):
         if self.cable:
+            if hasattr(self.cable, '_prefetched_terminations'):
+                return [ct.termination for ct in self.cable.get_terminations() if ct.cable_end != self.cable_end]
             peers = self.cable.terminations.exclude(cable_end=self.cable_end).prefetch_related('termination')
             return [peer.termination for peer in peers]
         return []
@@ -230,24 +232,20 @@ class PathEndpoint(models.Model):
     class Meta:
         abstract = True
 
-    def trace(self):
+    def trace_cablepaths(self):
+        """
+        Return the list of CablePaths which together form the complete path from this endpoint (including e.g. bridged
+        interfaces).
+        """
         origin = self
-        path = []
+        cablepaths = []
 
-        # Construct the complete path (including e.g. bridged interfaces)
         while origin is not None:
 
             if origin._path is None:
                 break
 
-            path.extend(origin._path.path_objects)
-
-            # If the path ends at a non-connected pass-through port, pad out the link and far-end terminations
-            if len(path) % 3 == 1:
-                path.extend(([], []))
-            # If the path ends at a site or provider network, inject a null "link" to render an attachment
-            elif len(path) % 3 == 2:
-                path.insert(-1, [])
+            cablepaths.append(origin._path)
 
             # Check for a bridged relationship to continue the trace
             destinations = origin._path.destinations
@@ -256,6 +254,22 @@ class PathEndpoint(models.Model):
             else:
                 origin = None
 
+        return cablepaths
+
+    def trace(self):
+        path = []
+
+        # Construct the complete path (including e.g. bridged interfaces)
+        for cablepath in self.trace_cablepaths():
+            path.extend(cablepath.path_objects)
+
+            # If the path ends at a non-connected pass-through port, pad out the link and far-end terminations
+            if len(path) % 3 == 1:
+                path.extend(([], []))
+            # If the path ends at a site or provider network, inject a null "link" to render an attachment
+            elif len(path) % 3 == 2:
+                path.insert(-1, [])
+
         # Return the path as a list of three-tuples (A termination(s), cable(s), B termination(s))
         return list(zip(*[iter(path)] * 3))
 
@@ -412,47 +426,23 @@ class PowerPort(ModularComponentModel, CabledObjectModel, PathEndpoint, Tracking
 
     def get_power_draw(self):
         """
-        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort.
+        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort. If neither
+        the allocated nor the maximum draw has been defined, the aggregate draw of all downstream PowerPorts is
+        calculated (recursively), along with per-leg aggregates for three-phase power feeds. See PowerTopology.
         """
-        from dcim.models import PowerFeed
+        if not hasattr(self, '_power_draw'):
+            self._power_draw = get_power_draws([self])[self.pk]
+        return self._power_draw
 
-        # Calculate aggregate draw of all child power outlets if no numbers have been defined manually
-        if self.allocated_draw is None and self.maximum_draw is None:
-            utilization = self.get_downstream_powerports().aggregate(
-                maximum_draw_total=Sum('maximum_draw'),
-                allocated_draw_total=Sum('allocated_draw'),
-            )
-            ret = {
-                'allocated': utilization['allocated_draw_total'] or 0,
-                'maximum': utilization['maximum_draw_total'] or 0,
-                'outlet_count': self.poweroutlets.count(),
-                'legs': [],
-            }
-
-            # Calculate per-leg aggregates for three-phase power feeds
-            if len(self.link_peers) == 1 and isinstance(self.link_peers[0], PowerFeed) and \
-                    self.link_peers[0].phase == PowerFeedPhaseChoices.PHASE_3PHASE:
-                for leg, leg_name in PowerOutletFeedLegChoices:
-                    utilization = self.get_downstream_powerports(leg=leg).aggregate(
-                        maximum_draw_total=Sum('maximum_draw'),
-                        allocated_draw_total=Sum('allocated_draw'),
-                    )
-                    ret['legs'].append({
-                        'name': leg_name,
-                        'allocated': utilization['allocated_draw_total'] or 0,
-                        'maximum': utilization['maximum_draw_total'] or 0,
-                        'outlet_count': self.poweroutlets.filter(feed_leg=leg).count(),
-                    })
-
-            return ret
-
-        # Default to administratively defined values
-        return {
-            'allocated': self.allocated_draw or 0,
-            'maximum': self.maximum_draw or 0,
-            'outlet_count': self.poweroutlets.count(),
-            'legs': [],
-        }
+    @classmethod
+    def prefetch_power_draw(cls, powerports):
+        """
+        Calculate the power draw of the given PowerPorts in bulk, to be returned by get_power_draw().
+        """
+        powerports = [powerport for powerport in powerports if not hasattr(powerport, '_power_draw')]
+        draws = get_power_draws(powerports)
+        for powerport in powerports:
+            powerport._power_draw = draws[powerport.pk]
 
 
 class PowerOutlet(ModularComponentModel, CabledObjectModel, PathEndpoint, TrackingModelMixin):
@@ -565,6 +555,15 @@ class BaseInterface(models.Model):
 
         return super().save(*args, **kwargs)
 
+    @classmethod
+    def pre_bulk_create(cls, instances):
+        """
+        Normalize the given interfaces as save() would, prior to their creation using bulk_create().
+        """
+        for instance in instances:
+            if not instance.mode:
+                instance.untagged_vlan = None
+
     @property
     def tunnel_termination(self):
         return self.tunnel_terminations.first()
@@ -913,6 +912,15 @@ class Interface(ModularComponentModel, BaseInterface, CabledObjectModel, PathEnd
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def pre_bulk_create(cls, instances):
+        super().pre_bulk_create(instances)
+        for instance in instances:
+            if instance.rf_channel and not instance.rf_channel_frequency:
+                instance.rf_channel_frequency = get_channel_attr(instance.rf_channel, 'frequency')
+            if instance.rf_channel and not instance.rf_channel_width:
+                instance.rf_channel_width = get_channel_attr(instance.rf_channel, 'width')
+
     @property
     def _occupied(self):
         return super()._occupied or bool(self.wireless_link_id)
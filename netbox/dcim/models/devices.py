@@ -16,7 +16,8 @@ from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
 from dcim.constants import *
-from extras.models import ConfigContextModel, CustomField
+from dcim.occupancy import RackOccupancy
+from extras.models import ConfigContextModel
 from extras.querysets import ConfigContextModelQuerySet
 from netbox.choices import ColorChoices
 from netbox.config import ConfigItem
@@ -291,17 +292,17 @@ class DeviceType(ImageAttachmentsMixin, PrimaryModel, WeightMixin):
             })
 
         # If editing an existing DeviceType to have a larger u_height, first validate that *all* instances of it have
-        # room to expand within their racks. This validation will impose a very high performance penalty when there are
-        # many instances to check, but increasing the u_height of a DeviceType should be a very rare occurrence.
+        # room to expand within their racks. The occupancy of all affected racks is retrieved using a single query.
         if not self._state.adding and self.u_height > self._original_u_height:
-            for d in Device.objects.filter(device_type=self, position__isnull=False):
+            devices = Device.objects.filter(
+                device_type=self, rack__isnull=False, position__isnull=False
+            ).select_related('rack')
+            occupancies = RackOccupancy.for_racks({d.rack for d in devices})
+            for d in devices:
                 face_required = None if self.is_full_depth else d.face
-                u_available = d.rack.get_available_units(
-                    u_height=self.u_height,
-                    rack_face=face_required,
-                    exclude=[d.pk]
-                )
-                if d.position not in u_available:
+                if not occupancies[d.rack_id].is_available(
+                    d.position, u_height=self.u_height, face=face_required, exclude=[d.pk]
+                ):
                     raise ValidationError({
                         'u_height': _(
                             "Device {device} in rack {rack} does not have sufficient space to accommodate a "
@@ -808,6 +809,12 @@ class Device(
         verbose_name = _('device')
         verbose_name_plural = _('devices')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Save a reference to the original rack (to invalidate its cached elevations if the device is moved)
+        self._original_rack_id = self.__dict__.get('rack_id')
+
     def __str__(self):
         if self.name and self.asset_tag:
             return f'{self.name} ({self.asset_tag})'
@@ -898,10 +905,9 @@ class Device(
                 # Validate rack space
                 rack_face = self.face if not self.device_type.is_full_depth else None
                 exclude_list = [self.pk] if self.pk else []
-                available_units = self.rack.get_available_units(
-                    u_height=self.device_type.u_height, rack_face=rack_face, exclude=exclude_list
-                )
-                if self.position and self.position not in available_units:
+                if self.position and not RackOccupancy.for_rack(self.rack).is_available(
+                    self.position, u_height=self.device_type.u_height, face=rack_face, exclude=exclude_list
+                ):
                     raise ValidationError({
                         'position': _(
                             "U{position} is already occupied or does not have sufficient space to accommodate this "
@@ -990,43 +996,6 @@ class Device(
                 )
             })
 
-    def _instantiate_components(self, queryset, bulk_create=True):
-        """
-        Instantiate components for the device from the specified component templates.
-
-        Args:
-            bulk_create: If True, bulk_create() will be called to create all components in a single query
-                         (default). Otherwise, save() will be called on each instance individually.
-        """
-        model = queryset.model.component_model
-
-        if bulk_create:
-            components = [obj.instantiate(device=self) for obj in queryset]
-            if not components:
-                return
-            # Set default values for any applicable custom fields
-            if cf_defaults := CustomField.objects.get_defaults_for_model(model):
-                for component in components:
-                    component.custom_field_data = cf_defaults
-            model.objects.bulk_create(components)
-            # Manually send the post_save signal for each of the newly created components
-            for component in components:
-                post_save.send(
-                    sender=model,
-                    instance=component,
-                    created=True,
-                    raw=False,
-                    using='default',
-                    update_fields=None
-                )
-        else:
-            for obj in queryset:
-                component = obj.instantiate(device=self)
-                # Set default values for any applicable custom fields
-                if cf_defaults := CustomField.objects.get_defaults_for_model(model):
-                    component.custom_field_data = cf_defaults
-                component.save()
-
     def save(self, *args, **kwargs):
         is_new = not bool(self.pk)
 
@@ -1044,22 +1013,14 @@ class Device(
 
         super().save(*args, **kwargs)
 
-        # If this is a new Device, instantiate all the related components per the DeviceType definition
+        # If this is a new Device, instantiate all the related components per the DeviceType definition (unless
+        # instantiation has been deferred in order to provision many Devices together)
         if is_new:
-            self._instantiate_components(self.device_type.consoleporttemplates.all())
-            self._instantiate_components(self.device_type.consoleserverporttemplates.all())
-            self._instantiate_components(self.device_type.powerporttemplates.all())
-            self._instantiate_components(self.device_type.poweroutlettemplates.all())
-            self._instantiate_components(self.device_type.interfacetemplates.all())
-            self._instantiate_components(self.device_type.rearporttemplates.all())
-            self._instantiate_components(self.device_type.frontporttemplates.all())
-            # Disable bulk_create to accommodate MPTT
-            self._instantiate_components(self.device_type.modulebaytemplates.all(), bulk_create=False)
-            self._instantiate_components(self.device_type.devicebaytemplates.all())
-            # Disable bulk_create to accommodate MPTT
-            self._instantiate_components(self.device_type.inventoryitemtemplates.all(), bulk_create=False)
-            # Interface bridges have to be set after interface instantiation
-            update_interface_bridges(self, self.device_type.interfacetemplates.all())
+            from dcim.provisioning import deferred_devices, instantiate_components
+            if (devices := deferred_devices.get()) is not None:
+                devices.append(self)
+            else:
+                instantiate_components([self])
 
         # Update Site and Rack assignment for any child Devices
         devices = Device.objects.filter(parent_bay__device=self)
@@ -1277,22 +1238,23 @@ class Module(PrimaryModel, ConfigContextModel):
                 if not disable_replication:
                     create_instances.append(template_instance)
 
-            if component_model is not ModuleBay:
-                component_model.objects.bulk_create(create_instances)
-                # Emit the post_save signal for each newly created object
-                for component in create_instances:
-                    post_save.send(
-                        sender=component_model,
-                        instance=component,
-                        created=True,
-                        raw=False,
-                        using='default',
-                        update_fields=None
-                    )
-            else:
-                # ModuleBays must be saved individually for MPTT
+            if component_model is ModuleBay:
+                # ModuleBays are nested within the ModuleBay in which the module is installed
                 for instance in create_instances:
-                    instance.save()
+                    instance.parent = self.module_bay
+                ModuleBay.objects.bulk_create_nodes(create_instances)
+            else:
+                component_model.objects.bulk_create(create_instances)
+            # Emit the post_save signal for each newly created object
+            for component in create_instances:
+                post_save.send(
+                    sender=component_model,
+                    instance=component,
+                    created=True,
+                    raw=False,
+                    using='default',
+                    update_fields=None
+                )
 
             update_fields = ['module']
             component_model.objects.bulk_update(update_instances, update_fields)
@@ -1,3 +1,4 @@
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -5,11 +6,14 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
+from dcim.querysets import PowerFeedQuerySet
+from dcim.topology import get_opposite_cable_end, get_power_draws
 from netbox.config import ConfigItem
 from netbox.models import PrimaryModel
 from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
 from utilities.validators import ExclusionValidator
-from .device_components import CabledObjectModel, PathEndpoint
+from .cables import CableTermination
+from .device_components import CabledObjectModel, PathEndpoint, PowerPort
 
 __all__ = (
     'PowerFeed',
@@ -44,6 +48,8 @@ class PowerPanel(ContactsMixin, ImageAttachmentsMixin, PrimaryModel):
         'dcim.Site',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['site', 'name']
         constraints = (
@@ -145,6 +151,8 @@ class PowerFeed(PrimaryModel, PathEndpoint, CabledObjectModel):
         null=True
     )
 
+    objects = PowerFeedQuerySet.as_manager()
+
     clone_fields = (
         'power_panel', 'rack', 'status', 'type', 'mark_connected', 'supply', 'phase', 'voltage', 'amperage',
         'max_utilization', 'tenant',
@@ -210,3 +218,53 @@ class PowerFeed(PrimaryModel, PathEndpoint, CabledObjectModel):
 
     def get_status_color(self):
         return PowerFeedStatusChoices.colors.get(self.status)
+
+    def get_allocated_power(self):
+        """
+        Return the total allocated draw (in VA) of the PowerPorts connected to this PowerFeed.
+        """
+        if not hasattr(self, '_allocated_power'):
+            self._allocated_power = self.calculate_allocated_power([self])[self.pk]
+        return self._allocated_power
+
+    def get_utilization(self):
+        """
+        Return the allocated draw of this PowerFeed as a percentage of its available power.
+        """
+        if not self.available_power:
+            return 0
+        return round(self.get_allocated_power() / self.available_power * 100, 1)
+
+    @classmethod
+    def calculate_allocated_power(cls, powerfeeds):
+        """
+        Return a dictionary mapping the PK of each of the given PowerFeeds to the total allocated draw of the PowerPorts
+        connected to it, using a fixed number of queries regardless of the number of PowerFeeds.
+        """
+        allocated_power = {powerfeed.pk: 0 for powerfeed in powerfeeds}
+        cable_ends = {
+            (powerfeed.cable_id, get_opposite_cable_end(powerfeed.cable_end)): powerfeed.pk
+            for powerfeed in powerfeeds if powerfeed.cable_id
+        }
+        if not cable_ends:
+            return allocated_power
+
+        terminations = list(CableTermination.objects.filter(
+            cable__in={cable_id for cable_id, cable_end in cable_ends},
+            termination_type=ContentType.objects.get_for_model(PowerPort)
+        ).order_by().values_list('cable_id', 'cable_end', 'termination_id'))
+        power_draws = get_power_draws({termination[2] for termination in terminations})
+        for cable_id, cable_end, powerport_id in terminations:
+            if powerfeed_id := cable_ends.get((cable_id, cable_end)):
+                allocated_power[powerfeed_id] += power_draws[powerport_id]['allocated']
+
+        return allocated_power
+
+    @classmethod
+    def prefetch_allocated_power(cls, powerfeeds):
+        """
+        Calculate the allocated power of the given PowerFeeds in bulk, to be returned by get_allocated_power().
+        """
+        allocated_power = cls.calculate_allocated_power(powerfeeds)
+        for powerfeed in powerfeeds:
+            powerfeed._allocated_power = allocated_power[powerfeed.pk]
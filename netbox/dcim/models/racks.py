@@ -1,8 +1,10 @@
 import decimal
+from collections import defaultdict
 from functools import cached_property
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -13,13 +15,17 @@ from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.occupancy import RackOccupancy
+from dcim.querysets import RackQuerySet
 from dcim.svg import RackElevationSVG
+from dcim.topology import get_power_draws
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, PrimaryModel
 from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
 from utilities.conversion import to_grams
 from utilities.data import array_to_string, drange
 from utilities.fields import ColorField, NaturalOrderingField
+from .cables import CableTermination
 from .device_components import PowerPort
 from .devices import Device, Module
 from .mixins import WeightMixin
@@ -335,6 +341,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         related_query_name='rack'
     )
 
+    objects = RackQuerySet.as_manager()
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'form_factor', 'width', 'airflow', 'u_height', 'desc_units',
         'outer_width', 'outer_depth', 'outer_unit', 'mounting_depth', 'weight', 'max_weight', 'weight_unit',
@@ -443,7 +451,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
     def get_status_color(self):
         return RackStatusChoices.colors.get(self.status)
 
-    def get_rack_units(self, user=None, face=DeviceFaceChoices.FACE_FRONT, exclude=None, expand_devices=True):
+    def get_rack_units(self, user=None, face=DeviceFaceChoices.FACE_FRONT, exclude=None, expand_devices=True,
+                       devices=None):
         """
         Return a list of rack units as dictionaries. Example: {'device': None, 'face': 0, 'id': 48, 'name': 'U48'}
         Each key 'device' is either a Device or None. By default, multi-U devices are repeated for each U they occupy.
@@ -455,6 +464,7 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         :param expand_devices: When True, all units that a device occupies will be listed with each containing a
             reference to the device. When False, only the bottom most unit for a device is included and that unit
             contains a height attribute for the device
+        :param devices: The devices installed within the rack (annotated with devicebay_count), if already retrieved
         """
         elevation = {}
         for u in self.units:
@@ -471,26 +481,33 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         if not self._state.adding:
 
             # Retrieve all devices installed within the rack
-            devices = Device.objects.prefetch_related(
-                'device_type',
-                'device_type__manufacturer',
-                'role'
-            ).annotate(
-                devicebay_count=Count('devicebays')
-            ).exclude(
-                pk=exclude
-            ).filter(
-                rack=self,
-                position__gt=0,
-                device_type__u_height__gt=0
-            ).filter(
-                Q(face=face) | Q(device_type__is_full_depth=True)
-            )
+            if devices is not None:
+                devices = [
+                    device for device in devices
+                    if device.pk != exclude and device.position and device.device_type.u_height and
+                    (device.face == face or device.device_type.is_full_depth)
+                ]
+            else:
+                devices = Device.objects.prefetch_related(
+                    'device_type',
+                    'device_type__manufacturer',
+                    'role'
+                ).annotate(
+                    devicebay_count=Count('devicebays')
+                ).exclude(
+                    pk=exclude
+                ).filter(
+                    rack=self,
+                    position__gt=0,
+                    device_type__u_height__gt=0
+                ).filter(
+                    Q(face=face) | Q(device_type__is_full_depth=True)
+                )
 
             # Determine which devices the user has permission to view
-            permitted_device_ids = []
+            permitted_device_ids = set()
             if user is not None:
-                permitted_device_ids = self.devices.restrict(user, 'view').values_list('pk', flat=True)
+                permitted_device_ids = set(self.devices.restrict(user, 'view').values_list('pk', flat=True))
 
             for device in devices:
                 if expand_devices:
@@ -517,34 +534,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
         :param ignore_excluded_devices: Ignore devices that are marked to exclude from utilization calculations
         """
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.prefetch_related('device_type').filter(position__gte=1)
-        if ignore_excluded_devices:
-            devices = devices.exclude(device_type__exclude_from_utilization=True)
-
-        if exclude is not None:
-            devices = devices.exclude(pk__in=exclude)
-
-        # Initialize the rack unit skeleton
-        units = list(self.units)
-
-        # Remove units consumed by installed devices
-        for d in devices:
-            if rack_face is None or d.face == rack_face or d.device_type.is_full_depth:
-                for u in drange(d.position, d.position + d.device_type.u_height, 0.5):
-                    try:
-                        units.remove(u)
-                    except ValueError:
-                        # Found overlapping devices in the rack!
-                        pass
-
-        # Remove units without enough space above them to accommodate a device of the specified height
-        available_units = []
-        for u in units:
-            if set(drange(u, u + decimal.Decimal(u_height), 0.5)).issubset(units):
-                available_units.append(u)
-
-        return list(reversed(available_units))
+        occupancy = RackOccupancy.for_rack(self, ignore_excluded_devices=ignore_excluded_devices)
+        return occupancy.get_available_units(u_height=u_height, face=rack_face, exclude=exclude)
 
     def get_reserved_units(self):
         """
@@ -604,41 +595,99 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         Determine the utilization rate of the rack and return it as a percentage. Occupied and reserved units both count
         as utilized.
         """
-        # Determine unoccupied units
-        total_units = len(list(self.units))
-        available_units = self.get_available_units(u_height=0.5, ignore_excluded_devices=True)
+        if hasattr(self, '_utilization'):
+            return self._utilization
+        return self.calculate_utilization([self])[self.pk]
+
+    def get_power_utilization(self):
+        """
+        Determine the utilization rate of power in the rack and return it as a percentage.
+        """
+        if hasattr(self, '_power_utilization'):
+            return self._power_utilization
+        return self.calculate_power_utilization([self])[self.pk]
 
-        # Remove reserved units
-        for ru in self.get_reserved_units():
-            for u in drange(ru, ru + 1, 0.5):
-                if u in available_units:
-                    available_units.remove(u)
+    @classmethod
+    def calculate_utilization(cls, racks):
+        """
+        Return a dictionary mapping the PK of each of the given racks to its space utilization (as a percentage), using
+        a fixed number of queries regardless of the number of racks.
+        """
+        # Record the units occupied by devices (excluding those which do not count toward utilization) and reservations
+        occupancies = RackOccupancy.for_racks(racks, ignore_excluded_devices=True)
+        reservations = RackReservation.objects.filter(rack__in=list(occupancies)).order_by().values_list(
+            'rack_id', 'units'
+        )
+        for rack_id, units in reservations:
+            for u in units:
+                occupancies[rack_id].add(u, 1)
 
-        occupied_unit_count = total_units - len(available_units)
-        percentage = float(occupied_unit_count) / total_units * 100
+        utilization = {}
+        for rack in racks:
+            occupancy = occupancies[rack.pk]
+            occupied_unit_count = occupancy.get_occupied().bit_count()
+            utilization[rack.pk] = float(occupied_unit_count) / occupancy.size * 100
 
-        return percentage
+        return utilization
 
-    def get_power_utilization(self):
+    @classmethod
+    def calculate_power_utilization(cls, racks):
         """
-        Determine the utilization rate of power in the rack and return it as a percentage.
+        Return a dictionary mapping the PK of each of the given racks to its power utilization (as a percentage), using
+        a fixed number of queries regardless of the number of racks. The allocated draw of each PowerPort connected to a
+        PowerFeed in the rack is counted; where a PowerPort has no draw defined, the allocated draw of all PowerPorts
+        downstream of it is counted instead (see PowerTopology).
+        """
+        rack_ids = [rack.pk for rack in racks]
+        utilization = {rack_id: 0 for rack_id in rack_ids}
+
+        powerfeeds = list(PowerFeed.objects.filter(rack__in=rack_ids).order_by().values_list(
+            'rack_id', 'available_power', 'cable_id', 'cable_end'
+        ))
+        available_power = defaultdict(int)
+        for rack_id, power, cable_id, cable_end in powerfeeds:
+            available_power[rack_id] += power
+        if not any(available_power.values()):
+            return utilization
+
+        # Find the PowerPorts attached to the cable of each PowerFeed
+        peers = defaultdict(list)
+        terminations = CableTermination.objects.filter(
+            cable__in={powerfeed[2] for powerfeed in powerfeeds if powerfeed[2]},
+            termination_type=ContentType.objects.get_for_model(PowerPort)
+        ).values_list('cable_id', 'cable_end', 'termination_id')
+        for cable_id, cable_end, powerport_id in terminations:
+            peers[cable_id].append((cable_end, powerport_id))
+
+        # Determine the allocated draw of each PowerPort (aggregated recursively from downstream PowerPorts where
+        # none is defined)
+        power_draws = get_power_draws(
+            {powerport_id for cable_peers in peers.values() for cable_end, powerport_id in cable_peers}
+        )
+        allocated_draw = {pk: power_draw['allocated'] for pk, power_draw in power_draws.items()}
+
+        allocated_draw_total = defaultdict(int)
+        for rack_id, power, cable_id, cable_end in powerfeeds:
+            for peer_cable_end, powerport_id in peers[cable_id]:
+                if peer_cable_end != cable_end:
+                    allocated_draw_total[rack_id] += allocated_draw.get(powerport_id, 0)
+        for rack_id, available_power_total in available_power.items():
+            if available_power_total:
+                utilization[rack_id] = round(allocated_draw_total[rack_id] / available_power_total * 100, 1)
+
+        return utilization
+
+    @classmethod
+    def prefetch_utilization(cls, racks):
+        """
+        Calculate the space and power utilization of the given racks in bulk, to be returned by get_utilization() and
+        get_power_utilization() respectively.
         """
-        powerfeeds = PowerFeed.objects.filter(rack=self)
-        available_power_total = sum(pf.available_power for pf in powerfeeds)
-        if not available_power_total:
-            return 0
-
-        powerports = []
-        for powerfeed in powerfeeds:
-            powerports.extend([
-                peer for peer in powerfeed.link_peers if isinstance(peer, PowerPort)
-            ])
-
-        allocated_draw = sum([
-            powerport.get_power_draw()['allocated'] for powerport in powerports
-        ])
-
-        return round(allocated_draw / available_power_total * 100, 1)
+        utilization = cls.calculate_utilization(racks)
+        power_utilization = cls.calculate_power_utilization(racks)
+        for rack in racks:
+            rack._utilization = utilization[rack.pk]
+            rack._power_utilization = power_utilization[rack.pk]
 
     @cached_property
     def total_weight(self):
@@ -233,6 +233,8 @@ class Site(ContactsMixin, ImageAttachmentsMixin, PrimaryModel):
         'latitude', 'longitude', 'description',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('_name',)
         verbose_name = _('site')
@@ -0,0 +1,141 @@
+import decimal
+
+from dcim.choices import DeviceFaceChoices
+
+__all__ = (
+    'RackOccupancy',
+)
+
+
+class RackOccupancy:
+    """
+    A bitmap of the units occupied within a rack, at a resolution of half a unit: bit n represents the nth half unit
+    above the rack's starting unit. The space consumed by each device (or other occupant) is recorded separately so
+    that occupancy can be evaluated for either face of the rack and with certain devices excluded, without requerying
+    the database.
+
+    :param rack: The Rack being modeled
+    """
+    def __init__(self, rack):
+        self.starting_unit = decimal.Decimal(rack.starting_unit)
+        self.desc_units = rack.desc_units
+        self.size = int(rack.u_height * 2)
+        self.mask = (1 << self.size) - 1
+        self._occupants = []
+        self._cache = {}
+
+    @classmethod
+    def for_racks(cls, racks, ignore_excluded_devices=False):
+        """
+        Return a dictionary mapping the PK of each of the given racks to its RackOccupancy, populated with the devices
+        installed in each rack using a single query.
+
+        :param racks: An iterable of Racks
+        :param ignore_excluded_devices: Ignore devices that are marked to exclude from utilization calculations
+        """
+        from dcim.models import Device
+
+        occupancies = {rack.pk: cls(rack) for rack in racks}
+        devices = Device.objects.filter(rack__in=list(occupancies), position__gte=1)
+        if ignore_excluded_devices:
+            devices = devices.exclude(device_type__exclude_from_utilization=True)
+        devices = devices.order_by().values_list(
+            'pk', 'rack_id', 'position', 'face', 'device_type__u_height', 'device_type__is_full_depth'
+        )
+        for pk, rack_id, position, face, u_height, is_full_depth in devices:
+            occupancies[rack_id].add(position, u_height, face=face, full_depth=is_full_depth, device_id=pk)
+
+        return occupancies
+
+    @classmethod
+    def for_rack(cls, rack, ignore_excluded_devices=False):
+        """
+        Return the RackOccupancy of a single rack.
+        """
+        if rack._state.adding:
+            return cls(rack)
+        return cls.for_racks([rack], ignore_excluded_devices=ignore_excluded_devices)[rack.pk]
+
+    def get_bits(self, position, u_height):
+        """
+        Return the bits representing a span of u_height units from the given position. Any portion of the span which
+        falls outside the rack is discarded.
+        """
+        offset = int((decimal.Decimal(position) - self.starting_unit) * 2)
+        bits = (1 << int(decimal.Decimal(u_height) * 2)) - 1
+        bits = bits << offset if offset >= 0 else bits >> -offset
+        return bits & self.mask
+
+    def get_unit(self, index):
+        """
+        Return the rack unit represented by the bit at the given index.
+        """
+        return self.starting_unit + decimal.Decimal(index) / 2
+
+    def add(self, position, u_height, face=None, full_depth=True, device_id=None):
+        """
+        Mark a span of units as occupied.
+
+        :param position: The lowest unit occupied
+        :param u_height: The number of units occupied
+        :param face: The face of the rack occupied (ignored if full_depth is True)
+        :param full_depth: True if both faces of the rack are occupied
+        :param device_id: The PK of the device (if any) occupying the units
+        """
+        faces = (DeviceFaceChoices.FACE_FRONT, DeviceFaceChoices.FACE_REAR) if full_depth else (face,)
+        self._occupants.append((device_id, faces, self.get_bits(position, u_height)))
+        self._cache.clear()
+
+    def get_occupied(self, face=None, exclude=None):
+        """
+        Return the bitmap of units occupied on the given face of the rack (or on either face, if None).
+
+        :param face: The face of the rack (front or rear)
+        :param exclude: An iterable of device PKs to disregard
+        """
+        exclude = set(exclude or ())
+        if not exclude and face in self._cache:
+            return self._cache[face]
+
+        occupied = 0
+        for device_id, faces, bits in self._occupants:
+            if (face is None or face in faces) and (device_id is None or device_id not in exclude):
+                occupied |= bits
+        if not exclude:
+            self._cache[face] = occupied
+
+        return occupied
+
+    def get_available(self, u_height=1, face=None, exclude=None):
+        """
+        Return a bitmap of the units from which a device of the given height can be installed: i.e. those at the bottom
+        of a run of at least u_height unoccupied units.
+        """
+        free = ~self.get_occupied(face, exclude) & self.mask
+        available = free
+        for i in range(1, int(decimal.Decimal(u_height) * 2)):
+            available &= free >> i
+
+        return available
+
+    def get_available_units(self, u_height=1, face=None, exclude=None):
+        """
+        Return a list of the units from which a device of the given height can be installed, in the order in which
+        they are numbered (ascending, unless the rack's units are numbered top to bottom).
+        """
+        available = self.get_available(u_height, face, exclude)
+        units = [self.get_unit(i) for i in range(self.size) if available >> i & 1]
+        if self.desc_units:
+            units.reverse()
+
+        return units
+
+    def is_available(self, position, u_height=1, face=None, exclude=None):
+        """
+        Return True if a device of the given height can be installed at the given position.
+        """
+        offset = (decimal.Decimal(position) - self.starting_unit) * 2
+        if offset < 0 or offset >= self.size or offset % 1:
+            return False
+
+        return bool(self.get_available(u_height, face, exclude) >> int(offset) & 1)
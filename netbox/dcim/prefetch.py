@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db.models import Prefetch
+
+__all__ = (
+    'get_termination_queryset',
+    'prefetch_connected_endpoints',
+    'prefetch_link_peers',
+)
+
+# Fields which reference the parent objects of cable termination models
+PARENT_OBJECT_FIELDS = ('device', 'circuit', 'power_panel')
+
+
+def get_termination_queryset(model):
+    """
+    Return a queryset of the given model (e.g. a cable termination model) which retrieves the parent object of each
+    instance (e.g. its device) along with it, where applicable.
+    """
+    queryset = model.objects.all()
+    for field_name in PARENT_OBJECT_FIELDS:
+        if hasattr(model, field_name):
+            return queryset.select_related(field_name)
+    return queryset
+
+
+def prefetch_link_peers():
+    """
+    Return a Prefetch of the CableTerminations of cabled objects' cables (to `_prefetched_terminations`, from which
+    their link peers are resolved), retrieving the termination objects and their parents using one query per type.
+    """
+    from dcim.models import CabledObjectModel, CableTermination
+
+    termination_querysets = [
+        get_termination_queryset(model) for model in apps.get_models() if issubclass(model, CabledObjectModel)
+    ]
+    terminations = CableTermination.objects.prefetch_related(
+        GenericPrefetch('termination', termination_querysets)
+    )
+    return Prefetch('cable__terminations', terminations, to_attr='_prefetched_terminations')
+
+
+def prefetch_connected_endpoints():
+    """
+    Return a Prefetch of the CablePaths of path endpoints, resolving the objects of all paths (including their
+    connected endpoints) using one query per type.
+    """
+    from dcim.models import CablePath
+
+    return Prefetch('_path', CablePath.objects.with_path_objects())
@@ -0,0 +1,165 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_save
+from mptt.models import MPTTModel
+
+from dcim.models import *
+from dcim.signals import extend_rearport_cable_paths, handle_rack_devicebay_change
+from dcim.svg import invalidate_rack_elevations
+from extras.models import CustomField
+from netbox.bulk import BULK_CREATE_RECEIVERS, handle_bulk_create, has_unhandled_receivers
+
+__all__ = (
+    'defer_component_instantiation',
+    'deferred_devices',
+    'instantiate_components',
+)
+
+# The list of new Devices whose components are to be instantiated upon exiting defer_component_instantiation()
+deferred_devices = ContextVar('deferred_devices', default=None)
+
+# Component template models, in the order in which their components are created (components referenced by other
+# components must be created first), along with the related objects to be retrieved with the templates
+COMPONENT_TEMPLATES = (
+    (ConsolePortTemplate, ()),
+    (ConsoleServerPortTemplate, ()),
+    (PowerPortTemplate, ()),
+    (PowerOutletTemplate, ('power_port',)),
+    (InterfaceTemplate, ('bridge',)),
+    (RearPortTemplate, ()),
+    (FrontPortTemplate, ('rear_port',)),
+    (ModuleBayTemplate, ()),
+    (DeviceBayTemplate, ()),
+    (InventoryItemTemplate, ('role', 'manufacturer')),
+)
+
+# Templates which reference other components of the Device
+RESOLVED_TEMPLATES = (PowerOutletTemplate, FrontPortTemplate, InventoryItemTemplate)
+
+# Signal receivers whose effects upon the creation of a component are replicated by instantiate_components(). (The
+# components of a new Device cannot yet be attached to any cable, so extend_rearport_cable_paths() has no effect.)
+COMPONENT_RECEIVERS = (
+    *BULK_CREATE_RECEIVERS,
+    extend_rearport_cable_paths,
+    handle_rack_devicebay_change,
+)
+
+
+@contextmanager
+def defer_component_instantiation():
+    """
+    Defer the instantiation of components for new Devices created within the context, then instantiate the components
+    of all such Devices together upon exit (see instantiate_components()). Components are not instantiated if an
+    exception is raised.
+    """
+    devices = []
+    token = deferred_devices.set(devices)
+    try:
+        yield devices
+    finally:
+        deferred_devices.reset(token)
+    instantiate_components(devices)
+
+
+def get_component_templates(device_type_ids):
+    """
+    Return a dictionary mapping each component template model to a dictionary mapping each of the given DeviceType IDs
+    to a list of its templates, retrieved using one query per model.
+    """
+    templates = {}
+    loaded = {}
+    for template_model, related in COMPONENT_TEMPLATES:
+        templates[template_model] = defaultdict(list)
+        content_type = ContentType.objects.get_for_model(template_model)
+        queryset = template_model.objects.filter(device_type__in=device_type_ids).select_related(*related)
+        for template in queryset:
+            templates[template_model][template.device_type_id].append(template)
+            loaded[(content_type.pk, template.pk)] = template
+
+    # Resolve the parent and assigned component of each InventoryItemTemplate from the templates already retrieved
+    inventoryitem_type = ContentType.objects.get_for_model(InventoryItemTemplate)
+    for device_type_templates in templates[InventoryItemTemplate].values():
+        for template in device_type_templates:
+            if template.parent_id:
+                template.parent = loaded[(inventoryitem_type.pk, template.parent_id)]
+            if template.component_type_id:
+                template.component = loaded[(template.component_type_id, template.component_id)]
+
+    return templates
+
+
+def instantiate_components(devices):
+    """
+    Create the components of the given new Devices, as defined by the component templates assigned to their
+    DeviceTypes. The templates of each DeviceType are retrieved once, and the components of each type are created for
+    all Devices together using bulk_create() (once per level of nesting, for inventory items).
+
+    The effects of the post_save signal upon the creation of each component (change logging, event rules, search
+    caching, and the updating of counters) are performed in batches, unless other receivers are connected to the
+    signal, in which case it is sent for each component as normal.
+
+    Returns a dictionary mapping each component model to the list of components created.
+    """
+    if not devices:
+        return {}
+    templates = get_component_templates({device.device_type_id for device in devices})
+
+    # Mapping of each Device's PK to its components, by model and name
+    device_components = defaultdict(dict)
+    created = {}
+    for template_model, related in COMPONENT_TEMPLATES:
+        model = template_model.component_model
+        cf_defaults = CustomField.objects.get_defaults_for_model(model)
+        components = []
+        for device in devices:
+            for template in templates[template_model][device.device_type_id]:
+                if template_model in RESOLVED_TEMPLATES:
+                    component = template.instantiate(device=device, components=device_components[device.pk])
+                else:
+                    component = template.instantiate(device=device)
+                if cf_defaults:
+                    component.custom_field_data = dict(cf_defaults)
+                device_components[device.pk][(model, component.name)] = component
+                components.append(component)
+        if not components:
+            continue
+
+        if hasattr(model, 'pre_bulk_create'):
+            model.pre_bulk_create(components)
+        if issubclass(model, MPTTModel):
+            model.objects.bulk_create_nodes(components)
+        else:
+            model.objects.bulk_create(components)
+        created[model] = components
+
+    # Interface bridges can be assigned only once all interfaces have been created
+    bridged_interfaces = []
+    for device in devices:
+        for template in templates[InterfaceTemplate][device.device_type_id]:
+            if template.bridge:
+                interface = device_components[device.pk][(Interface, template.resolve_name(None))]
+                interface.bridge = device_components[device.pk][(Interface, template.bridge.resolve_name(None))]
+                bridged_interfaces.append(interface)
+    if bridged_interfaces:
+        Interface.objects.bulk_update(bridged_interfaces, ['bridge'])
+
+    for model, components in created.items():
+        if has_unhandled_receivers(model, COMPONENT_RECEIVERS):
+            for component in components:
+                post_save.send(
+                    sender=model,
+                    instance=component,
+                    created=True,
+                    raw=False,
+                    using='default',
+                    update_fields=None
+                )
+        else:
+            handle_bulk_create(components)
+    if DeviceBay in created:
+        invalidate_rack_elevations([device.rack_id for device in devices])
+
+    return created
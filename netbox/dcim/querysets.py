@@ -0,0 +1,89 @@
+import itertools
+
+from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
+from django.utils.translation import gettext_lazy as _
+
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = (
+    'CablePathQuerySet',
+    'PowerFeedQuerySet',
+    'RackQuerySet',
+)
+
+
+class BatchModelIterable(ModelIterable):
+    """
+    Yield model instances after processing them together in batches: all instances at once when the queryset is
+    evaluated, or each chunk of instances when it is iterated using iterator(chunk_size=...).
+    """
+    def process(self, instances):
+        raise NotImplementedError(_('{class_name} must implement process()').format(class_name=self.__class__))
+
+    def __iter__(self):
+        instances = super().__iter__()
+        batch_size = self.chunk_size if self.chunked_fetch else None
+        while batch := list(itertools.islice(instances, batch_size)):
+            self.process(batch)
+            yield from batch
+
+
+class PathObjectsIterable(BatchModelIterable):
+    """
+    Yield CablePath instances with their path objects populated together for each batch of instances.
+    """
+    def process(self, cable_paths):
+        self.queryset.model.prefetch_path_objects(cable_paths)
+
+
+class UtilizationIterable(BatchModelIterable):
+    """
+    Yield Rack instances with their space and power utilization calculated together for each batch of instances.
+    """
+    def process(self, racks):
+        self.queryset.model.prefetch_utilization(racks)
+
+
+class AllocatedPowerIterable(BatchModelIterable):
+    """
+    Yield PowerFeed instances with their allocated power calculated together for each batch of instances.
+    """
+    def process(self, powerfeeds):
+        self.queryset.model.prefetch_allocated_power(powerfeeds)
+
+
+class CablePathQuerySet(QuerySet):
+
+    def with_path_objects(self):
+        """
+        Populate the path objects (origins, links, destinations, etc.) of all CablePaths upon evaluation of the
+        queryset, using one query per type of object rather than several queries per path.
+        """
+        clone = self._chain()
+        clone._iterable_class = PathObjectsIterable
+        return clone
+
+
+class RackQuerySet(RestrictedQuerySet):
+
+    def with_utilization(self):
+        """
+        Calculate the space and power utilization of all Racks upon evaluation of the queryset, using a fixed number of
+        queries rather than several queries per rack.
+        """
+        clone = self._chain()
+        clone._iterable_class = UtilizationIterable
+        return clone
+
+
+class PowerFeedQuerySet(RestrictedQuerySet):
+
+    def with_allocated_power(self):
+        """
+        Calculate the allocated power of all PowerFeeds upon evaluation of the queryset, using a fixed number of
+        queries rather than several queries per PowerFeed.
+        """
+        clone = self._chain()
+        clone._iterable_class = AllocatedPowerIterable
+        return clone
@@ -3,12 +3,16 @@ import logging
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
+from netbox.bulk import register_bulk_create_receiver
+
 from .choices import CableEndChoices, LinkStatusChoices
 from .models import (
-    Cable, CablePath, CableTermination, Device, FrontPort, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis,
+    Cable, CabledObjectModel, CablePath, CableTermination, Device, DeviceBay, DeviceType, FrontPort, PathEndpoint,
+    PowerPanel, Rack, RackReservation, Location, VirtualChassis,
 )
 from .models.cables import trace_paths
-from .utils import create_cablepath, rebuild_paths
+from .svg import invalidate_rack_elevations
+from .utils import create_cablepath, invalidate_cable_traces, rebuild_paths
 
 
 #
@@ -67,6 +71,55 @@ def clear_virtualchassis_members(instance, **kwargs):
         device.save()
 
 
+#
+# Rack elevations
+#
+
+@receiver((post_save, post_delete), sender=Rack)
+def handle_rack_change(instance, **kwargs):
+    """
+    Invalidate the cached elevations of a Rack which has been modified.
+    """
+    invalidate_rack_elevations([instance.pk])
+
+
+@receiver((post_save, post_delete), sender=Device)
+def handle_rack_device_change(instance, **kwargs):
+    """
+    Invalidate the cached elevations of the Rack(s) to which a modified Device is (or was) assigned.
+    """
+    invalidate_rack_elevations([instance.rack_id, instance._original_rack_id])
+    instance._original_rack_id = instance.rack_id
+
+
+@receiver((post_save, post_delete), sender=DeviceBay)
+def handle_rack_devicebay_change(instance, **kwargs):
+    """
+    Invalidate the cached elevations of the Rack in which the parent Device of a modified DeviceBay is installed.
+    """
+    if rack_id := Device.objects.filter(pk=instance.device_id).values_list('rack_id', flat=True).first():
+        invalidate_rack_elevations([rack_id])
+
+
+@receiver((post_save, post_delete), sender=RackReservation)
+def handle_rack_reservation_change(instance, **kwargs):
+    """
+    Invalidate the cached elevations of a Rack whose reservations have been modified.
+    """
+    invalidate_rack_elevations([instance.rack_id])
+
+
+@receiver(post_save, sender=DeviceType)
+def handle_rack_devicetype_change(instance, created, **kwargs):
+    """
+    Invalidate the cached elevations of all Racks containing instances of a modified DeviceType.
+    """
+    if not created:
+        invalidate_rack_elevations(
+            Device.objects.filter(device_type=instance, rack__isnull=False).values_list('rack_id', flat=True)
+        )
+
+
 #
 # Cables
 #
@@ -140,3 +193,31 @@ def extend_rearport_cable_paths(instance, created, raw, **kwargs):
         rearport = instance.rear_port
         for cablepath in CablePath.objects.filter(_nodes__contains=rearport):
             cablepath.retrace()
+
+
+#
+# Cable traces
+#
+
+@receiver((post_save, post_delete), sender=CablePath)
+def handle_cablepath_change(instance, **kwargs):
+    """
+    Invalidate the cached traces which include a CablePath which has been retraced or deleted.
+    """
+    invalidate_cable_traces([instance.pk])
+
+
+@register_bulk_create_receiver
+@receiver(post_save)
+def handle_cable_trace_node_change(instance, created, raw=False, **kwargs):
+    """
+    Invalidate the cached traces which include a modified Cable or cabled object (e.g. to reflect a new label).
+    """
+    if created or raw:
+        return
+    if isinstance(instance, Cable) or (
+        isinstance(instance, CabledObjectModel) and (instance.cable_id or getattr(instance, 'wireless_link_id', None))
+    ):
+        invalidate_cable_traces(
+            CablePath.objects.filter(_nodes__contains=instance).values_list('pk', flat=True)
+        )
@@ -6,10 +6,12 @@ from svgwrite.text import Text
 from django.conf import settings
 
 from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
+from dcim.utils import get_cached_trace
 from utilities.html import foreground_color
 
 __all__ = (
     'CableTraceSVG',
+    'get_cable_trace_svg',
 )
 
 OFFSET = 0.5
@@ -468,3 +470,19 @@ class CableTraceSVG:
             self.drawing.add(element)
 
         return self.drawing
+
+
+#
+# Caching
+#
+
+def get_cable_trace_svg(origin, width=CABLE_TRACE_SVG_DEFAULT_WIDTH, base_url=None):
+    """
+    Return the complete trace from the given path endpoint rendered as an SVG document (a string). Rendered traces are
+    cached for reuse until the trace is modified (see get_cached_trace()). Arguments are passed to CableTraceSVG.
+    """
+    return get_cached_trace(
+        origin,
+        ('svg', width, base_url),
+        lambda: CableTraceSVG(origin, width=width, base_url=base_url).render().tostring()
+    )
@@ -1,4 +1,7 @@
 import decimal
+import hashlib
+from collections import defaultdict
+
 import svgwrite
 from svgwrite.container import Hyperlink
 from svgwrite.image import Image
@@ -7,20 +10,26 @@ from svgwrite.shapes import Rect
 from svgwrite.text import Text
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldError
-from django.db.models import Q
+from django.db.models import Count, Q, prefetch_related_objects
 from django.template.defaultfilters import floatformat
 from django.urls import reverse
 from django.utils.http import urlencode
 
 from netbox.config import get_config
+from utilities.changes import get_change_counters, increment_change_counter
 from utilities.data import array_to_ranges
 from utilities.html import foreground_color
-from dcim.constants import RACK_ELEVATION_BORDER_WIDTH
+from dcim.constants import (
+    RACK_ELEVATION_BORDER_WIDTH, RACK_ELEVATION_DEFAULT_LEGEND_WIDTH, RACK_ELEVATION_DEFAULT_MARGIN_WIDTH,
+)
 
 
 __all__ = (
     'RackElevationSVG',
+    'get_rack_elevation_svgs',
+    'invalidate_rack_elevations',
 )
 
 GRADIENT_RESERVED = '#b0b0ff'
@@ -28,6 +37,13 @@ GRADIENT_OCCUPIED = '#d7d7d7'
 GRADIENT_BLOCKED = '#ffc0c0'
 STROKE_RESERVED = '#4d4dff'
 
+# Number of seconds for which rendered rack elevations are cached
+ELEVATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Models whose changes may affect the rendering of any rack elevation (changes to racks, their devices & reservations,
+# and the types of their devices are tracked per rack; see invalidate_rack_elevations())
+ELEVATION_CACHE_MODELS = ('dcim.devicerole', 'dcim.location', 'dcim.manufacturer', 'dcim.virtualchassis')
+
 
 def get_device_name(device):
     if device.virtual_chassis:
@@ -37,7 +53,10 @@ def get_device_name(device):
     else:
         name = str(device.device_type)
     if device.devicebay_count:
-        name += ' ({}/{})'.format(device.get_children().count(), device.devicebay_count)
+        child_count = getattr(device, 'child_count', None)
+        if child_count is None:
+            child_count = device.get_children().count()
+        name += ' ({}/{})'.format(child_count, device.devicebay_count)
 
     return name
 
@@ -82,10 +101,15 @@ class RackElevationSVG:
     :param include_images: If true, the SVG document will embed front/rear device face images, where available
     :param base_url: Base URL for links within the SVG document. If none, links will be relative.
     :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
+    :param devices: The devices installed within the rack, if already retrieved (see get_rack_elevation_svgs())
+    :param permitted_device_ids: The PKs of the devices viewable by the user, if already determined
+    :param highlight_device_ids: The PKs of the devices to highlight, if already determined from highlight_params
     """
     def __init__(self, rack, unit_height=None, unit_width=None, legend_width=None, margin_width=None, user=None,
-                 include_images=True, base_url=None, highlight_params=None):
+                 include_images=True, base_url=None, highlight_params=None, devices=None, permitted_device_ids=None,
+                 highlight_device_ids=None):
         self.rack = rack
+        self.devices = devices
         self.include_images = include_images
         self.base_url = base_url.rstrip('/') if base_url is not None else ''
 
@@ -100,16 +124,18 @@ class RackElevationSVG:
         permitted_devices = self.rack.devices
         if user is not None:
             permitted_devices = permitted_devices.restrict(user, 'view')
-        self.permitted_device_ids = permitted_devices.values_list('pk', flat=True)
+        if permitted_device_ids is None:
+            permitted_device_ids = permitted_devices.values_list('pk', flat=True)
+        self.permitted_device_ids = permitted_device_ids
 
         # Determine device(s) to highlight within the elevation (if any)
-        self.highlight_devices = []
-        if highlight_params:
+        self.highlight_device_ids = highlight_device_ids or set()
+        if highlight_params and highlight_device_ids is None:
             q = Q()
             for k, v in highlight_params:
                 q |= Q(**{k: v})
             try:
-                self.highlight_devices = permitted_devices.filter(q)
+                self.highlight_device_ids = set(permitted_devices.filter(q).values_list('pk', flat=True))
             except FieldError:
                 pass
 
@@ -169,7 +195,7 @@ class RackElevationSVG:
         )
 
         # Determine whether highlighting is in use, and if so, whether to shade this device
-        is_shaded = self.highlight_devices and device not in self.highlight_devices
+        is_shaded = self.highlight_device_ids and device.pk not in self.highlight_device_ids
         css_extra = ' shaded' if is_shaded else ''
 
         # Create hyperlink element
@@ -273,8 +299,8 @@ class RackElevationSVG:
         url_string = '{}?{}&position={{}}'.format(
             reverse('dcim:device_add'),
             urlencode({
-                'site': self.rack.site.pk,
-                'location': self.rack.location.pk if self.rack.location else '',
+                'site': self.rack.site_id,
+                'location': self.rack.location_id or '',
                 'rack': self.rack.pk,
                 'face': face,
             })
@@ -299,7 +325,7 @@ class RackElevationSVG:
         """
         Draw any occupied rack units for the specified rack face.
         """
-        for unit in self.rack.get_rack_units(face=face, expand_devices=False):
+        for unit in self.rack.get_rack_units(face=face, expand_devices=False, devices=self.devices):
 
             # Loop through all units in the elevation
             device = unit['device']
@@ -342,3 +368,123 @@ class RackElevationSVG:
         self.draw_border()
 
         return self.drawing
+
+
+#
+# Caching
+#
+
+def invalidate_rack_elevations(rack_ids):
+    """
+    Invalidate the cached elevations of the given racks once the current transaction has been committed.
+    """
+    for rack_id in set(rack_ids):
+        if rack_id is not None:
+            increment_change_counter(f'dcim.rack_elevation.{rack_id}')
+
+
+def get_rack_elevation_svgs(racks, face, user=None, unit_width=None, unit_height=None,
+                            legend_width=RACK_ELEVATION_DEFAULT_LEGEND_WIDTH,
+                            margin_width=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH, include_images=True, base_url=None,
+                            highlight_params=None):
+    """
+    Return a dictionary mapping the PK of each of the given racks to its elevation rendered as an SVG document (a
+    string). Rendered elevations are cached for reuse until the rack, its devices or reservations, or the types of its
+    devices are modified (see invalidate_rack_elevations()), or the user's view of the rack's devices changes. The
+    elevations not found in the cache are rendered together, retrieving the devices and reservations of all racks in
+    bulk. Arguments are passed to RackElevationSVG.
+    """
+    from dcim.models import Device
+
+    racks = list(racks)
+    if not racks:
+        return {}
+    config = get_config()
+    params = (
+        face,
+        unit_width or config.RACK_ELEVATION_DEFAULT_UNIT_WIDTH,
+        unit_height or config.RACK_ELEVATION_DEFAULT_UNIT_HEIGHT,
+        legend_width,
+        margin_width,
+        include_images,
+        base_url,
+        [tuple(param) for param in highlight_params or ()],
+    )
+
+    # Determine the devices within each rack which are viewable by the user (and which of those are highlighted)
+    permitted_devices = Device.objects.filter(rack__in=racks)
+    if user is not None:
+        permitted_devices = permitted_devices.restrict(user, 'view')
+    permitted_device_ids = defaultdict(set)
+    for pk, rack_id in permitted_devices.order_by().values_list('pk', 'rack_id'):
+        permitted_device_ids[rack_id].add(pk)
+    highlight_device_ids = defaultdict(set)
+    if highlight_params:
+        q = Q()
+        for k, v in highlight_params:
+            q |= Q(**{k: v})
+        try:
+            for pk, rack_id in permitted_devices.filter(q).order_by().values_list('pk', 'rack_id'):
+                highlight_device_ids[rack_id].add(pk)
+        except FieldError:
+            pass
+
+    # Derive a cache key for each elevation from its parameters and the current state of the rack
+    labels = {rack.pk: f'dcim.rack_elevation.{rack.pk}' for rack in racks}
+    counters = get_change_counters([*labels.values(), *ELEVATION_CACHE_MODELS])
+    global_counters = [counters[label] for label in ELEVATION_CACHE_MODELS]
+    keys = {}
+    for rack in racks:
+        key = (
+            params,
+            counters[labels[rack.pk]],
+            global_counters,
+            sorted(permitted_device_ids[rack.pk]),
+            sorted(highlight_device_ids[rack.pk]),
+        )
+        digest = hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+        keys[rack.pk] = f'{labels[rack.pk]}.{digest}'
+
+    cached = cache.get_many(keys.values())
+    svgs = {
+        rack_id: cached[key] for rack_id, key in keys.items() if key in cached
+    }
+
+    # Render any elevations not found in the cache
+    if missing := [rack for rack in racks if rack.pk not in svgs]:
+        prefetch_related_objects(missing, 'reservations')
+        devices = defaultdict(list)
+        for device in Device.objects.filter(
+            rack__in=missing,
+            position__gt=0,
+            device_type__u_height__gt=0
+        ).select_related(
+            'device_type__manufacturer',
+            'role',
+            'virtual_chassis',
+        ).annotate(
+            devicebay_count=Count('devicebays'),
+            child_count=Count('devicebays__installed_device')
+        ):
+            devices[device.rack_id].append(device)
+
+        rendered = {}
+        for rack in missing:
+            drawing = RackElevationSVG(
+                rack,
+                unit_width=unit_width,
+                unit_height=unit_height,
+                legend_width=legend_width,
+                margin_width=margin_width,
+                user=user,
+                include_images=include_images,
+                base_url=base_url,
+                highlight_params=highlight_params,
+                devices=devices[rack.pk],
+                permitted_device_ids=permitted_device_ids[rack.pk],
+                highlight_device_ids=highlight_device_ids[rack.pk],
+            ).render(face)
+            svgs[rack.pk] = rendered[keys[rack.pk]] = drawing.tostring()
+        cache.set_many(rendered, ELEVATION_CACHE_TIMEOUT)
+
+    return svgs
@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from django_tables2.utils import Accessor
 
 from dcim import models
+from dcim.prefetch import prefetch_connected_endpoints, prefetch_link_peers
 from netbox.tables import NetBoxTable, columns
 from tenancy.tables import ContactsColumnMixin, TenancyColumnsMixin
 from .template_code import *
@@ -323,6 +324,10 @@ class ModularDeviceComponentTable(DeviceComponentTable):
 
 
 class CableTerminationTable(NetBoxTable):
+    column_prefetches = {
+        'link_peer': prefetch_link_peers,
+    }
+
     cable = tables.Column(
         verbose_name=_('Cable'),
         linkify=True
@@ -358,6 +363,11 @@ class CableTerminationTable(NetBoxTable):
 
 
 class PathEndpointTable(CableTerminationTable):
+    column_prefetches = {
+        **CableTerminationTable.column_prefetches,
+        'connection': prefetch_connected_endpoints,
+    }
+
     connection = columns.TemplateColumn(
         accessor='_path__destinations',
         template_code=LINKTERMINATION,
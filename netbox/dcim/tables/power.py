@@ -83,6 +83,14 @@ class PowerFeedTable(TenancyColumnsMixin, CableTerminationTable):
     available_power = tables.Column(
         verbose_name=_('Available Power (VA)')
     )
+    get_allocated_power = tables.Column(
+        orderable=False,
+        verbose_name=_('Allocated Power (VA)')
+    )
+    get_utilization = columns.UtilizationColumn(
+        orderable=False,
+        verbose_name=_('Utilization')
+    )
     tenant = tables.Column(
         linkify=True,
         verbose_name=_('Tenant')
@@ -104,7 +112,8 @@ class PowerFeedTable(TenancyColumnsMixin, CableTerminationTable):
         fields = (
             'pk', 'id', 'name', 'power_panel', 'site', 'rack', 'status', 'type', 'supply', 'voltage', 'amperage',
             'phase', 'max_utilization', 'mark_connected', 'cable', 'cable_color', 'link_peer', 'available_power',
-            'tenant', 'tenant_group', 'description', 'comments', 'tags', 'created', 'last_updated',
+            'get_allocated_power', 'get_utilization', 'tenant', 'tenant_group', 'description', 'comments', 'tags',
+            'created', 'last_updated',
         )
         default_columns = (
             'pk', 'name', 'power_panel', 'rack', 'status', 'type', 'supply', 'voltage', 'amperage', 'phase', 'cable',
@@ -1,8 +1,11 @@
 from django.test import override_settings
 from django.urls import reverse
+from django_rq import get_queue
 from django.utils.translation import gettext as _
 from rest_framework import status
 
+from core.choices import JobStatusChoices
+from core.models import Job
 from dcim.choices import *
 from dcim.constants import *
 from dcim.models import *
@@ -11,6 +14,7 @@ from ipam.models import ASN, RIR, VLAN, VRF
 from netbox.api.serializers import GenericObjectSerializer
 from tenancy.models import Tenant
 from users.models import User
+from utilities import changes
 from utilities.testing import APITestCase, APIViewTestCases, create_test_device
 from virtualization.models import Cluster, ClusterType
 from wireless.choices import WirelessChannelChoices
@@ -63,6 +67,94 @@ class Mixins:
             self.assertEqual(segment1[1]['label'], cable.label)
             self.assertEqual(segment1[2][0]['name'], peer_obj.name)
 
+        def test_trace_cached(self):
+            """
+            Check that a trace is reused until the cable within it is modified or deleted.
+            """
+            obj = self.model.objects.first()
+            peer_device = Device.objects.create(
+                site=Site.objects.first(),
+                device_type=DeviceType.objects.first(),
+                role=DeviceRole.objects.first(),
+                name='Peer Device'
+            )
+            peer_obj = self.peer_termination_type.objects.create(
+                device=peer_device,
+                name='Peer Termination'
+            )
+
+            # Forget any change counters scheduled (but not incremented) within the test transaction
+            changes.clear_pending_change_counters()
+            with self.captureOnCommitCallbacks(execute=True):
+                cable = Cable(a_terminations=[obj], b_terminations=[peer_obj], label='Cable 1')
+                cable.save()
+            self.add_permissions(f'dcim.view_{self.model._meta.model_name}')
+            url = reverse(f'dcim-api:{self.model._meta.model_name}-trace', kwargs={'pk': obj.pk})
+            svg_url = f'{url}?render=svg'
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.data[0][1]['label'], 'Cable 1')
+            response = self.client.get(svg_url, **self.header)
+            self.assertIn(b'Cable 1', response.content)
+
+            # Changes which bypass the invalidation of cached traces are not reflected
+            Cable.objects.filter(pk=cable.pk).update(label='Cable 2')
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.data[0][1]['label'], 'Cable 1')
+            response = self.client.get(svg_url, **self.header)
+            self.assertIn(b'Cable 1', response.content)
+
+            # Modifying the cable invalidates the cached traces
+            changes.clear_pending_change_counters()
+            with self.captureOnCommitCallbacks(execute=True):
+                cable.label = 'Cable 3'
+                cable.save()
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.data[0][1]['label'], 'Cable 3')
+            response = self.client.get(svg_url, **self.header)
+            self.assertIn(b'Cable 3', response.content)
+
+            # Deleting the cable deletes (and invalidates the cached traces of) its CablePaths
+            changes.clear_pending_change_counters()
+            with self.captureOnCommitCallbacks(execute=True):
+                cable.delete()
+            response = self.client.get(url, **self.header)
+            self.assertEqual(response.data, [])
+
+        def test_etag_retrace(self):
+            """
+            Check that the ETag of a cabled object changes when its cable path is retraced.
+            """
+            obj = self.model.objects.first()
+            peer_device = Device.objects.create(
+                site=Site.objects.first(),
+                device_type=DeviceType.objects.first(),
+                role=DeviceRole.objects.first(),
+                name='Peer Device'
+            )
+            peer_obj = self.peer_termination_type.objects.create(
+                device=peer_device,
+                name='Peer Termination'
+            )
+            changes.clear_pending_change_counters()
+            with self.captureOnCommitCallbacks(execute=True):
+                cable = Cable(a_terminations=[obj], b_terminations=[peer_obj])
+                cable.save()
+            self.add_permissions(f'dcim.view_{self.model._meta.model_name}')
+            url = reverse(f'dcim-api:{self.model._meta.model_name}-detail', kwargs={'pk': obj.pk})
+            response = self.client.get(url, **self.header)
+            self.assertTrue(response.data['connected_endpoints_reachable'])
+            etag = response.headers['ETag']
+
+            # Retracing the path (without modifying the object itself) changes the ETag
+            Cable.objects.filter(pk=cable.pk).update(status=LinkStatusChoices.STATUS_PLANNED)
+            changes.clear_pending_change_counters()
+            with self.captureOnCommitCallbacks(execute=True):
+                obj.refresh_from_db()
+                obj._path.retrace()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertFalse(response.data['connected_endpoints_reachable'])
+
 
 class RegionTest(APIViewTestCases.APIViewTestCase):
     model = Region
@@ -405,6 +497,60 @@ class RackTest(APIViewTestCases.APIViewTestCase):
         self.assertHttpStatus(response, status.HTTP_200_OK)
         self.assertEqual(response.get('Content-Type'), 'image/svg+xml')
 
+    def test_get_rack_elevation_svg_cached(self):
+        """
+        Check that a rendered rack elevation is reused until a device within the rack is modified.
+        """
+        rack = Rack.objects.first()
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+
+        # Forget any change counters scheduled (but not incremented) within the test transaction
+        changes.clear_pending_change_counters()
+        with self.captureOnCommitCallbacks(execute=True):
+            device = Device.objects.create(
+                device_type=device_type, role=role, name='Device 1', site=rack.site, rack=rack, position=1,
+                face=DeviceFaceChoices.FACE_FRONT
+            )
+        self.add_permissions('dcim.view_rack')
+        url = '{}?render=svg'.format(reverse('dcim-api:rack-elevation', kwargs={'pk': rack.pk}))
+
+        # Devices which the user is not permitted to view are not rendered
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotIn(b'Device 1', response.content)
+        self.add_permissions('dcim.view_device')
+        response = self.client.get(url, **self.header)
+        self.assertIn(b'Device 1', response.content)
+
+        # The cached elevation is invalidated only once a change to the device has been committed
+        device.name = 'Device 2'
+        changes.clear_pending_change_counters()
+        with self.captureOnCommitCallbacks() as callbacks:
+            device.save()
+        response = self.client.get(url, **self.header)
+        self.assertIn(b'Device 1', response.content)
+        for callback in callbacks:
+            callback()
+        response = self.client.get(url, **self.header)
+        self.assertIn(b'Device 2', response.content)
+
+    def test_get_rack_elevations(self):
+        """
+        GET the elevations of all racks within a location.
+        """
+        location = Location.objects.first()
+        self.add_permissions('dcim.view_rack')
+        url = reverse('dcim-api:rack-elevations')
+
+        response = self.client.get(f'{url}?location_id={location.pk}&face=rear', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        for elevation in response.data['results']:
+            self.assertEqual(elevation['face']['value'], DeviceFaceChoices.FACE_REAR)
+            self.assertTrue(elevation['svg'].startswith('<svg'))
+
 
 class RackReservationTest(APIViewTestCases.APIViewTestCase):
     model = RackReservation
@@ -1255,6 +1401,27 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
             },
         ]
 
+    def test_create_devices_in_background(self):
+        """
+        Check that a list of devices can be provisioned by a background job.
+        """
+        InterfaceTemplate.objects.create(device_type_id=self.create_data[0]['device_type'], name='Interface 1')
+        self.add_permissions('dcim.add_device')
+        url = reverse('dcim-api:device-list') + '?background=true'
+        response = self.client.post(url, self.create_data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_202_ACCEPTED)
+        self.assertFalse(Device.objects.filter(name='Test Device 4').exists())
+
+        job = Job.objects.get(pk=response.data['id'])
+        get_queue('default').fetch_job(str(job.job_id)).perform()
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED, job.error)
+        devices = Device.objects.filter(pk__in=job.data['devices'])
+        self.assertEqual(sorted(device.name for device in devices), ['Test Device 4', 'Test Device 5', 'Test Device 6'])
+        for device in devices:
+            self.assertEqual(device.interfaces.get().name, 'Interface 1')
+            self.assertEqual(device.interface_count, 1)
+
     def test_config_context_included_by_default_in_list_view(self):
         """
         Check that config context data is included by default in the devices list.
@@ -1,12 +1,19 @@
+from unittest.mock import patch
+
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from circuits.models import *
 from core.models import ObjectType
 from dcim.choices import *
 from dcim.models import *
+from dcim.provisioning import defer_component_instantiation
 from extras.models import CustomField
 from tenancy.models import Tenant
+from users.models import User
+from utilities import changes
 from utilities.data import drange
 from virtualization.models import Cluster, ClusterType
 
@@ -271,6 +278,55 @@ class RackTestCase(TestCase):
 
         self.assertEqual(len(rack.get_available_units()), rack.u_height * 2 - 3)
 
+    def test_available_units(self):
+        site = Site.objects.first()
+        rack = Rack.objects.create(name='Rack 2', site=site, u_height=10)
+        device_types = (
+            DeviceType.objects.get(u_height=1),
+            DeviceType.objects.create(
+                manufacturer=Manufacturer.objects.first(), model='Device Type 4', slug='device-type-4', u_height=2,
+                is_full_depth=False
+            ),
+        )
+        attrs = {
+            'role': DeviceRole.objects.first(),
+            'site': site,
+            'rack': rack,
+        }
+        device1 = Device.objects.create(
+            name='Device 1', device_type=device_types[0], position=1, face=DeviceFaceChoices.FACE_FRONT, **attrs
+        )
+        Device.objects.create(
+            name='Device 2', device_type=device_types[1], position=5, face=DeviceFaceChoices.FACE_REAR, **attrs
+        )
+
+        self.assertEqual(rack.get_available_units(), [*drange(2, 4.5, 0.5), *drange(7, 10.5, 0.5)])
+        self.assertEqual(
+            rack.get_available_units(u_height=0.5, rack_face=DeviceFaceChoices.FACE_FRONT),
+            list(drange(2, 11, 0.5))
+        )
+        self.assertEqual(
+            rack.get_available_units(u_height=2, rack_face=DeviceFaceChoices.FACE_REAR),
+            [*drange(2, 3.5, 0.5), *drange(7, 9.5, 0.5)]
+        )
+        self.assertEqual(
+            rack.get_available_units(u_height=3, exclude=[device1.pk]),
+            [*drange(1, 2.5, 0.5), *drange(7, 8.5, 0.5)]
+        )
+
+        rack.desc_units = True
+        rack.save()
+        self.assertEqual(rack.get_available_units(u_height=3), [8, 7.5, 7, 2])
+
+        # Validate the placement of a device
+        device3 = Device(
+            name='Device 3', device_type=device_types[1], position=4, face=DeviceFaceChoices.FACE_REAR, **attrs
+        )
+        with self.assertRaises(ValidationError):
+            device3.full_clean()
+        device3.position = 3
+        device3.full_clean()
+
     def test_change_rack_site(self):
         """
         Check that child Devices get updated when a Rack is moved to a new Site.
@@ -330,6 +386,78 @@ class RackTestCase(TestCase):
         rack.refresh_from_db()
         self.assertEqual(rack.get_utilization(), 1 / 42 * 100)
 
+    def test_utilization_bulk(self):
+        site = Site.objects.first()
+        racks = (
+            Rack.objects.first(),
+            Rack.objects.create(name='Rack 2', site=site, u_height=10),
+            Rack.objects.create(name='Rack 3', site=site, u_height=10, desc_units=True),
+        )
+        attrs = {
+            'role': DeviceRole.objects.first(),
+            'site': site,
+            'face': DeviceFaceChoices.FACE_FRONT,
+        }
+        Device.objects.create(name='Device 1', device_type=DeviceType.objects.get(u_height=1), rack=racks[0],
+                              position=1, **attrs)
+        Device.objects.create(name='Device 2', device_type=DeviceType.objects.get(u_height=0.5), rack=racks[1],
+                              position=2, **attrs)
+        RackReservation.objects.create(rack=racks[1], units=[2, 3], user=User.objects.create(username='user1'),
+                                       description='Reservation 1')
+        Device.objects.create(name='Device 3', device_type=DeviceType.objects.get(u_height=1), rack=racks[2],
+                              position=10, **attrs)
+
+        expected = [rack.get_utilization() for rack in racks]
+        self.assertEqual(expected, [1 / 42 * 100, 2 / 10 * 100, 1 / 10 * 100])
+
+        # Utilization is calculated with a fixed number of queries, regardless of the number of racks
+        with self.assertNumQueries(4):
+            racks = list(Rack.objects.filter(pk__in=[rack.pk for rack in racks]).with_utilization())
+        self.assertEqual([rack.get_utilization() for rack in racks], expected)
+        self.assertEqual([rack.get_power_utilization() for rack in racks], [0, 0, 0])
+
+        # When iterating in chunks, utilization is calculated for each chunk as it is retrieved
+        queryset = Rack.objects.filter(pk__in=[rack.pk for rack in racks]).order_by('pk').with_utilization()
+        with patch.object(Rack, 'prefetch_utilization', wraps=Rack.prefetch_utilization) as prefetch_utilization:
+            racks = list(queryset.iterator(chunk_size=2))
+        self.assertEqual([len(call.args[0]) for call in prefetch_utilization.call_args_list], [2, 1])
+        self.assertEqual([rack.get_utilization() for rack in racks], expected)
+
+    def test_power_utilization(self):
+        site = Site.objects.first()
+        racks = (
+            Rack.objects.first(),
+            Rack.objects.create(name='Rack 2', site=site),
+        )
+        powerpanel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        powerfeeds = (
+            PowerFeed.objects.create(power_panel=powerpanel, rack=racks[0], name='Power Feed 1',
+                                     voltage=120, amperage=20, max_utilization=80),
+            PowerFeed.objects.create(power_panel=powerpanel, rack=racks[1], name='Power Feed 2',
+                                     voltage=120, amperage=20, max_utilization=80),
+        )
+        device_type = DeviceType.objects.first()
+        role = DeviceRole.objects.first()
+        devices = [
+            Device.objects.create(name=f'Device {i}', device_type=device_type, role=role, site=site)
+            for i in range(1, 4)
+        ]
+
+        # Rack 1 is fed through a PowerPort with no draw defined, which supplies a second PowerPort via a PowerOutlet
+        powerport1 = PowerPort.objects.create(device=devices[0], name='Power Port 1')
+        poweroutlet1 = PowerOutlet.objects.create(device=devices[0], name='Power Outlet 1', power_port=powerport1)
+        powerport2 = PowerPort.objects.create(device=devices[1], name='Power Port 2', allocated_draw=480)
+        Cable(a_terminations=[powerfeeds[0]], b_terminations=[powerport1]).save()
+        Cable(a_terminations=[poweroutlet1], b_terminations=[powerport2]).save()
+
+        # Rack 2 is fed directly to a PowerPort with an allocated draw
+        powerport3 = PowerPort.objects.create(device=devices[2], name='Power Port 3', allocated_draw=960)
+        Cable(a_terminations=[powerfeeds[1]], b_terminations=[powerport3]).save()
+
+        self.assertEqual([rack.get_power_utilization() for rack in racks], [25.0, 50.0])
+        racks = Rack.objects.filter(pk__in=[rack.pk for rack in racks]).with_utilization()
+        self.assertEqual([rack.get_power_utilization() for rack in racks], [25.0, 50.0])
+
 
 class DeviceTestCase(TestCase):
 
@@ -511,6 +639,51 @@ class DeviceTestCase(TestCase):
         )
         self.assertEqual(inventoryitem.cf['cf1'], 'foo')
 
+    def test_device_provisioning(self):
+        """
+        Ensure that the components of many Devices are instantiated together when deferred.
+        """
+        device_type = DeviceType.objects.first()
+        interface = InterfaceTemplate.objects.get(device_type=device_type, name='Interface 1')
+        InterfaceTemplate(
+            device_type=device_type,
+            name='Interface 2',
+            type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            bridge=interface
+        ).save()
+        InventoryItemTemplate(
+            device_type=device_type,
+            parent=InventoryItemTemplate.objects.get(device_type=device_type, name='Inventory Item 1'),
+            name='Inventory Item 2',
+            component=interface
+        ).save()
+
+        def provision_devices(names):
+            with CaptureQueriesContext(connection) as context:
+                with defer_component_instantiation() as devices:
+                    for name in names:
+                        Device(site=Site.objects.first(), device_type=device_type, role=DeviceRole.objects.first(),
+                               name=name).save()
+                self.assertEqual(len(devices), len(names))
+            return context.captured_queries
+
+        # The number of queries required to instantiate components does not depend on the number of devices
+        queries1 = provision_devices(['Device 1', 'Device 2'])
+        queries2 = provision_devices(['Device 3', 'Device 4', 'Device 5', 'Device 6'])
+        self.assertEqual(len(queries2) - len(queries1), 2 * (len(queries1) - len(provision_devices(['Device 7']))))
+
+        for device in Device.objects.filter(name__startswith='Device '):
+            self.assertEqual(device.interfaces.get(name='Interface 2').bridge.name, 'Interface 1')
+            self.assertEqual(device.poweroutlets.get().power_port, device.powerports.get())
+            self.assertEqual(device.frontports.get().rear_port, device.rearports.get())
+            self.assertEqual(device.interface_count, 2)
+            inventoryitem = device.inventoryitems.get(name='Inventory Item 2')
+            self.assertEqual(inventoryitem.parent.name, 'Inventory Item 1')
+            self.assertEqual(inventoryitem.component, device.interfaces.get(name='Interface 1'))
+            self.assertEqual(inventoryitem.cf['cf1'], 'foo')
+            self.assertEqual(list(inventoryitem.get_ancestors()), [inventoryitem.parent])
+            self.assertEqual(list(device.modulebays.get().get_family()), [device.modulebays.get()])
+
     def test_multiple_unnamed_devices(self):
 
         device1 = Device(
@@ -709,6 +882,119 @@ class ModuleBayTestCase(TestCase):
     def test_nested_module_token(self):
         pass
 
+    def test_module_bay_instantiation(self):
+        device = Device.objects.first()
+        module_type = ModuleType.objects.create(manufacturer=Manufacturer.objects.first(), model='Module Type 2')
+        ModuleBayTemplate.objects.bulk_create([
+            ModuleBayTemplate(module_type=module_type, name='Nested Bay 1'),
+            ModuleBayTemplate(module_type=module_type, name='Nested Bay 2'),
+        ])
+        module_bay = ModuleBay.objects.create(device=device, name='Module Bay 4')
+
+        # Install a module, and another within one of its module bays
+        module = Module.objects.create(device=device, module_bay=module_bay, module_type=module_type)
+        nested_bays = list(module.modulebays.order_by('lft'))
+        self.assertEqual([bay.name for bay in nested_bays], ['Nested Bay 1', 'Nested Bay 2'])
+        nested_module = Module.objects.create(device=device, module_bay=nested_bays[0], module_type=module_type)
+
+        # Validate the tree of module bays
+        module_bay.refresh_from_db()
+        self.assertEqual(module_bay.get_descendant_count(), 4)
+        for bay in nested_module.modulebays.all():
+            self.assertEqual(list(bay.get_ancestors()), [module_bay, nested_bays[0]])
+        nested_bays[1].refresh_from_db()
+        self.assertEqual(nested_bays[1].get_ancestors().get(), module_bay)
+
+
+class PowerPortTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        devices = [
+            Device.objects.create(name=f'Device {i}', device_type=device_type, role=role, site=site)
+            for i in range(1, 5)
+        ]
+        powerpanel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        powerfeed = PowerFeed.objects.create(
+            power_panel=powerpanel, name='Power Feed 1', phase=PowerFeedPhaseChoices.PHASE_3PHASE
+        )
+
+        # Power Feed 1 supplies PDU 1, which supplies PDU 2 (on leg A) and Server 2 (on leg B). PDU 2 supplies Server 1.
+        pdu1 = PowerPort.objects.create(device=devices[0], name='PDU 1')
+        pdu1_outlets = (
+            PowerOutlet.objects.create(
+                device=devices[0], name='Outlet 1', power_port=pdu1, feed_leg=PowerOutletFeedLegChoices.FEED_LEG_A
+            ),
+            PowerOutlet.objects.create(
+                device=devices[0], name='Outlet 2', power_port=pdu1, feed_leg=PowerOutletFeedLegChoices.FEED_LEG_B
+            ),
+            PowerOutlet.objects.create(
+                device=devices[0], name='Outlet 3', power_port=pdu1, feed_leg=PowerOutletFeedLegChoices.FEED_LEG_C
+            ),
+        )
+        pdu2 = PowerPort.objects.create(device=devices[1], name='PDU 2')
+        pdu2_outlet = PowerOutlet.objects.create(device=devices[1], name='Outlet 1', power_port=pdu2)
+        server1 = PowerPort.objects.create(device=devices[2], name='PSU 1', allocated_draw=200, maximum_draw=300)
+        server2 = PowerPort.objects.create(device=devices[3], name='PSU 1', allocated_draw=100, maximum_draw=150)
+        Cable(a_terminations=[powerfeed], b_terminations=[pdu1]).save()
+        Cable(a_terminations=[pdu1_outlets[0]], b_terminations=[pdu2]).save()
+        Cable(a_terminations=[pdu1_outlets[1]], b_terminations=[server2]).save()
+        Cable(a_terminations=[pdu2_outlet], b_terminations=[server1]).save()
+
+    def test_power_draw(self):
+        pdu1 = PowerPort.objects.get(name='PDU 1')
+        pdu2 = PowerPort.objects.get(name='PDU 2')
+
+        power_draw = pdu1.get_power_draw()
+        self.assertEqual(power_draw['allocated'], 300)
+        self.assertEqual(power_draw['maximum'], 450)
+        self.assertEqual(power_draw['outlet_count'], 3)
+        self.assertEqual(
+            [(leg['allocated'], leg['maximum'], leg['outlet_count']) for leg in power_draw['legs']],
+            [(200, 300, 1), (100, 150, 1), (0, 0, 1)]
+        )
+
+        power_draw = pdu2.get_power_draw()
+        self.assertEqual((power_draw['allocated'], power_draw['maximum']), (200, 300))
+        self.assertEqual(power_draw['legs'], [])
+
+        self.assertEqual(PowerFeed.objects.get().get_allocated_power(), 300)
+        self.assertEqual(PowerFeed.objects.with_allocated_power().get().get_allocated_power(), 300)
+
+    def test_power_draw_loop(self):
+        device = Device.objects.get(name='Device 4')
+        powerports = (
+            PowerPort.objects.create(device=device, name='PSU 2'),
+            PowerPort.objects.create(device=device, name='PSU 3'),
+        )
+        poweroutlets = (
+            PowerOutlet.objects.create(device=device, name='Outlet 1', power_port=powerports[0]),
+            PowerOutlet.objects.create(device=device, name='Outlet 2', power_port=powerports[1]),
+        )
+        Cable(a_terminations=[poweroutlets[0]], b_terminations=[powerports[1]]).save()
+        Cable(a_terminations=[poweroutlets[1]], b_terminations=[powerports[0]]).save()
+
+        power_draw = powerports[0].get_power_draw()
+        self.assertEqual((power_draw['allocated'], power_draw['maximum']), (0, 0))
+
+    def test_power_draw_cached(self):
+        pdu1 = PowerPort.objects.get(name='PDU 1')
+        self.assertEqual(pdu1.get_power_draw()['allocated'], 300)
+
+        # The cached power draw is reused until a PowerPort has been changed
+        with self.assertNumQueries(0):
+            self.assertEqual(PowerPort(pk=pdu1.pk).get_power_draw()['allocated'], 300)
+        changes.clear_pending_change_counters()
+        with self.captureOnCommitCallbacks(execute=True):
+            server1 = PowerPort.objects.get(name='PSU 1', device__name='Device 3')
+            server1.allocated_draw = 400
+            server1.save()
+        self.assertEqual(PowerPort.objects.get(pk=pdu1.pk).get_power_draw()['allocated'], 500)
+
 
 class CableTestCase(TestCase):
 
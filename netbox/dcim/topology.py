@@ -0,0 +1,190 @@
+import hashlib
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+from dcim.choices import CableEndChoices, PowerFeedPhaseChoices, PowerOutletFeedLegChoices
+from utilities.changes import get_change_counters
+
+__all__ = (
+    'PowerTopology',
+    'get_power_draws',
+)
+
+# Number of seconds for which calculated power draws are cached
+POWER_DRAW_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Models whose changes may affect the power draw of any PowerPort
+POWER_DRAW_CACHE_MODELS = (
+    'dcim.cable', 'dcim.cabletermination', 'dcim.powerfeed', 'dcim.poweroutlet', 'dcim.powerport',
+)
+
+
+def get_opposite_cable_end(cable_end):
+    if not cable_end:
+        return None
+    return CableEndChoices.SIDE_A if cable_end == CableEndChoices.SIDE_B else CableEndChoices.SIDE_B
+
+
+class PowerTopology:
+    """
+    The graph of PowerOutlets and PowerPorts downstream of a set of PowerPorts, loaded using a fixed number of queries
+    per level of the graph (regardless of the number of ports). The power draw of each port is calculated recursively
+    from the graph: where neither the allocated nor the maximum draw of a PowerPort is defined, its draw is the total
+    draw of the distinct PowerPorts connected to its PowerOutlets (which may themselves be PDUs daisy-chained behind
+    it).
+
+    :param powerports: An iterable of PowerPorts (or their PKs)
+    """
+    def __init__(self, powerports):
+        # Mapping of each PowerPort's PK to its allocated & maximum draw
+        self.draws = {}
+        # Mapping of each PowerPort's PK to a list of its PowerOutlets' feed legs & downstream PowerPorts
+        self.outlets = defaultdict(list)
+        # Mapping of each root PowerPort's PK to the phase of the PowerFeed to which it is connected (if any)
+        self.phases = {}
+        self._cache = {}
+
+        self._load([getattr(powerport, 'pk', powerport) for powerport in powerports])
+
+    def _load(self, pks):
+        from dcim.models import CableTermination, PowerFeed, PowerOutlet, PowerPort
+
+        # Retrieve the root PowerPorts, along with the phase of any PowerFeed which is the sole link peer of each
+        ports = PowerPort.objects.filter(pk__in=pks).order_by().values_list(
+            'pk', 'allocated_draw', 'maximum_draw', 'cable_id', 'cable_end'
+        )
+        cable_ends = {}
+        for pk, allocated_draw, maximum_draw, cable_id, cable_end in ports:
+            self.draws[pk] = (allocated_draw, maximum_draw)
+            if cable_id and allocated_draw is None and maximum_draw is None:
+                cable_ends[pk] = (cable_id, cable_end)
+        if cable_ends:
+            peers = defaultdict(list)
+            terminations = CableTermination.objects.filter(
+                cable__in={cable_id for cable_id, cable_end in cable_ends.values()}
+            ).order_by().values_list('cable_id', 'cable_end', 'termination_type_id', 'termination_id')
+            for cable_id, cable_end, termination_type_id, termination_id in terminations:
+                peers[(cable_id, cable_end)].append((termination_type_id, termination_id))
+            powerfeed_type = ContentType.objects.get_for_model(PowerFeed)
+            powerfeeds = {}
+            for pk, (cable_id, cable_end) in cable_ends.items():
+                port_peers = peers[(cable_id, get_opposite_cable_end(cable_end))]
+                if len(port_peers) == 1 and port_peers[0][0] == powerfeed_type.pk:
+                    powerfeeds[pk] = port_peers[0][1]
+            phases = dict(PowerFeed.objects.filter(pk__in=powerfeeds.values()).values_list('pk', 'phase'))
+            for pk, powerfeed_id in powerfeeds.items():
+                self.phases[pk] = phases.get(powerfeed_id)
+
+        # Walk the graph downstream, one level at a time. Only PowerPorts with no draw defined need be explored further.
+        frontier = set(self.draws)
+        explored = set()
+        while frontier:
+            explored |= frontier
+            outlets = list(PowerOutlet.objects.filter(power_port__in=frontier).order_by().values_list(
+                'power_port_id', 'feed_leg', 'cable_id', 'cable_end'
+            ))
+            downstream_ports = defaultdict(list)
+            downstream_terminations = PowerPort.objects.filter(
+                cable__in={outlet[2] for outlet in outlets if outlet[2]}
+            ).order_by().values_list('pk', 'allocated_draw', 'maximum_draw', 'cable_id', 'cable_end')
+            for pk, allocated_draw, maximum_draw, cable_id, cable_end in downstream_terminations:
+                self.draws.setdefault(pk, (allocated_draw, maximum_draw))
+                downstream_ports[(cable_id, cable_end)].append(pk)
+
+            for powerport_id, feed_leg, cable_id, cable_end in outlets:
+                peers = downstream_ports[(cable_id, get_opposite_cable_end(cable_end))] if cable_id else []
+                self.outlets[powerport_id].append((feed_leg, peers))
+
+            frontier = {
+                pk for peers in downstream_ports.values() for pk in peers
+                if pk not in explored and self.draws[pk] == (None, None)
+            }
+
+    def _get_draw(self, pk, leg=None, visiting=()):
+        """
+        Return the total allocated & maximum draw of a PowerPort (or of the PowerPorts connected to its PowerOutlets
+        for the given feed leg).
+        """
+        if leg is None and pk in self._cache:
+            return self._cache[pk]
+
+        allocated_draw, maximum_draw = self.draws.get(pk, (None, None))
+        if allocated_draw is not None or maximum_draw is not None:
+            return allocated_draw or 0, maximum_draw or 0
+
+        # Guard against loops in the topology
+        if pk in visiting:
+            return 0, 0
+        visiting = (*visiting, pk)
+
+        downstream_ports = {
+            peer for feed_leg, peers in self.outlets[pk] if leg is None or feed_leg == leg for peer in peers
+        }
+        allocated_total = maximum_total = 0
+        for peer in downstream_ports:
+            allocated, maximum = self._get_draw(peer, visiting=visiting)
+            allocated_total += allocated
+            maximum_total += maximum
+        if leg is None:
+            self._cache[pk] = (allocated_total, maximum_total)
+
+        return allocated_total, maximum_total
+
+    def get_power_draw(self, powerport):
+        """
+        Return the allocated and maximum power draw (in VA) and PowerOutlet count for a PowerPort, in the form returned
+        by PowerPort.get_power_draw().
+        """
+        pk = getattr(powerport, 'pk', powerport)
+        allocated, maximum = self._get_draw(pk)
+        ret = {
+            'allocated': allocated,
+            'maximum': maximum,
+            'outlet_count': len(self.outlets[pk]),
+            'legs': [],
+        }
+
+        # Calculate per-leg aggregates for three-phase power feeds
+        if self.phases.get(pk) == PowerFeedPhaseChoices.PHASE_3PHASE:
+            for leg, leg_name in PowerOutletFeedLegChoices:
+                allocated, maximum = self._get_draw(pk, leg=leg)
+                ret['legs'].append({
+                    'name': leg_name,
+                    'allocated': allocated,
+                    'maximum': maximum,
+                    'outlet_count': len([outlet for outlet in self.outlets[pk] if outlet[0] == leg]),
+                })
+
+        return ret
+
+
+def get_power_draws(powerports):
+    """
+    Return a dictionary mapping the PK of each of the given PowerPorts to its power draw (see
+    PowerTopology.get_power_draw()). Results are cached until any cable, PowerPort, PowerOutlet, or PowerFeed is
+    modified; those not found in the cache are calculated together from a single PowerTopology.
+    """
+    pks = {getattr(powerport, 'pk', powerport) for powerport in powerports}
+    if not pks:
+        return {}
+
+    counters = get_change_counters(POWER_DRAW_CACHE_MODELS)
+    version = hashlib.md5(
+        repr([counters[label] for label in POWER_DRAW_CACHE_MODELS]).encode(), usedforsecurity=False
+    ).hexdigest()
+    keys = {pk: f'dcim.power_draw.{pk}.{version}' for pk in pks}
+    cached = cache.get_many(keys.values())
+    draws = {
+        pk: cached[key] for pk, key in keys.items() if key in cached
+    }
+
+    if missing := pks - draws.keys():
+        topology = PowerTopology(missing)
+        calculated = {}
+        for pk in missing:
+            draws[pk] = calculated[keys[pk]] = topology.get_power_draw(pk)
+        cache.set_many(calculated, POWER_DRAW_CACHE_TIMEOUT)
+
+    return draws
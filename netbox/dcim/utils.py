@@ -1,6 +1,22 @@
+import hashlib
+
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import transaction
 
+from utilities.changes import get_change_counters, increment_change_counter
+
+# Number of seconds for which cable traces are cached
+TRACE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Models whose changes may affect the rendering of any cable trace (changes to CablePaths, and to the cables and cabled
+# objects within them, are tracked per path; see invalidate_cable_traces())
+TRACE_CACHE_MODELS = (
+    'circuits.circuit', 'circuits.circuittype', 'circuits.provider', 'circuits.providernetwork', 'dcim.device',
+    'dcim.devicerole', 'dcim.devicetype', 'dcim.location', 'dcim.manufacturer', 'dcim.powerpanel', 'dcim.rack',
+    'dcim.site', 'wireless.wirelesslink',
+)
+
 
 def compile_path_node(ct_id, object_id):
     return f'{ct_id}:{object_id}'
@@ -56,3 +72,41 @@ def rebuild_paths(terminations):
             for cp in cable_paths:
                 cp.delete()
                 create_cablepath(cp.origins)
+
+
+def invalidate_cable_traces(cablepath_ids):
+    """
+    Invalidate the cached traces which include any of the given CablePaths once the current transaction has been
+    committed.
+    """
+    for cablepath_id in set(cablepath_ids):
+        increment_change_counter(f'dcim.cable_trace.{cablepath_id}')
+
+
+def get_cached_trace(origin, params, render):
+    """
+    Return the result of render() (e.g. an SVG document or serialized path) for the complete trace from the given path
+    endpoint. Results are cached for reuse until any of the CablePaths which form the trace is retraced, deleted, or
+    otherwise modified (see invalidate_cable_traces()), or an object of one of the TRACE_CACHE_MODELS changes.
+
+    :param origin: The originating PathEndpoint
+    :param params: A tuple of all parameters which affect the result (e.g. the format and width of an image)
+    :param render: A callable which returns the result for the origin (which must be picklable)
+    """
+    counters = get_change_counters(TRACE_CACHE_MODELS)
+    key = (params, origin._path_id, [counters[label] for label in TRACE_CACHE_MODELS])
+    digest = hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+    key = f'dcim.cable_trace.{origin._meta.label_lower}.{origin.pk}.{digest}'
+
+    # The cached result is valid only if none of the CablePaths it depends upon have since been modified
+    if (cached := cache.get(key)) is not None:
+        versions, result = cached
+        if get_change_counters(versions.keys()) == versions:
+            return result
+
+    labels = [f'dcim.cable_trace.{cablepath.pk}' for cablepath in origin.trace_cablepaths()]
+    versions = get_change_counters(labels)
+    result = render()
+    cache.set(key, (versions, result), TRACE_CACHE_TIMEOUT)
+
+    return result
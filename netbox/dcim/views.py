@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import Prefetch, prefetch_related_objects
 from django.forms import ModelMultipleChoiceField, MultipleHiddenInput, modelformset_factory
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -640,7 +640,7 @@ class RackTypeBulkDeleteView(generic.BulkDeleteView):
 class RackListView(generic.ObjectListView):
     queryset = Rack.objects.annotate(
         device_count=count_related(Device, 'rack')
-    )
+    ).with_utilization()
     filterset = filtersets.RackFilterSet
     filterset_form = forms.RackFilterForm
     table = tables.RackTable
@@ -1884,6 +1884,10 @@ class DeviceView(generic.ObjectView):
         else:
             vc_members = []
 
+        # Calculate the power draw of all power ports together
+        prefetch_related_objects([instance], 'powerports')
+        PowerPort.prefetch_power_draw(instance.powerports.all())
+
         return {
             'vc_members': vc_members,
             'svg_extra': f'highlight=id:{instance.pk}'
@@ -3674,7 +3678,7 @@ class PowerPanelContactsView(ObjectContactsView):
 #
 
 class PowerFeedListView(generic.ObjectListView):
-    queryset = PowerFeed.objects.all()
+    queryset = PowerFeed.objects.with_allocated_power()
     filterset = filtersets.PowerFeedFilterSet
     filterset_form = forms.PowerFeedFilterForm
     table = tables.PowerFeedTable
@@ -4,10 +4,9 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework.fields import Field
 from rest_framework.serializers import ValidationError
 
-from core.models import ObjectType
+from extras.caching import get_custom_fields
 from extras.choices import CustomFieldTypeChoices
 from extras.constants import CUSTOMFIELD_EMPTY_VALUES
-from extras.models import CustomField
 from utilities.api import get_serializer_for_model
 
 
@@ -25,8 +24,7 @@ class CustomFieldDefaultValues:
         self.model = serializer_field.parent.Meta.model
 
         # Retrieve the CustomFields for the parent model
-        object_type = ObjectType.objects.get_for_model(self.model)
-        fields = CustomField.objects.filter(object_types=object_type)
+        fields = get_custom_fields(self.model)
 
         # Populate the default value for each CustomField
         value = {}
@@ -44,12 +42,9 @@ class CustomFieldsDataField(Field):
 
     def _get_custom_fields(self):
         """
-        Cache CustomFields assigned to this model to avoid redundant database queries
+        Return the CustomFields assigned to this model (from the definition cache)
         """
-        if not hasattr(self, '_custom_fields'):
-            object_type = ObjectType.objects.get_for_model(self.parent.Meta.model)
-            self._custom_fields = CustomField.objects.filter(object_types=object_type)
-        return self._custom_fields
+        return get_custom_fields(self.parent.Meta.model)
 
     def to_representation(self, obj):
         # TODO: Fix circular import
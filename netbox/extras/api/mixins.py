@@ -4,6 +4,7 @@ from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.status import HTTP_400_BAD_REQUEST
 
+from extras.models import ConfigContext, TaggedItem
 from netbox.api.renderers import TextRenderer
 from .serializers import ConfigTemplateSerializer
 
@@ -35,6 +36,20 @@ class ConfigContextQuerySetMixin:
             return queryset
         return queryset.annotate_config_context_data()
 
+    def get_etag_models(self, queryset):
+        """
+        The rendered config context of an object depends on all ConfigContexts and the objects to which they are
+        assigned.
+        """
+        models = super().get_etag_models(queryset)
+        if 'config_context_data' in queryset.query.annotations:
+            models.update((
+                ConfigContext,
+                TaggedItem,
+                *(field.related_model for field in ConfigContext._meta.many_to_many),
+            ))
+        return models
+
 
 class ConfigTemplateRenderMixin:
     """
@@ -48,6 +48,7 @@ class CustomFieldSerializer(ValidatedModelSerializer):
         allow_null=True
     )
     filter_logic = ChoiceField(choices=CustomFieldFilterLogicChoices, required=False)
+    index_type = ChoiceField(choices=CustomFieldIndexTypeChoices, allow_blank=True, required=False)
     data_type = serializers.SerializerMethodField()
     choice_set = CustomFieldChoiceSetSerializer(
         nested=True,
@@ -56,15 +57,16 @@ class CustomFieldSerializer(ValidatedModelSerializer):
     )
     ui_visible = ChoiceField(choices=CustomFieldUIVisibleChoices, required=False)
     ui_editable = ChoiceField(choices=CustomFieldUIEditableChoices, required=False)
+    data_pending = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = CustomField
         fields = [
             'id', 'url', 'display_url', 'display', 'object_types', 'type', 'related_object_type', 'data_type',
             'name', 'label', 'group_name', 'description', 'required', 'unique', 'search_weight', 'filter_logic',
-            'ui_visible', 'ui_editable', 'is_cloneable', 'default', 'related_object_filter', 'weight',
-            'validation_minimum', 'validation_maximum', 'validation_regex', 'choice_set', 'comments', 'created',
-            'last_updated',
+            'index_type', 'ui_visible', 'ui_editable', 'is_cloneable', 'default', 'related_object_filter', 'weight',
+            'validation_minimum', 'validation_maximum', 'validation_regex', 'choice_set', 'data_pending', 'comments',
+            'created', 'last_updated',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description')
 
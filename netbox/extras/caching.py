@@ -0,0 +1,170 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+__all__ = (
+    'DefinitionCache',
+    'definition_cache',
+    'get_custom_fields',
+    'get_custom_links',
+    'invalidate_definitions',
+)
+
+# Redis key of the generation counter which is incremented whenever a custom field or custom link definition changes
+DEFINITIONS_VERSION_KEY = 'extras.definitions.version'
+
+# Minimum number of seconds between checks of the generation counter
+DEFINITIONS_VERSION_CHECK_INTERVAL = 1
+
+
+class DefinitionCache:
+    """
+    A process-wide cache of CustomField and CustomLink definitions, along with any objects derived from them (such as
+    filters and table columns).
+
+    Cached values are discarded whenever the generation counter stored in Redis changes. The counter is incremented
+    (by any process) upon the commit of a transaction which modifies a definition. Within a transaction which has
+    modified a definition, the cache is bypassed for the current thread until the transaction ends.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.version = None
+        self.checked = 0
+        self.data = {}
+
+    @property
+    def pending(self):
+        """
+        Return True if definitions have been modified within the current thread's open transaction.
+        """
+        if getattr(self._local, 'pending', False):
+            if connection.in_atomic_block:
+                return True
+            self._local.pending = False
+        return False
+
+    def get_version(self):
+        """
+        Return the current value of the generation counter.
+        """
+        version = cache.get(DEFINITIONS_VERSION_KEY)
+        if version is None:
+            # Seed the counter with the current time so that values are not repeated should Redis be flushed
+            cache.add(DEFINITIONS_VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(DEFINITIONS_VERSION_KEY)
+        return version
+
+    def validate(self, force=False):
+        """
+        Discard all cached values if the generation counter has changed. The counter is checked at most once per
+        DEFINITIONS_VERSION_CHECK_INTERVAL seconds unless `force` is True.
+        """
+        now = time.monotonic()
+        if not force and now - self.checked < DEFINITIONS_VERSION_CHECK_INTERVAL:
+            return
+        version = self.get_version()
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self.data = {}
+            self.checked = now
+
+    def get(self, key, builder):
+        """
+        Return the value cached under `key` for the current version, calling `builder()` to create it if necessary.
+
+        Args:
+            key: A hashable key which uniquely identifies the value
+            builder: A callable which returns the value to be cached
+        """
+        if self.pending:
+            return builder()
+
+        self.validate()
+        data = self.data
+        try:
+            return data[key]
+        except KeyError:
+            value = data[key] = builder()
+            return value
+
+    def clear(self):
+        """
+        Discard all locally cached values.
+        """
+        with self._lock:
+            self.version = None
+            self.checked = 0
+            self.data = {}
+
+    def invalidate(self):
+        """
+        Discard the cached values for the current thread immediately, and for all processes once the current
+        transaction (if any) has been committed.
+        """
+        if connection.in_atomic_block:
+            self._local.pending = True
+        transaction.on_commit(self.increment_version)
+
+    def increment_version(self):
+        """
+        Increment the generation counter and discard all locally cached values.
+        """
+        try:
+            cache.incr(DEFINITIONS_VERSION_KEY)
+        except ValueError:
+            # The counter does not yet exist
+            self.get_version()
+        self.validate(force=True)
+
+
+definition_cache = DefinitionCache()
+
+
+def _load_definitions(model, select_related=()):
+    """
+    Return a dictionary mapping each object type (by model label) to a tuple of its assigned definitions.
+    """
+    definitions = {}
+    queryset = model.objects.select_related(*select_related).prefetch_related('object_types')
+    for obj in queryset:
+        for object_type in obj.object_types.all():
+            definitions.setdefault(f'{object_type.app_label}.{object_type.model}', []).append(obj)
+
+    return {
+        label: tuple(objects) for label, objects in definitions.items()
+    }
+
+
+def get_custom_fields(model):
+    """
+    Return a tuple of all CustomFields assigned to the given model, from the definition cache. The returned
+    CustomField instances are shared and must not be modified.
+    """
+    from extras.models import CustomField
+
+    custom_fields = definition_cache.get(
+        'custom_fields', lambda: _load_definitions(CustomField, ('related_object_type', 'choice_set'))
+    )
+    return custom_fields.get(model._meta.concrete_model._meta.label_lower, ())
+
+
+def get_custom_links(model):
+    """
+    Return a tuple of all CustomLinks assigned to the given model, from the definition cache. The returned CustomLink
+    instances are shared and must not be modified.
+    """
+    from extras.models import CustomLink
+
+    custom_links = definition_cache.get('custom_links', lambda: _load_definitions(CustomLink))
+    return custom_links.get(model._meta.concrete_model._meta.label_lower, ())
+
+
+def invalidate_definitions():
+    """
+    Invalidate all cached custom field & custom link definitions.
+    """
+    definition_cache.invalidate()
@@ -56,6 +56,17 @@ class CustomFieldFilterLogicChoices(ChoiceSet):
     )
 
 
+class CustomFieldIndexTypeChoices(ChoiceSet):
+
+    INDEX_BTREE = 'btree'
+    INDEX_GIN = 'gin'
+
+    CHOICES = (
+        (INDEX_BTREE, _('B-tree')),
+        (INDEX_GIN, _('GIN')),
+    )
+
+
 class CustomFieldUIVisibleChoices(ChoiceSet):
 
     ALWAYS = 'always'
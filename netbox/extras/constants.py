@@ -3,6 +3,11 @@ from extras.choices import LogLevelChoices
 
 # Custom fields
 CUSTOMFIELD_EMPTY_VALUES = (None, '', [])
+CUSTOMFIELD_INDEX_PREFIX = 'nbcf'
+
+# The number of objects whose custom field data is updated within each transaction. Changes affecting more objects than
+# this are applied by a background job.
+CUSTOMFIELD_DATA_CHUNK_SIZE = 1000
 
 # Webhooks
 HTTP_CONTENT_TYPE_JSON = 'application/json'
@@ -158,9 +158,9 @@ class CustomFieldFilterSet(ChangeLoggedModelFilterSet):
     class Meta:
         model = CustomField
         fields = (
-            'id', 'name', 'label', 'group_name', 'required', 'unique', 'search_weight', 'filter_logic', 'ui_visible',
-            'ui_editable', 'weight', 'is_cloneable', 'description', 'validation_minimum', 'validation_maximum',
-            'validation_regex',
+            'id', 'name', 'label', 'group_name', 'required', 'unique', 'search_weight', 'filter_logic', 'index_type',
+            'ui_visible', 'ui_editable', 'weight', 'is_cloneable', 'description', 'validation_minimum',
+            'validation_maximum', 'validation_regex',
         )
 
     def search(self, queryset, name, value):
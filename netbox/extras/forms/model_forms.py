@@ -73,7 +73,8 @@ class CustomFieldForm(forms.ModelForm):
             name=_('Custom Field')
         ),
         FieldSet(
-            'search_weight', 'filter_logic', 'ui_visible', 'ui_editable', 'weight', 'is_cloneable', name=_('Behavior')
+            'search_weight', 'filter_logic', 'index_type', 'ui_visible', 'ui_editable', 'weight', 'is_cloneable',
+            name=_('Behavior')
         ),
     )
 
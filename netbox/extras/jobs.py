@@ -3,14 +3,137 @@ import traceback
 from contextlib import nullcontext
 
 from django.db import transaction
+from django.db.models import Max, Min
 from django.utils.translation import gettext as _
 
+from core.choices import JobStatusChoices
+from core.models import Job, ObjectType
 from core.signals import clear_events
-from extras.models import Script as ScriptModel
+from extras.models import CustomField, Script as ScriptModel
 from netbox.context_managers import event_tracking
 from netbox.jobs import JobRunner
+from utilities.changes import increment_change_counter
 from utilities.exceptions import AbortScript, AbortTransaction
-from .utils import is_report
+from .constants import CUSTOMFIELD_DATA_CHUNK_SIZE
+from .utils import is_report, populate_custom_field_data, remove_custom_field_data, rename_custom_field_data
+
+
+class CustomFieldDataJob(JobRunner):
+    """
+    Update the custom field data of all objects of the given types following a change to a CustomField (see
+    CustomField.update_object_data()).
+
+    Objects are updated in chunks by primary key range, each within its own short transaction, so that locks on large
+    tables are held only briefly. Progress is recorded in the job's data as each chunk is completed.
+
+    The update to be performed is also recorded in the job's data, so that it may be applied to any object which is
+    modified before the job has completed (see apply_pending_updates()).
+    """
+    actions = {
+        'populate': populate_custom_field_data,
+        'remove': remove_custom_field_data,
+        'rename': rename_custom_field_data,
+    }
+
+    class Meta:
+        name = 'Update custom field data'
+
+    @classmethod
+    def enqueue(cls, *args, action, object_types, params, **kwargs):
+        job = super().enqueue(*args, action=action, object_types=object_types, params=params, **kwargs)
+
+        # Record the update unless the job has already started
+        if job.status in JobStatusChoices.ENQUEUED_STATE_CHOICES:
+            job.data = {
+                'action': action,
+                'object_types': object_types,
+                'params': params,
+            }
+            Job.objects.filter(pk=job.pk, data__isnull=True).update(data=job.data)
+
+        return job
+
+    @classmethod
+    def apply_pending_updates(cls, instance):
+        """
+        Apply to the custom field data of the given object (in memory) the updates of any jobs which have yet to
+        complete for its model, in the order in which they were enqueued.
+        """
+        object_type = ObjectType.objects.get_for_model(instance)
+        jobs = Job.objects.filter(
+            name=cls.name,
+            status__in=JobStatusChoices.ENQUEUED_STATE_CHOICES,
+            data__object_types__contains=[object_type.pk]
+        ).order_by('created', 'pk')
+
+        data = instance.custom_field_data
+        for job in jobs:
+            action, params = job.data['action'], job.data['params']
+            if action == 'populate':
+                data.setdefault(params['field_name'], params['value'])
+            elif action == 'remove':
+                data.pop(params['field_name'], None)
+            elif action == 'rename' and params['old_name'] in data:
+                data[params['new_name']] = data.pop(params['old_name'])
+
+    def run(self, action, object_types, params, chunk_size=CUSTOMFIELD_DATA_CHUNK_SIZE, **kwargs):
+        """
+        Args:
+            action: The name of the update to perform (populate, remove, or rename)
+            object_types: A list of ObjectType IDs
+            params: A dictionary of keyword arguments for the update function (e.g. the custom field name)
+            chunk_size: The maximum number of objects to update within each transaction
+        """
+        func = self.actions[action]
+
+        # Divide the primary key range of each model into chunks
+        chunks = []
+        for object_type in ObjectType.objects.filter(pk__in=object_types):
+            if model := object_type.model_class():
+                bounds = model.objects.aggregate(start=Min('pk'), end=Max('pk'))
+                if bounds['start'] is not None:
+                    chunks.extend(
+                        (model, pk) for pk in range(bounds['start'], bounds['end'] + 1, chunk_size)
+                    )
+
+        progress = {
+            'total': len(chunks),
+            'completed': 0,
+            'updated': 0,
+        }
+        self.job.data = {
+            'action': action,
+            'object_types': object_types,
+            'params': params,
+            'progress': progress,
+        }
+        self.job.save(update_fields=['data'])
+
+        for model, pk in chunks:
+            with transaction.atomic():
+                queryset = model.objects.filter(pk__gte=pk, pk__lt=pk + chunk_size)
+                progress['updated'] += func(queryset, **params)
+                # Objects are updated directly in the database, so no signals are sent
+                increment_change_counter(model)
+            progress['completed'] += 1
+            self.job.save(update_fields=['data'])
+
+
+class CustomFieldIndexJob(JobRunner):
+    """
+    Create and drop the database indexes for custom fields, as determined by each field's index type and assigned
+    object types. Indexes are built concurrently, so that writes to the affected tables are not blocked.
+    """
+
+    class Meta:
+        name = 'Synchronize custom field indexes'
+
+    def run(self, *args, **kwargs):
+        created, dropped = CustomField.objects.sync_indexes()
+        self.job.data = {
+            'created': created,
+            'dropped': dropped,
+        }
 
 
 class ScriptJob(JobRunner):
@@ -9,13 +9,65 @@ from django.db import DEFAULT_DB_ALIAS
 from django.utils import timezone
 from packaging import version
 
+from core.constants import CHANGELOG_PARTITION_PREMAKE
 from core.models import Job, ObjectChange
 from netbox.config import Config
+from utilities.partitioning import (
+    drop_partition, ensure_monthly_partitions, get_partitions, is_partitioned, month_start, next_month,
+)
 
 
 class Command(BaseCommand):
     help = "Perform nightly housekeeping tasks. (This command can be run at any time.)"
 
+    def maintain_changelog_partitions(self, config, options):
+        """
+        Enforce changelog retention on a partitioned ObjectChange table by dropping entire monthly partitions which
+        have expired, and create partitions for the upcoming months.
+        """
+        table = ObjectChange._meta.db_table
+        now = timezone.now()
+
+        if config.CHANGELOG_RETENTION:
+            cutoff = now - timedelta(days=config.CHANGELOG_RETENTION)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"\tRetention period: {config.CHANGELOG_RETENTION} days")
+                self.stdout.write(f"\tCut-off time: {cutoff}")
+
+            # Drop all partitions which lie entirely before the cut-off time
+            expired_partitions = [
+                p for p in get_partitions(table) if not p.is_default and p.end <= cutoff
+            ]
+            for partition in expired_partitions:
+                if options['verbosity']:
+                    self.stdout.write(f"\tDropping expired partition {partition.name}", self.style.WARNING)
+                drop_partition(partition)
+
+            # Delete any remaining expired records. Partition pruning limits this to the partition containing the
+            # cut-off time (and the default partition).
+            deleted_count = ObjectChange.objects.filter(time__lt=cutoff)._raw_delete(using=DEFAULT_DB_ALIAS)
+            if options['verbosity']:
+                if expired_partitions or deleted_count:
+                    self.stdout.write(
+                        f"\tDropped {len(expired_partitions)} partitions and deleted {deleted_count} expired records.",
+                        self.style.SUCCESS
+                    )
+                else:
+                    self.stdout.write("\tNo expired records found.", self.style.SUCCESS)
+        elif options['verbosity']:
+            self.stdout.write(
+                f"\tSkipping: No retention period specified (CHANGELOG_RETENTION = {config.CHANGELOG_RETENTION})"
+            )
+
+        # Create partitions for the current and upcoming months
+        partitions = ensure_monthly_partitions(
+            table,
+            start=now,
+            end=next_month(month_start(now), CHANGELOG_PARTITION_PREMAKE)
+        )
+        if options['verbosity'] >= 2:
+            self.stdout.write(f"\tPartitions available through {partitions[-1].end}")
+
     def handle(self, *args, **options):
         config = Config()
 
@@ -39,7 +91,12 @@ class Command(BaseCommand):
         # Delete expired ObjectChanges
         if options['verbosity']:
             self.stdout.write("[*] Checking for expired changelog records")
-        if config.CHANGELOG_RETENTION:
+        changelog_table = ObjectChange._meta.db_table
+        if is_partitioned(changelog_table):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"\tThe {changelog_table} table is partitioned")
+            self.maintain_changelog_partitions(config, options)
+        elif config.CHANGELOG_RETENTION:
             cutoff = timezone.now() - timedelta(days=config.CHANGELOG_RETENTION)
             if options['verbosity'] >= 2:
                 self.stdout.write(f"\tRetention period: {config.CHANGELOG_RETENTION} days")
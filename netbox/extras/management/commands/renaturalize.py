@@ -1,8 +1,63 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 from django.apps import apps
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Max, Min
 
+from utilities.changes import increment_change_counter
 from utilities.fields import NaturalOrderingField
 
+# Default number of objects read & updated per query
+CHUNK_SIZE = 5000
+
+
+def get_chunks(model, chunk_size):
+    """
+    Return a list of (start, end) PK ranges, each spanning chunk_size PKs, which together cover all objects of the
+    given model.
+    """
+    pks = model.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    if pks['first'] is None:
+        return []
+    return [(start, start + chunk_size) for start in range(pks['first'], pks['last'] + 1, chunk_size)]
+
+
+def renaturalize_chunk(model_label, field_name, start, end, dry_run=False):
+    """
+    Recalculate the naturalized values of a NaturalOrderingField for all objects with a PK in the range [start, end),
+    and update those which have changed using a single query. Returns a tuple of the number of objects read and the
+    number changed (or to be changed, for a dry run).
+    """
+    model = apps.get_model(model_label)
+    field = model._meta.get_field(field_name)
+    naturalize = field.naturalize_function
+
+    objects = model.objects.filter(pk__gte=start, pk__lt=end).order_by().values_list(
+        'pk', field.target_field, field.name
+    )
+    count = 0
+    changed = []
+    for pk, value, naturalized_value in objects:
+        count += 1
+        new_value = naturalize(value, max_length=field.max_length)
+        if new_value != naturalized_value:
+            changed.extend((pk, new_value))
+    if changed and not dry_run:
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        values = ', '.join(['(%s, %s)'] * (len(changed) // 2))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {qn(field.column)} = v.value "
+                f"FROM (VALUES {values}) AS v(pk, value) "
+                f"WHERE {table}.{qn(model._meta.pk.column)} = v.pk",
+                changed
+            )
+
+    return count, len(changed) // 2
+
 
 class Command(BaseCommand):
     help = "Recalculate natural ordering values for the specified models"
@@ -12,6 +67,18 @@ class Command(BaseCommand):
             'args', metavar='app_label.ModelName', nargs='*',
             help='One or more specific models (each prefixed with its app_label) to renaturalize',
         )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f'Number of objects to read and update per query (default: {CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Number of worker processes among which to distribute chunks (default: 1)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report the number of values which would be changed, without updating them'
+        )
 
     def _get_models(self, names):
         """
@@ -62,50 +129,80 @@ class Command(BaseCommand):
 
         return models
 
+    def _renaturalize(self, model, field, chunks, executor, options):
+        """
+        Renaturalize the given field for each chunk of objects, either within the current process or distributed
+        among the worker processes of the given executor. Returns the total number of objects read and changed.
+        """
+        args = (model._meta.label, field.name)
+        if executor is None:
+            results = [renaturalize_chunk(*args, start, end, options['dry_run']) for start, end in chunks]
+        else:
+            # Worker processes open their own database connections, so any connection open in this process must
+            # first be closed (lest it be shared with workers yet to be forked)
+            connections.close_all()
+            results = executor.map(
+                renaturalize_chunk,
+                *zip(*[(*args, start, end, options['dry_run']) for start, end in chunks])
+            )
+
+        total = changed = 0
+        for (start, end), (chunk_total, chunk_changed) in zip(chunks, results):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"  PKs {start}-{end - 1}: {chunk_changed} of {chunk_total} changed")
+            total += chunk_total
+            changed += chunk_changed
+
+        return total, changed
+
     def handle(self, *args, **options):
 
         models = self._get_models(args)
+        if options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError("The chunk size and number of workers must be positive integers.")
 
         if options['verbosity']:
             self.stdout.write(f"Renaturalizing {len(models)} models.")
 
-        for model, fields in models:
-            for field in fields:
-                target_field = field.target_field
-                naturalize = field.naturalize_function
-                count = 0
-
-                # Print the model and field name
-                if options['verbosity']:
-                    self.stdout.write(
-                        f"{model._meta.label}.{field.target_field} ({field.name})... ",
-                        ending='\n' if options['verbosity'] >= 2 else ''
-                    )
-                    self.stdout.flush()
-
-                # Find all unique values for the field
-                queryset = model.objects.values_list(target_field, flat=True).order_by(target_field).distinct()
-                for value in queryset:
-                    naturalized_value = naturalize(value, max_length=field.max_length)
-
-                    if options['verbosity'] >= 2:
-                        self.stdout.write(f"  {value} -> {naturalized_value}", ending='')
+        # Worker processes are forked, so that each inherits the configured Django environment
+        executor = None
+        if options['workers'] > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=multiprocessing.get_context('fork')
+            )
+
+        try:
+            for model, fields in models:
+                for field in fields:
+
+                    # Print the model and field name
+                    if options['verbosity']:
+                        self.stdout.write(
+                            f"{model._meta.label}.{field.target_field} ({field.name})... ",
+                            ending='\n' if options['verbosity'] >= 2 else ''
+                        )
                         self.stdout.flush()
 
-                    # Update each unique field value in bulk
-                    changed = model.objects.filter(name=value).update(**{field.name: naturalized_value})
+                    chunks = get_chunks(model, options['chunk_size'])
+                    total, changed = self._renaturalize(model, field, chunks, executor, options)
+
+                    # Invalidate any cached data which depends on the ordering of objects
+                    if changed and not options['dry_run']:
+                        increment_change_counter(model)
 
+                    # Print the total count of alterations for the field
+                    if options['dry_run']:
+                        result = f"{changed} of {total} {model._meta.verbose_name_plural} would be updated"
+                    else:
+                        result = f"{changed} of {total} {model._meta.verbose_name_plural} updated"
                     if options['verbosity'] >= 2:
-                        self.stdout.write(f" ({changed})")
-                    count += changed
-
-                # Print the total count of alterations for the field
-                if options['verbosity'] >= 2:
-                    self.stdout.write(self.style.SUCCESS(
-                        f"{count} {model._meta.verbose_name_plural} updated ({queryset.count()} unique values)"
-                    ))
-                elif options['verbosity']:
-                    self.stdout.write(self.style.SUCCESS(str(count)))
+                        self.stdout.write(self.style.SUCCESS(result))
+                    elif options['verbosity']:
+                        self.stdout.write(self.style.SUCCESS(str(changed)))
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         if options['verbosity']:
             self.stdout.write(self.style.SUCCESS("Done."))
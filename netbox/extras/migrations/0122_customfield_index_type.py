@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0121_customfield_related_object_filter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customfield',
+            name='index_type',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
@@ -125,6 +125,8 @@ class ConfigContext(SyncedDataMixin, CloningMixin, CustomLinksMixin, ChangeLogge
         'tenants', 'tags', 'data',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['weight', 'name']
         verbose_name = _('config context')
@@ -235,6 +237,8 @@ class ConfigTemplate(SyncedDataMixin, CustomLinksMixin, ExportTemplatesMixin, Ta
         )
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('config template')
@@ -8,19 +8,24 @@ from django import forms
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import RegexValidator, ValidationError
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.backends.utils import truncate_name
 from django.urls import reverse
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
+from core.choices import JobStatusChoices
 from core.models import ObjectType
 from extras.choices import *
+from extras.constants import CUSTOMFIELD_DATA_CHUNK_SIZE, CUSTOMFIELD_INDEX_PREFIX
 from extras.data import CHOICE_SETS
+from netbox.context import current_request
 from netbox.models import ChangeLoggedModel
-from netbox.models.features import CloningMixin, ExportTemplatesMixin
+from netbox.models.features import CloningMixin, ExportTemplatesMixin, JobsMixin
 from netbox.search import FieldTypes
 from utilities import filters
+from utilities.changes import increment_change_counter
 from utilities.datetime import datetime_from_timestamp
 from utilities.forms.fields import (
     CSVChoiceField, CSVModelChoiceField, CSVModelMultipleChoiceField, CSVMultipleChoiceField, DynamicChoiceField,
@@ -58,6 +63,50 @@ class CustomFieldManager(models.Manager.from_queryset(RestrictedQuerySet)):
         content_type = ObjectType.objects.get_for_model(model._meta.concrete_model)
         return self.get_queryset().filter(object_types=content_type)
 
+    def get_index_definitions(self):
+        """
+        Return a dictionary mapping the name of each database index required by a CustomField to the SQL which creates
+        it (without the CONCURRENTLY keyword).
+        """
+        indexes = {}
+        custom_fields = self.get_queryset().exclude(index_type='').prefetch_related('object_types')
+        for custom_field in custom_fields:
+            for object_type in custom_field.object_types.all():
+                if model := object_type.model_class():
+                    indexes[custom_field.get_index_name(model)] = custom_field.get_index_sql(model)
+        return indexes
+
+    def sync_indexes(self, concurrently=True):
+        """
+        Create any missing database indexes for CustomFields, and drop any which are no longer needed. Returns a
+        tuple of the names of the indexes created and dropped.
+
+        Indexes are created and dropped concurrently (without blocking writes) by default. Concurrent operations cannot
+        be performed inside a transaction.
+        """
+        desired = self.get_index_definitions()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname LIKE %s AND pg_table_is_visible(c.oid)",
+                [f'{CUSTOMFIELD_INDEX_PREFIX}\\_%']
+            )
+            existing = dict(cursor.fetchall())
+        concurrently = 'CONCURRENTLY ' if concurrently else ''
+
+        # Drop indexes which are no longer needed, or which were left invalid by a failed concurrent build
+        dropped = sorted(name for name, valid in existing.items() if name not in desired or not valid)
+        for name in dropped:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP INDEX {concurrently}IF EXISTS "{name}"')
+
+        created = sorted(name for name in desired if name in dropped or name not in existing)
+        for name in created:
+            with connection.cursor() as cursor:
+                cursor.execute(desired[name].replace('CREATE INDEX ', f'CREATE INDEX {concurrently}', 1))
+
+        return created, dropped
+
     def get_defaults_for_model(self, model):
         """
         Return a dictionary of serialized default values for all CustomFields applicable to the given model.
@@ -68,7 +117,7 @@ class CustomFieldManager(models.Manager.from_queryset(RestrictedQuerySet)):
         }
 
 
-class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
+class CustomField(CloningMixin, ExportTemplatesMixin, JobsMixin, ChangeLoggedModel):
     object_types = models.ManyToManyField(
         to='core.ObjectType',
         related_name='custom_fields',
@@ -151,6 +200,16 @@ class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
         default=CustomFieldFilterLogicChoices.FILTER_LOOSE,
         help_text=_("Loose matches any instance of a given string; exact matches the entire field.")
     )
+    index_type = models.CharField(
+        verbose_name=_('index type'),
+        max_length=50,
+        choices=CustomFieldIndexTypeChoices,
+        blank=True,
+        help_text=_(
+            "Maintain a database index on this field's values. B-tree indexes accelerate exact matches; GIN indexes "
+            "accelerate containment lookups (e.g. multiple selection and multiple object fields)."
+        )
+    )
     default = models.JSONField(
         verbose_name=_('default'),
         blank=True,
@@ -230,7 +289,7 @@ class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
 
     clone_fields = (
         'object_types', 'type', 'related_object_type', 'group_name', 'description', 'required', 'unique',
-        'search_weight', 'filter_logic', 'default', 'weight', 'validation_minimum', 'validation_maximum',
+        'search_weight', 'filter_logic', 'index_type', 'default', 'weight', 'validation_minimum', 'validation_maximum',
         'validation_regex', 'choice_set', 'ui_visible', 'ui_editable', 'is_cloneable',
     )
 
@@ -254,6 +313,7 @@ class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
 
         # Cache instance's original name so we can check later whether it has changed
         self._name = self.__dict__.get('name')
+        self._index_type = self.__dict__.get('index_type')
 
     @property
     def search_type(self):
@@ -265,6 +325,26 @@ class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
             return self.choice_set.choices
         return []
 
+    def get_index_name(self, model):
+        """
+        Return the name of the database index for this field on the given model's table.
+        """
+        name = f'{CUSTOMFIELD_INDEX_PREFIX}_{model._meta.db_table}_{self.name}_{self.index_type}'
+        return truncate_name(name, connection.ops.max_name_length())
+
+    def get_index_sql(self, model):
+        """
+        Return the SQL statement which creates the database index for this field on the given model's table. Indexes
+        are built on the expression (custom_field_data -> 'name'), which is the form employed by all JSON lookups.
+        """
+        table = model._meta.db_table
+        expression = f'("custom_field_data" -> \'{self.name}\')'
+        if self.index_type == CustomFieldIndexTypeChoices.INDEX_GIN:
+            return (
+                f'CREATE INDEX "{self.get_index_name(model)}" ON "{table}" USING gin ({expression} jsonb_path_ops)'
+            )
+        return f'CREATE INDEX "{self.get_index_name(model)}" ON "{table}" ({expression})'
+
     def get_ui_visible_color(self):
         return CustomFieldUIVisibleChoices.colors.get(self.ui_visible)
 
@@ -276,41 +356,74 @@ class CustomField(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
             self._choice_map = dict(self.choices)
         return self._choice_map.get(value, value)
 
+    @property
+    def data_pending(self):
+        """
+        Return True if a background job which updates the custom field data of assigned objects has not yet completed.
+        """
+        return self.jobs.filter(status__in=JobStatusChoices.ENQUEUED_STATE_CHOICES).exists()
+
     def populate_initial_data(self, content_types):
         """
         Populate initial custom field data upon either a) the creation of a new CustomField, or
         b) the assignment of an existing CustomField to new object types.
         """
-        for ct in content_types:
-            model = ct.model_class()
-            instances = model.objects.exclude(**{'custom_field_data__contains': self.name})
-            for instance in instances:
-                instance.custom_field_data[self.name] = self.default
-            model.objects.bulk_update(instances, ['custom_field_data'], batch_size=100)
+        self.update_object_data(content_types, 'populate', field_name=self.name, value=self.default)
 
     def remove_stale_data(self, content_types):
         """
         Delete custom field data which is no longer relevant (either because the CustomField is
         no longer assigned to a model, or because it has been deleted).
         """
-        for ct in content_types:
-            if model := ct.model_class():
-                instances = model.objects.filter(custom_field_data__has_key=self.name)
-                for instance in instances:
-                    del instance.custom_field_data[self.name]
-                model.objects.bulk_update(instances, ['custom_field_data'], batch_size=100)
+        self.update_object_data(content_types, 'remove', field_name=self.name)
 
     def rename_object_data(self, old_name, new_name):
         """
         Called when a CustomField has been renamed. Updates all assigned object data.
         """
-        for ct in self.object_types.all():
-            model = ct.model_class()
-            params = {f'custom_field_data__{old_name}__isnull': False}
-            instances = model.objects.filter(**params)
-            for instance in instances:
-                instance.custom_field_data[new_name] = instance.custom_field_data.pop(old_name)
-            model.objects.bulk_update(instances, ['custom_field_data'], batch_size=100)
+        self.update_object_data(self.object_types.all(), 'rename', old_name=old_name, new_name=new_name)
+
+    def update_object_data(self, content_types, action, **kwargs):
+        """
+        Update the custom field data of all objects of the given types. If no more than CUSTOMFIELD_DATA_CHUNK_SIZE
+        objects are affected, the update is applied immediately. Otherwise, it is performed by a background job once
+        the current transaction has been committed, and the field is marked as pending until the job completes.
+
+        Args:
+            content_types: An iterable of ObjectTypes
+            action: The update to perform (see CustomFieldDataJob)
+            kwargs: Arguments passed to the update function
+        """
+        from extras.jobs import CustomFieldDataJob
+
+        content_types = [ct for ct in content_types if ct.model_class()]
+
+        # Count the affected objects, up to the chunk size
+        count = 0
+        for ct in content_types:
+            count += ct.model_class().objects.order_by()[:CUSTOMFIELD_DATA_CHUNK_SIZE + 1 - count].count()
+            if count > CUSTOMFIELD_DATA_CHUNK_SIZE:
+                break
+
+        if count <= CUSTOMFIELD_DATA_CHUNK_SIZE:
+            for ct in content_types:
+                CustomFieldDataJob.actions[action](ct.model_class().objects.all(), **kwargs)
+                increment_change_counter(ct.model_class())
+            return
+
+        pk = self.pk
+
+        def enqueue_job():
+            request = current_request.get()
+            CustomFieldDataJob.enqueue(
+                # The field may have since been deleted
+                instance=CustomField.objects.filter(pk=pk).first(),
+                user=request.user if request else None,
+                action=action,
+                object_types=[ct.pk for ct in content_types],
+                params=kwargs
+            )
+        transaction.on_commit(enqueue_job)
 
     def clean(self):
         super().clean()
@@ -1,4 +1,5 @@
 import json
+import tempfile
 import urllib.parse
 
 from django.conf import settings
@@ -6,7 +7,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelatio
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import FileResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -18,13 +19,14 @@ from extras.conditions import ConditionSet
 from extras.constants import *
 from extras.utils import image_upload
 from netbox.config import get_config
+from netbox.constants import EXPORT_SPOOL_SIZE
 from netbox.events import get_event_type_choices
 from netbox.models import ChangeLoggedModel
 from netbox.models.features import (
     CloningMixin, CustomFieldsMixin, CustomLinksMixin, ExportTemplatesMixin, SyncedDataMixin, TagsMixin,
 )
 from utilities.html import clean_html
-from utilities.jinja2 import render_jinja2
+from utilities.jinja2 import render_jinja2, stream_jinja2
 from utilities.querydict import dict_to_querydict
 from utilities.querysets import RestrictedQuerySet
 
@@ -108,6 +110,8 @@ class EventRule(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, ChangeLogged
         blank=True
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         indexes = (
@@ -229,6 +233,8 @@ class Webhook(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, ChangeLoggedMo
         object_id_field='action_object_id'
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('webhook')
@@ -336,6 +342,8 @@ class CustomLink(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
         'object_types', 'enabled', 'weight', 'group_name', 'button_class', 'new_window',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['group_name', 'weight', 'name']
         verbose_name = _('custom link')
@@ -425,6 +433,8 @@ class ExportTemplate(SyncedDataMixin, CloningMixin, ExportTemplatesMixin, Change
         'object_types', 'template_code', 'mime_type', 'file_extension', 'as_attachment',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('export template')
@@ -469,23 +479,62 @@ class ExportTemplate(SyncedDataMixin, CloningMixin, ExportTemplatesMixin, Change
 
         return output
 
+    def render_stream(self, queryset):
+        """
+        Render the contents of the template incrementally, yielding output as it is produced. (To avoid loading all
+        objects into memory at once, the template may iterate over `queryset.iterator()`.)
+        """
+        context = {
+            'queryset': queryset
+        }
+        output = stream_jinja2(self.template_code, context)
+
+        # Replace CRLF-style line terminators, which may be split between chunks
+        def _normalize(chunks):
+            carry = ''
+            for chunk in chunks:
+                chunk = carry + chunk
+                carry = '\r' if chunk.endswith('\r') else ''
+                if carry:
+                    chunk = chunk[:-1]
+                yield chunk.replace('\r\n', '\n')
+            if carry:
+                yield carry
+
+        return _normalize(output)
+
+    def get_filename(self, model):
+        """
+        Return the name of the file to which output rendered for the given model is saved
+        """
+        basename = model._meta.verbose_name_plural.replace(' ', '_')
+        extension = f'.{self.file_extension}' if self.file_extension else ''
+        return f'netbox_{basename}{extension}'
+
     def render_to_response(self, queryset):
         """
-        Render the template to an HTTP response, delivered as a named file attachment
+        Render the template to a streaming HTTP response, delivered as a named file attachment. The template is
+        rendered in full (to a temporary file, beyond EXPORT_SPOOL_SIZE) before the response is returned, so that any
+        error is raised rather than truncating the output.
         """
-        output = self.render(queryset)
         mime_type = 'text/plain; charset=utf-8' if not self.mime_type else self.mime_type
 
-        # Build the response
-        response = HttpResponse(output, content_type=mime_type)
-
-        if self.as_attachment:
-            basename = queryset.model._meta.verbose_name_plural.replace(' ', '_')
-            extension = f'.{self.file_extension}' if self.file_extension else ''
-            filename = f'netbox_{basename}{extension}'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        try:
+            for chunk in self.render_stream(queryset):
+                output.write(chunk.encode('utf-8'))
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
 
-        return response
+        # Build the response
+        return FileResponse(
+            output,
+            content_type=mime_type,
+            as_attachment=self.as_attachment,
+            filename=self.get_filename(queryset.model) if self.as_attachment else ''
+        )
 
 
 class SavedFilter(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
@@ -538,6 +587,8 @@ class SavedFilter(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel):
         'object_types', 'weight', 'enabled', 'parameters',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('weight', 'name')
         verbose_name = _('saved filter')
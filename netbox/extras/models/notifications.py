@@ -147,6 +147,8 @@ class NotificationGroup(ChangeLoggedModel):
 
     objects = RestrictedQuerySet.as_manager()
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('notification group')
@@ -44,6 +44,8 @@ class Tag(CloningMixin, ExportTemplatesMixin, ChangeLoggedModel, TagBase):
         'color', 'description', 'object_types',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         verbose_name = _('tag')
@@ -1,5 +1,6 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
 from django.dispatch import receiver
 
 from core.events import *
@@ -11,7 +12,8 @@ from netbox.config import get_config
 from netbox.registry import registry
 from netbox.signals import post_clean
 from utilities.exceptions import AbortRequest
-from .models import CustomField, TaggedItem
+from .caching import definition_cache
+from .models import CustomField, CustomFieldChoiceSet, CustomLink, TaggedItem
 from .utils import run_validators
 
 
@@ -50,10 +52,74 @@ def handle_cf_deleted(instance, **kwargs):
     instance.remove_stale_data(instance.object_types.all())
 
 
+def enqueue_cf_index_sync():
+    """
+    Schedule the creation/removal of custom field indexes once the current transaction has been committed.
+    """
+    from .jobs import CustomFieldIndexJob
+    transaction.on_commit(CustomFieldIndexJob.enqueue)
+
+
+def handle_cf_index_changed(instance, created, **kwargs):
+    """
+    Synchronize custom field indexes when the index type or name of a CustomField has been changed.
+    """
+    if created:
+        return
+    if instance.index_type != instance._index_type or (instance.index_type and instance.name != instance._name):
+        enqueue_cf_index_sync()
+
+
+def handle_cf_index_obj_types(instance, action, reverse, **kwargs):
+    """
+    Synchronize custom field indexes when an indexed CustomField is assigned to or removed from object types.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse and instance.index_type:
+        enqueue_cf_index_sync()
+
+
+def handle_cf_index_deleted(instance, **kwargs):
+    """
+    Drop the indexes of an indexed CustomField which has been deleted.
+    """
+    if instance.index_type:
+        enqueue_cf_index_sync()
+
+
 post_save.connect(handle_cf_renamed, sender=CustomField)
 pre_delete.connect(handle_cf_deleted, sender=CustomField)
 m2m_changed.connect(handle_cf_added_obj_types, sender=CustomField.object_types.through)
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.object_types.through)
+post_save.connect(handle_cf_index_changed, sender=CustomField)
+post_delete.connect(handle_cf_index_deleted, sender=CustomField)
+m2m_changed.connect(handle_cf_index_obj_types, sender=CustomField.object_types.through)
+
+
+#
+# Custom field & custom link definition caching
+#
+
+def invalidate_definition_cache(**kwargs):
+    """
+    Invalidate the cache of custom field & custom link definitions whenever a definition is modified.
+    """
+    if kwargs.get('action', 'post_').startswith('post_'):
+        definition_cache.invalidate()
+
+
+for model in (CustomField, CustomFieldChoiceSet, CustomLink):
+    post_save.connect(invalidate_definition_cache, sender=model)
+    post_delete.connect(invalidate_definition_cache, sender=model)
+m2m_changed.connect(invalidate_definition_cache, sender=CustomField.object_types.through)
+m2m_changed.connect(invalidate_definition_cache, sender=CustomLink.object_types.through)
+
+
+@receiver(post_migrate)
+def clear_definition_cache(**kwargs):
+    """
+    Discard any locally cached definitions after the database has been migrated or flushed.
+    """
+    definition_cache.clear()
 
 
 #
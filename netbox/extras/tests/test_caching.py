@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ObjectType
+from dcim.filtersets import SiteFilterSet
+from dcim.models import Site
+from dcim.tables import SiteTable
+from extras.caching import definition_cache, get_custom_fields, get_custom_links
+from extras.models import CustomField, CustomLink
+
+
+class DefinitionCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site_type = ObjectType.objects.get_for_model(Site)
+        custom_field = CustomField.objects.create(name='cf1', type='text', filter_logic='exact')
+        custom_field.object_types.set([site_type])
+        custom_link = CustomLink.objects.create(name='Link 1', link_text='Link', link_url='http://example.com/')
+        custom_link.object_types.set([site_type])
+
+    def setUp(self):
+        # Simulate the commit of the test data, so that the cache is not bypassed
+        definition_cache._local.pending = False
+        definition_cache.increment_version()
+
+    def tearDown(self):
+        definition_cache.clear()
+
+    def test_get_definitions(self):
+        self.assertEqual([cf.name for cf in get_custom_fields(Site)], ['cf1'])
+        self.assertEqual([cl.name for cl in get_custom_links(Site)], ['Link 1'])
+
+        # Cached definitions should be returned without querying the database
+        with CaptureQueriesContext(connection) as ctx:
+            get_custom_fields(Site)
+            get_custom_links(Site)
+            SiteFilterSet({'cf_cf1': 'foo'}, Site.objects.all())
+            SiteTable([])
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_derived_objects(self):
+        filterset1 = SiteFilterSet({}, Site.objects.all())
+        filterset2 = SiteFilterSet({}, Site.objects.all())
+        self.assertIn('cf_cf1', filterset1.filters)
+        self.assertIn('cf_cf1__ic', filterset1.filters)
+
+        # Each FilterSet must receive its own copy of each custom field filter
+        self.assertIsNot(filterset1.filters['cf_cf1'], filterset2.filters['cf_cf1'])
+
+        table1 = SiteTable([])
+        table2 = SiteTable([])
+        self.assertIn('cf_cf1', table1.columns.names())
+        self.assertIn('cl_Link 1', table1.columns.names())
+        table1.columns.show('cf_cf1')
+        self.assertFalse(table2.columns['cf_cf1'].visible)
+
+    def test_invalidation(self):
+        version = definition_cache.version
+        self.assertEqual(len(get_custom_fields(Site)), 1)
+
+        # Modifying a definition within a transaction bypasses the cache for the current thread
+        custom_field = CustomField.objects.create(name='cf2', type='text')
+        custom_field.object_types.set([ObjectType.objects.get_for_model(Site)])
+        self.assertTrue(definition_cache.pending)
+        self.assertEqual([cf.name for cf in get_custom_fields(Site)], ['cf1', 'cf2'])
+        self.assertIn('cf_cf2', SiteFilterSet({}, Site.objects.all()).filters)
+
+        # Committing the change increments the version
+        definition_cache._local.pending = False
+        definition_cache.increment_version()
+        self.assertNotEqual(definition_cache.version, version)
+        self.assertEqual([cf.name for cf in get_custom_fields(Site)], ['cf1', 'cf2'])
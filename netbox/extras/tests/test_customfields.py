@@ -1,15 +1,20 @@
 import datetime
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.urls import reverse
+from django_rq import get_queue
 from rest_framework import status
 
-from core.models import ObjectType
+from core.choices import JobStatusChoices
+from core.models import Job, ObjectType
 from dcim.filtersets import SiteFilterSet
-from dcim.forms import SiteImportForm
+from dcim.forms import SiteForm, SiteImportForm
 from dcim.models import Manufacturer, Rack, Site
 from extras.choices import *
+from extras.jobs import CustomFieldDataJob, CustomFieldIndexJob
 from extras.models import CustomField, CustomFieldChoiceSet
 from ipam.models import VLAN
 from netbox.choices import CSVDelimiterChoices, ImportFormatChoices
@@ -613,6 +618,206 @@ class CustomFieldManagerTest(TestCase):
         self.assertEqual(CustomField.objects.get_for_model(Site).count(), 1)
         self.assertEqual(CustomField.objects.get_for_model(VirtualMachine).count(), 0)
 
+    def get_indexes(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname LIKE 'nbcf\\_%%'",
+                [table]
+            )
+            return dict(cursor.fetchall())
+
+    def test_sync_indexes(self):
+        custom_field = CustomField.objects.get(name='text_field')
+        custom_field.index_type = CustomFieldIndexTypeChoices.INDEX_BTREE
+        with self.captureOnCommitCallbacks() as callbacks:
+            custom_field.save()
+        self.assertIn(CustomFieldIndexJob.enqueue, callbacks)
+
+        created, dropped = CustomField.objects.sync_indexes(concurrently=False)
+        index_name = custom_field.get_index_name(Site)
+        self.assertEqual(created, [index_name])
+        self.assertEqual(dropped, [])
+        self.assertIn("(custom_field_data -> 'text_field'::text)", self.get_indexes('dcim_site')[index_name])
+
+        # Filtering on the field should employ the index
+        custom_field.filter_logic = CustomFieldFilterLogicChoices.FILTER_EXACT
+        custom_field.save()
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = SiteFilterSet({'cf_text_field': 'foo'}, Site.objects.all()).qs.explain()
+        self.assertIn(index_name, plan)
+
+        # Changing the index type replaces the index
+        custom_field.index_type = CustomFieldIndexTypeChoices.INDEX_GIN
+        custom_field.save()
+        created, dropped = CustomField.objects.sync_indexes(concurrently=False)
+        self.assertEqual(created, [custom_field.get_index_name(Site)])
+        self.assertEqual(dropped, [index_name])
+        self.assertIn('USING gin', self.get_indexes('dcim_site')[created[0]])
+
+        # Removing the object type drops the index
+        with self.captureOnCommitCallbacks() as callbacks:
+            custom_field.object_types.clear()
+        self.assertIn(CustomFieldIndexJob.enqueue, callbacks)
+        self.assertEqual(CustomField.objects.sync_indexes(concurrently=False), ([], created))
+        self.assertEqual(self.get_indexes('dcim_site'), {})
+
+
+class CustomFieldDataJobTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+
+    def tearDown(self):
+        super().tearDown()
+
+        # Clear all queues after running each test
+        get_queue('default').connection.flushall()
+
+    def run_pending_jobs(self, custom_field):
+        queue = get_queue('default')
+        for job in custom_field.jobs.all():
+            queue.fetch_job(str(job.job_id)).perform()
+
+    @patch('extras.models.customfields.CUSTOMFIELD_DATA_CHUNK_SIZE', 2)
+    def test_populate_initial_data(self):
+        custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT, default='foo')
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.object_types.set([ObjectType.objects.get_for_model(Site)])
+
+        # Objects are updated by a background job
+        job = custom_field.jobs.get()
+        self.assertEqual(job.name, CustomFieldDataJob.name)
+        self.assertTrue(custom_field.data_pending)
+        self.assertFalse(Site.objects.filter(custom_field_data__has_key='cf1').exists())
+
+        self.run_pending_jobs(custom_field)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED, job.error)
+        self.assertEqual(job.data['progress'], {'total': 1, 'completed': 1, 'updated': 5})
+        self.assertFalse(custom_field.data_pending)
+        for site in Site.objects.all():
+            self.assertEqual(site.custom_field_data, {'cf1': 'foo'})
+
+    @patch('extras.models.customfields.CUSTOMFIELD_DATA_CHUNK_SIZE', 2)
+    def test_rename_and_delete(self):
+        Site.objects.update(custom_field_data={'cf1': 'foo', 'cf2': 'bar'})
+        custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT)
+        custom_field.object_types.through.objects.create(
+            customfield=custom_field, objecttype=ObjectType.objects.get_for_model(Site)
+        )
+
+        custom_field.name = 'cf3'
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.save()
+        self.run_pending_jobs(custom_field)
+        for site in Site.objects.all():
+            self.assertEqual(site.custom_field_data, {'cf2': 'bar', 'cf3': 'foo'})
+
+        # The data of a deleted field is removed by a job which is not assigned to the field
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.delete()
+        job = Job.objects.get(name=CustomFieldDataJob.name, object_id__isnull=True)
+        get_queue('default').fetch_job(str(job.job_id)).perform()
+        for site in Site.objects.all():
+            self.assertEqual(site.custom_field_data, {'cf2': 'bar'})
+
+    @patch('extras.models.customfields.CUSTOMFIELD_DATA_CHUNK_SIZE', 2)
+    def test_edit_object_while_pending(self):
+        Site.objects.update(custom_field_data={'cf1': 'foo', 'cf2': 'bar'})
+        object_type = ObjectType.objects.get_for_model(Site)
+        cf1 = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT)
+        cf2 = CustomField.objects.create(name='cf2', type=CustomFieldTypeChoices.TYPE_TEXT)
+        for custom_field in (cf1, cf2):
+            custom_field.object_types.through.objects.create(customfield=custom_field, objecttype=object_type)
+
+        # Rename one field, delete another, and add a required field, each deferring the update to a job
+        with self.captureOnCommitCallbacks(execute=True):
+            cf1.name = 'cf3'
+            cf1.save()
+            cf2.delete()
+            cf4 = CustomField.objects.create(
+                name='cf4', type=CustomFieldTypeChoices.TYPE_TEXT, required=True, default='baz'
+            )
+            cf4.object_types.set([object_type])
+        self.assertEqual(Job.objects.filter(name=CustomFieldDataJob.name).count(), 3)
+
+        # Objects modified before the jobs have run are validated and saved as though they had
+        site = Site.objects.first()
+        site.description = 'New description'
+        site.full_clean()
+        site.save()
+        site.refresh_from_db()
+        self.assertEqual(site.custom_field_data, {'cf3': 'foo', 'cf4': 'baz'})
+
+        # The jobs leave the object's data intact
+        site.custom_field_data['cf3'] = 'qux'
+        site.save()
+        for job in Job.objects.filter(name=CustomFieldDataJob.name):
+            get_queue('default').fetch_job(str(job.job_id)).perform()
+        site.refresh_from_db()
+        self.assertEqual(site.custom_field_data, {'cf3': 'qux', 'cf4': 'baz'})
+        self.assertEqual(Site.objects.last().custom_field_data, {'cf3': 'foo', 'cf4': 'baz'})
+
+    @patch('extras.models.customfields.CUSTOMFIELD_DATA_CHUNK_SIZE', 2)
+    def test_edit_object_while_populating(self):
+        custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT, default='foo')
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.object_types.set([ObjectType.objects.get_for_model(Site)])
+        self.assertTrue(custom_field.data_pending)
+
+        # An object edited via a form before the job has run retains the default value of a non-required field
+        site = Site.objects.first()
+        form = SiteForm(instance=site)
+        self.assertEqual(form.fields['cf_cf1'].initial, 'foo')
+        data = {
+            'name': site.name,
+            'slug': site.slug,
+            'status': site.status,
+            'cf_cf1': form.fields['cf_cf1'].initial,
+        }
+        form = SiteForm(instance=Site.objects.get(pk=site.pk), data=data)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        site.refresh_from_db()
+        self.assertEqual(site.custom_field_data, {'cf1': 'foo'})
+
+        # As does an object which was loaded before the job updated it
+        site = Site.objects.last()
+        self.run_pending_jobs(custom_field)
+        site.description = 'New description'
+        site.full_clean()
+        site.save()
+        site.refresh_from_db()
+        self.assertEqual(site.custom_field_data, {'cf1': 'foo'})
+
+    def test_chunks(self):
+        Site.objects.filter(name='Site 1').update(custom_field_data={'cf1': 'bar'})
+        job = CustomFieldDataJob.enqueue(
+            immediate=True,
+            action='populate',
+            object_types=[ObjectType.objects.get_for_model(Site).pk],
+            params={'field_name': 'cf1', 'value': 'foo'},
+            chunk_size=2
+        )
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED, job.error)
+        self.assertEqual(job.data['progress'], {'total': 3, 'completed': 3, 'updated': 4})
+
+        # Existing values are not overwritten
+        self.assertEqual(Site.objects.get(name='Site 1').custom_field_data, {'cf1': 'bar'})
+        self.assertEqual(Site.objects.get(name='Site 5').custom_field_data, {'cf1': 'foo'})
+
+    def test_small_tables_updated_immediately(self):
+        custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_INTEGER, default=1)
+        custom_field.object_types.set([ObjectType.objects.get_for_model(Site)])
+
+        self.assertFalse(custom_field.jobs.exists())
+        for site in Site.objects.all():
+            self.assertEqual(site.custom_field_data, {'cf1': 1})
+
 
 class CustomFieldAPITest(APITestCase):
 
@@ -0,0 +1,32 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from dcim.models import Interface
+from utilities.testing.utils import create_test_device
+
+
+class RenaturalizeTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        device = create_test_device('Device 1')
+        Interface.objects.bulk_create([
+            Interface(device=device, name=f'Ethernet1/{i}', type='1000base-t') for i in range(1, 11)
+        ])
+
+    def test_renaturalize(self):
+        expected = dict(Interface.objects.values_list('pk', '_name'))
+        Interface.objects.filter(name__in=('Ethernet1/2', 'Ethernet1/5', 'Ethernet1/10')).update(_name='')
+
+        # A dry run should report the number of values to be changed, without updating them
+        stdout = StringIO()
+        call_command('renaturalize', 'dcim.Interface', dry_run=True, chunk_size=4, verbosity=2, stdout=stdout)
+        self.assertIn('3 of 10 interfaces would be updated', stdout.getvalue())
+        self.assertEqual(Interface.objects.filter(_name='').count(), 3)
+
+        stdout = StringIO()
+        call_command('renaturalize', 'dcim.Interface', chunk_size=4, verbosity=2, stdout=stdout)
+        self.assertIn('3 of 10 interfaces updated', stdout.getvalue())
+        self.assertEqual(dict(Interface.objects.values_list('pk', '_name')), expected)
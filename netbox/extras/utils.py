@@ -1,6 +1,8 @@
 import importlib
 
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, Func, JSONField, Value
+from django.db.models.fields.json import KeyTransform
 from taggit.managers import _TaggableManager
 
 from netbox.context import current_request
@@ -11,10 +13,31 @@ __all__ = (
     'is_report',
     'is_script',
     'is_taggable',
+    'populate_custom_field_data',
+    'remove_custom_field_data',
+    'rename_custom_field_data',
     'run_validators',
 )
 
 
+class JSONConcat(Func):
+    """
+    Merge two JSON objects (using the PostgreSQL || operator).
+    """
+    arg_joiner = ' || '
+    template = '(%(expressions)s)'
+    output_field = JSONField()
+
+
+class JSONRemoveKey(Func):
+    """
+    Remove a key from a JSON object (using the PostgreSQL - operator).
+    """
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = JSONField()
+
+
 def is_taggable(obj):
     """
     Return True if the instance can have Tags assigned to it; False otherwise.
@@ -84,3 +107,40 @@ def run_validators(instance, validators):
             raise ImproperlyConfigured(f"Invalid value for custom validator: {validator}")
 
         validator(instance, request)
+
+
+#
+# Custom field data
+#
+# These functions update the custom field data of all objects in a QuerySet within a single UPDATE statement, without
+# loading the objects into memory. Each returns the number of objects updated.
+#
+
+def populate_custom_field_data(queryset, field_name, value):
+    """
+    Set the named custom field to the given value on all objects which do not yet have a value for it.
+    """
+    return queryset.exclude(custom_field_data__has_key=field_name).update(
+        custom_field_data=JSONConcat(F('custom_field_data'), Value({field_name: value}, output_field=JSONField()))
+    )
+
+
+def remove_custom_field_data(queryset, field_name):
+    """
+    Delete the value of the named custom field from all objects.
+    """
+    return queryset.filter(custom_field_data__has_key=field_name).update(
+        custom_field_data=JSONRemoveKey(F('custom_field_data'), Value(field_name))
+    )
+
+
+def rename_custom_field_data(queryset, old_name, new_name):
+    """
+    Move the value of a custom field from `old_name` to `new_name` on all objects.
+    """
+    return queryset.filter(custom_field_data__has_key=old_name).update(
+        custom_field_data=JSONConcat(
+            JSONRemoveKey(F('custom_field_data'), Value(old_name)),
+            Func(Value(new_name), KeyTransform(old_name, 'custom_field_data'), function='jsonb_build_object')
+        )
+    )
@@ -195,6 +195,8 @@ class Role(OrganizationalModel):
         default=1000
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('weight', 'name')
         verbose_name = _('role')
@@ -338,6 +340,27 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def pre_bulk_create(cls, instances):
+        """
+        Normalize the given prefixes as save() would, prior to their creation using bulk_create().
+        """
+        for instance in instances:
+            if isinstance(instance.prefix, netaddr.IPNetwork):
+                instance.prefix = instance.prefix.cidr
+
+    @classmethod
+    def post_bulk_create(cls, instances):
+        """
+        Update the hierarchy of the given prefixes (and of their parents and children) following their creation using
+        bulk_create(), as the post_save signal handler would.
+        """
+        from ipam.signals import update_children_depth, update_parents_children
+
+        for instance in instances:
+            update_parents_children(instance)
+            update_children_depth(instance)
+
     @property
     def family(self):
         return self.prefix.version if self.prefix else None
@@ -910,6 +933,14 @@ class IPAddress(ContactsMixin, PrimaryModel):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def pre_bulk_create(cls, instances):
+        """
+        Normalize the given IP addresses as save() would, prior to their creation using bulk_create().
+        """
+        for instance in instances:
+            instance.dns_name = instance.dns_name.lower()
+
     def clone(self):
         attrs = super().clone()
 
@@ -89,6 +89,8 @@ class RouteTarget(PrimaryModel):
         null=True
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         verbose_name = _('route target')
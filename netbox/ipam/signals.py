@@ -2,6 +2,7 @@ from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
+from netbox.bulk import register_bulk_create_receiver
 from virtualization.models import VirtualMachine
 from .models import IPAddress, Prefix
 
@@ -26,6 +27,8 @@ def update_children_depth(prefix):
     Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
 
 
+# Replicated by Prefix.post_bulk_create() for prefixes created in bulk
+@register_bulk_create_receiver
 @receiver(post_save, sender=Prefix)
 def handle_prefix_saved(instance, created, **kwargs):
 
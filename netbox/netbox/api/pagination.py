@@ -1,7 +1,16 @@
+import binascii
+from base64 import b64decode, b64encode
+from urllib import parse
+
 from django.db.models import QuerySet
-from rest_framework.pagination import LimitOffsetPagination
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, LimitOffsetPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
+from utilities.query import estimate_count, get_queryset_count
 
 
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
@@ -9,12 +18,27 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Keyset (cursor-based) pagination may be requested by passing the `cursor` query parameter (empty for the first
+    page). Objects are then ordered by primary key and each page is retrieved by filtering on the last primary key of
+    the previous page, rather than by offset. The reported count in this mode is an estimate.
     """
+    cursor_query_param = 'cursor'
+    exact_count_query_param = 'exact_count'
+    invalid_cursor_message = _('Invalid cursor')
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.count_is_exact = True
+        self.cursor = None
 
     def paginate_queryset(self, queryset, request, view=None):
 
+        # Employ keyset pagination if a cursor has been specified
+        if self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_cursor(queryset, request)
+
+        self.request = request
         if isinstance(queryset, QuerySet):
             self.count = self.get_queryset_count(queryset)
         else:
@@ -23,11 +47,19 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
 
         self.limit = self.get_limit(request)
         self.offset = self.get_offset(request)
-        self.request = request
 
         if self.limit and self.count > self.limit and self.template is not None:
             self.display_page_controls = True
 
+        # An approximate count cannot be relied upon to determine whether another page follows. Instead, retrieve
+        # one extra object.
+        if not self.count_is_exact:
+            if not self.limit:
+                return list(queryset[self.offset:])
+            results = list(queryset[self.offset:self.offset + self.limit + 1])
+            self.has_next = len(results) > self.limit
+            return results[:self.limit]
+
         if self.count == 0 or self.offset > self.count:
             return list()
 
@@ -53,7 +85,15 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         return self.default_limit
 
     def get_queryset_count(self, queryset):
-        return queryset.count()
+        count, self.count_is_exact = get_queryset_count(queryset, exact=self.exact_count)
+        return count
+
+    @property
+    def exact_count(self):
+        """
+        An exact count may be requested for models which are otherwise counted approximately (see APPROXIMATE_COUNTS).
+        """
+        return self.request.query_params.get(self.exact_count_query_param, '').lower() == 'true'
 
     def get_next_link(self):
 
@@ -61,6 +101,19 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        if self.cursor is not None:
+            if not self.has_next:
+                return None
+            if not self.page_keys:
+                return self.encode_cursor(None)
+            return self.encode_cursor(self.page_keys[-1])
+
+        if not self.count_is_exact:
+            if not self.has_next:
+                return None
+            url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+            return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
         return super().get_next_link()
 
     def get_previous_link(self):
@@ -69,8 +122,95 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        if self.cursor is not None:
+            if not self.has_previous or not self.page_keys:
+                return None
+            return self.encode_cursor(self.page_keys[0], reverse=True)
+
         return super().get_previous_link()
 
+    #
+    # Keyset pagination
+    #
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.cursor = self.decode_cursor(request)
+        self.count = self.get_queryset_estimate(queryset)
+
+        # A reverse cursor retrieves the page preceding its position. Determine whether primary keys decrease as we
+        # walk away from the cursor.
+        descending = self.get_cursor_descending(request)
+        backward = descending != self.cursor.reverse
+        queryset = queryset.order_by('-pk' if backward else 'pk')
+        if self.cursor.position is not None:
+            queryset = queryset.filter(**{'pk__lt' if backward else 'pk__gt': self.cursor.position})
+
+        # Retrieve one extra object to determine whether another page follows
+        if self.limit:
+            results = list(queryset[:self.limit + 1])
+            has_more = len(results) > self.limit
+            del results[self.limit:]
+        else:
+            results = list(queryset)
+            has_more = False
+
+        if self.cursor.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor.position is not None
+        # Results may be model instances or dictionaries (from a values() query)
+        self.page_keys = [obj['pk'] if isinstance(obj, dict) else obj.pk for obj in results]
+
+        return results
+
+    def get_queryset_estimate(self, queryset):
+        return estimate_count(queryset)
+
+    def get_cursor_descending(self, request):
+        """
+        Keyset pagination supports ordering only by primary key (ascending or descending).
+        """
+        ordering = request.query_params.get(api_settings.ORDERING_PARAM, 'id')
+        if ordering not in ('id', 'pk', '-id', '-pk'):
+            raise ValidationError({
+                api_settings.ORDERING_PARAM: _("Cursor pagination supports ordering only by ID.")
+            })
+        return ordering.startswith('-')
+
+    def decode_cursor(self, request):
+        """
+        Decode the opaque cursor parameter into its position (primary key) and direction.
+        """
+        if not (encoded := request.query_params.get(self.cursor_query_param)):
+            return Cursor(offset=0, reverse=False, position=None)
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            position = int(tokens['p'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, position, reverse=False):
+        """
+        Return the URL for a page beginning after (or, if reversed, ending before) the given position.
+        """
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        if position is None:
+            return replace_query_param(url, self.cursor_query_param, '')
+        tokens = {'p': position}
+        if reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
 
 class StripCountAnnotationsPaginator(OptionalLimitOffsetPagination):
     """
@@ -82,4 +222,10 @@ class StripCountAnnotationsPaginator(OptionalLimitOffsetPagination):
         cloned_queryset = queryset.all()
         cloned_queryset.query.annotations.clear()
 
-        return cloned_queryset.count()
+        return super().get_queryset_count(cloned_queryset)
+
+    def get_queryset_estimate(self, queryset):
+        cloned_queryset = queryset.all()
+        cloned_queryset.query.annotations.clear()
+
+        return estimate_count(cloned_queryset)
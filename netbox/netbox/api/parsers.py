@@ -0,0 +1,37 @@
+import io
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+__all__ = (
+    'ORJSONParser',
+)
+
+# orjson parses integers beyond the 64-bit range as floats; defer any data which may contain one to the standard library
+ORJSON_BIG_INTEGER = re.compile(rb'[0-9]{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    A drop-in replacement for DRF's JSONParser which employs orjson to parse data. Any data which orjson cannot parse
+    identically (including invalid JSON, so that error messages remain consistent) is passed through to JSONParser.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import orjson
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        data = stream.read()
+        if encoding.lower().replace('_', '-') in ('utf-8', 'utf8') and not ORJSON_BIG_INTEGER.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+
+        return super().parse(io.BytesIO(data), media_type, parser_context)
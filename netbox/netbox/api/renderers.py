@@ -1,10 +1,19 @@
-from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer
+import re
+
+import netaddr
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils import encoders
 
 __all__ = (
     'FormlessBrowsableAPIRenderer',
+    'ORJSONRenderer',
     'TextRenderer',
 )
 
+# Matches floats which orjson formats differently from the standard library (e.g. "1e16" vs. "1e+16", or "0.00001"
+# vs. "1e-05"). Output containing any such value is re-rendered using the standard library.
+ORJSON_FLOAT_MISMATCH = re.compile(rb'[0-9]e|0\.0000')
+
 
 class FormlessBrowsableAPIRenderer(BrowsableAPIRenderer):
     """
@@ -26,3 +35,51 @@ class TextRenderer(BaseRenderer):
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         return str(data)
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    Extend DRF's JSONEncoder to represent IP & MAC addresses as strings.
+    """
+    def default(self, obj):
+        if isinstance(obj, (netaddr.IPNetwork, netaddr.IPAddress, netaddr.EUI)):
+            return str(obj)
+        return super().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    A drop-in replacement for DRF's JSONRenderer which employs orjson to serialize data. Output is identical to that
+    of JSONRenderer, with the exception of non-finite floats (which are rendered as null rather than raising an
+    exception). Requests for indented output, and any data which orjson cannot reproduce faithfully, are passed
+    through to JSONRenderer.
+    """
+    encoder_class = JSONEncoder
+
+    def __init__(self):
+        super().__init__()
+        # Types not supported natively by orjson (Decimals, datetimes, lazy strings, etc.) are handled by the encoder
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import orjson
+
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # E.g. integers exceeding 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        if ORJSON_FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape U+2028 and U+2029 for consistency with JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
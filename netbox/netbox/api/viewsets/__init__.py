@@ -7,10 +7,11 @@ from django.db.models import ProtectedError, RestrictedError
 from django_pglocks import advisory_lock
 from netbox.constants import ADVISORY_LOCK_KEYS
 from rest_framework import mixins as drf_mixins
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from utilities.api import get_annotations_for_serializer, get_prefetches_for_serializer
+from utilities.api import get_query_plan_for_serializer, get_values_plan_for_serializer
 from utilities.exceptions import AbortRequest
 from . import mixins
 
@@ -55,15 +56,11 @@ class BaseViewSet(GenericViewSet):
         qs = super().get_queryset()
         serializer_class = self.get_serializer_class()
 
-        # Dynamically resolve prefetches for included serializer fields and attach them to the queryset
-        if prefetch := get_prefetches_for_serializer(serializer_class, fields_to_include=self.requested_fields):
-            qs = qs.prefetch_related(*prefetch)
+        # Attach the related objects and annotations (for RelatedObjectCountFields) required by the included
+        # serializer fields to the queryset
+        plan = get_query_plan_for_serializer(serializer_class, fields_to_include=self.requested_fields)
 
-        # Dynamically resolve annotations for RelatedObjectCountFields on the serializer and attach them to the queryset
-        if annotations := get_annotations_for_serializer(serializer_class, fields_to_include=self.requested_fields):
-            qs = qs.annotate(**annotations)
-
-        return qs
+        return plan.apply(qs)
 
     def get_serializer(self, *args, **kwargs):
 
@@ -84,32 +81,47 @@ class BaseViewSet(GenericViewSet):
             return getattr(serializer_class.Meta, 'brief_fields', None)
         return None
 
+    @cached_property
+    def values_plan(self):
+        """
+        Return a ValuesPlan if the requested fields (e.g. in brief mode) of a list can be rendered to JSON directly
+        from a values() query, bypassing the instantiation of models and serializers. Otherwise, return None.
+        """
+        if self.action != 'list' or not self.requested_fields or self.format_kwarg:
+            return None
+        if not isinstance(getattr(self.request, 'accepted_renderer', None), JSONRenderer):
+            return None
+        return get_values_plan_for_serializer(self.get_serializer_class(), self.requested_fields)
+
 
 class NetBoxReadOnlyModelViewSet(
     mixins.CustomFieldsMixin,
     mixins.ExportTemplatesMixin,
+    mixins.ConditionalGetMixin,
     drf_mixins.RetrieveModelMixin,
-    drf_mixins.ListModelMixin,
+    mixins.ListModelMixin,
     BaseViewSet
 ):
     pass
 
 
 class NetBoxModelViewSet(
+    mixins.BulkCreateModelMixin,
     mixins.BulkUpdateModelMixin,
     mixins.BulkDestroyModelMixin,
     mixins.ObjectValidationMixin,
     mixins.CustomFieldsMixin,
     mixins.ExportTemplatesMixin,
+    mixins.ConditionalGetMixin,
     drf_mixins.CreateModelMixin,
     drf_mixins.RetrieveModelMixin,
     drf_mixins.UpdateModelMixin,
     drf_mixins.DestroyModelMixin,
-    drf_mixins.ListModelMixin,
+    mixins.ListModelMixin,
     BaseViewSet
 ):
     """
-    Extend DRF's ModelViewSet to support bulk update and delete functions.
+    Extend DRF's ModelViewSet to support bulk create, update, and delete functions.
     """
     def get_object_with_snapshot(self):
         """
@@ -158,6 +170,12 @@ class NetBoxModelViewSet(
 
     # Creates
 
+    def can_bulk_create(self, serializer):
+        # Views which customize the creation of objects must save each object individually
+        if type(self).perform_create is not NetBoxModelViewSet.perform_create:
+            return False
+        return super().can_bulk_create(serializer)
+
     def perform_create(self, serializer):
         model = self.queryset.model
         logger = logging.getLogger(f'netbox.api.views.{self.__class__.__name__}')
@@ -1,18 +1,43 @@
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+import hashlib
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db import models, transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import m2m_changed
 from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins as drf_mixins
+from rest_framework import serializers
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.utils import model_meta
 
+from core.api.serializers_.jobs import JobSerializer
+from core.jobs import ExportJob
 from core.models import ObjectType
-from extras.models import ExportTemplate
-from netbox.api.serializers import BulkOperationSerializer
+from core.signals import handle_changed_object, handle_m2m_change_counter
+from extras.models import CustomField, ExportTemplate, Tag, TaggedItem
+from extras.signals import validate_assigned_tags
+from extras.utils import is_taggable
+from netbox.api.serializers import BulkOperationSerializer, TaggableModelSerializer
+from netbox.bulk import BULK_CREATE_RECEIVERS, handle_bulk_create, has_unhandled_receivers
+from users.models import Group, ObjectPermission
+from utilities.api import get_query_plan_for_serializer, get_related_models_for_serializer
+from utilities.changes import get_change_counters, increment_change_counter
+from utilities.query import get_annotation_models
+from utilities.tracking import TrackingModelMixin
 
 __all__ = (
+    'BulkCreateModelMixin',
     'BulkDestroyModelMixin',
     'BulkUpdateModelMixin',
+    'ConditionalGetMixin',
     'CustomFieldsMixin',
     'ExportTemplatesMixin',
+    'ListModelMixin',
     'ObjectValidationMixin',
     'SequentialBulkCreatesMixin',
 )
@@ -34,6 +59,107 @@ class CustomFieldsMixin:
         return context
 
 
+class ConditionalGetMixin:
+    """
+    Support HTTP conditional requests for individual objects and lists. Each response carries a weak ETag derived
+    from the change counters of all models it represents (including related objects), and the representation
+    requested. The ETag of an individual object also reflects its last_updated time, which is conveyed as
+    Last-Modified. A request bearing a matching If-None-Match (or If-Modified-Since) header receives a 304 response
+    without the object(s) being serialized.
+    """
+    # Any additional models on which the representation of objects depends (for example, config contexts)
+    etag_models = ()
+
+    def get_etag_models(self, queryset):
+        """
+        Return the set of models whose objects may be represented by the response (other than the primary model).
+        """
+        model = queryset.model
+        models = {
+            *get_related_models_for_serializer(self.get_serializer_class(), self.requested_fields),
+            *get_annotation_models(queryset),
+            *self.etag_models,
+        }
+        if hasattr(model, 'custom_field_data'):
+            models.add(CustomField)
+        return models
+
+    def get_etag(self, models, *args):
+        """
+        Return a weak ETag for the requested representation of the given models' current state.
+        """
+        counters = get_change_counters(sorted(model._meta.label_lower for model in models))
+        key = (
+            self.request.accepted_media_type,
+            self.request.version,
+            self.request.META.get('QUERY_STRING', ''),
+            sorted(counters.items()),
+            *args,
+        )
+        return f'W/"{hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()}"'
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        # The state of the object itself is reflected by its last_updated time, if available
+        models = self.get_etag_models(self.get_queryset())
+        if last_updated := getattr(instance, 'last_updated', None):
+            last_modified = int(last_updated.timestamp())
+        else:
+            last_modified = None
+            models.add(type(instance))
+        etag = self.get_etag(models, instance.pk, last_updated)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+
+        # The objects included in the list depend on the user's permissions
+        models = {queryset.model, ObjectPermission, Group, *self.get_etag_models(queryset)}
+        etag = self.get_etag(models, request.user.pk)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+
+        return response
+
+
+class ListModelMixin(drf_mixins.ListModelMixin):
+    """
+    Extends DRF's ListModelMixin to render lists directly from a values() query where the view provides a
+    ValuesPlan for the request (see BaseViewSet.values_plan). The output is identical to that of the serializer.
+    """
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        plan = self.values_plan
+        if plan is None or not plan.supports(queryset):
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+
+        queryset = plan.apply(queryset)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page, request))
+        return Response(plan.render(queryset, request))
+
+
 class ExportTemplatesMixin:
     """
     Enable ExportTemplate support for list views.
@@ -45,6 +171,21 @@ class ExportTemplatesMixin:
             if et is None:
                 raise Http404
             queryset = self.filter_queryset(self.get_queryset())
+
+            # Render the export in a background job
+            if request.GET.get('background', '').lower() == 'true':
+                job = ExportJob.enqueue(
+                    user=request.user,
+                    model=queryset.model,
+                    query=queryset.query,
+                    filename=et.get_filename(queryset.model),
+                    content_type=et.mime_type or 'text/plain; charset=utf-8',
+                    template=et.pk,
+                    compress=request.GET.get('compress', '').lower() == 'true'
+                )
+                serializer = JobSerializer(job, context={'request': request})
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
             return et.render_to_response(queryset)
 
         return super().list(request, *args, **kwargs)
@@ -74,6 +215,126 @@ class SequentialBulkCreatesMixin:
         return Response(return_data, status=status.HTTP_201_CREATED, headers=headers)
 
 
+class BulkCreateModelMixin:
+    """
+    Create a list of new objects using bulk_create(), rather than by saving each object individually. All objects are
+    validated before any are created. The side effects of saving an object which are normally effected by signal
+    receivers (change logging, event rules, search caching, and the updating of change counters and counter fields) are
+    performed in batches, within the same transaction.
+
+    Objects are saved individually if the model or serializer customizes the creation of objects (e.g. by overriding
+    save() or create()), or if any other receivers are connected to the model's pre_save or post_save signals. A model
+    whose save() method only normalizes field values may replicate it for objects created in bulk by implementing the
+    pre_bulk_create() class method.
+    """
+    # Signal receivers whose effects upon the creation of an object are replicated by perform_bulk_create()
+    bulk_create_receivers = BULK_CREATE_RECEIVERS
+    bulk_create_tag_receivers = (
+        handle_changed_object,
+        handle_m2m_change_counter,
+        validate_assigned_tags,
+    )
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            # Creating a single object
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if self.can_bulk_create(serializer):
+            self.perform_bulk_create(serializer)
+        else:
+            self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def can_bulk_create(self, serializer):
+        """
+        Return True if the objects validated by the given list serializer can be created using bulk_create().
+        """
+        model = serializer.child.Meta.model
+
+        # Creation must not be customized by the model (other than as replicated by pre_bulk_create()) or the serializer
+        if model._meta.parents or any(
+            'save' in vars(cls) and 'pre_bulk_create' not in vars(cls)
+            for cls in model.__mro__ if cls not in (models.Model, TrackingModelMixin)
+        ):
+            return False
+        if type(serializer.child).create not in (TaggableModelSerializer.create, serializers.ModelSerializer.create):
+            return False
+
+        # Many-to-many assignments (other than tags) are not supported
+        relations = model_meta.get_field_info(model).relations
+        for data in serializer.validated_data:
+            if any(relations[name].to_many for name in data if name != 'tags' and name in relations):
+                return False
+
+        # Check that no unknown receivers are connected to the model's signals
+        if has_unhandled_receivers(model, self.bulk_create_receivers):
+            return False
+        if is_taggable(model):
+            receivers = m2m_changed._live_receivers(TaggedItem)[0]
+            if any(receiver not in self.bulk_create_tag_receivers for receiver in receivers):
+                return False
+
+        return True
+
+    def perform_bulk_create(self, serializer):
+        model = serializer.child.Meta.model
+        logger = logging.getLogger(f'netbox.api.views.{self.__class__.__name__}')
+        logger.info(f"Creating {len(serializer.validated_data)} new {model._meta.verbose_name_plural}")
+
+        instances = []
+        tags = []
+        for data in serializer.validated_data:
+            data = dict(data)
+            tags.append(data.pop('tags', None) or [])
+            serializers.raise_errors_on_nested_writes('create', serializer.child, data)
+            instances.append(model(**data))
+        if hasattr(model, 'pre_bulk_create'):
+            model.pre_bulk_create(instances)
+
+        # Enforce object-level permissions on save()
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(instances)
+                self._validate_objects(instances)
+                if any(tags):
+                    self._bulk_assign_tags(instances, tags)
+
+                # Retrieve the related objects to be serialized in bulk, rather than for each object in turn
+                plan = get_query_plan_for_serializer(type(serializer.child), self.requested_fields)
+                prefetch_related_objects(instances, *plan.select_related, *plan.prefetch_related)
+
+                handle_bulk_create(instances)
+        except ObjectDoesNotExist:
+            raise PermissionDenied()
+
+        serializer.instance = instances
+
+    def _bulk_assign_tags(self, instances, tags):
+        """
+        Assign tags to newly created objects using a single insert into the through table.
+        """
+        content_type = ContentType.objects.get_for_model(instances[0])
+        validate_assigned_tags(
+            sender=TaggedItem,
+            instance=instances[0],
+            action='pre_add',
+            model=Tag,
+            pk_set={tag.pk for instance_tags in tags for tag in instance_tags}
+        )
+        TaggedItem.objects.bulk_create([
+            TaggedItem(tag=tag, content_type=content_type, object_id=instance.pk)
+            for instance, instance_tags in zip(instances, tags)
+            for tag in {tag.pk: tag for tag in instance_tags}.values()
+        ])
+        increment_change_counter(TaggedItem)
+        increment_change_counter(Tag)
+
+
 class BulkUpdateModelMixin:
     """
     Support bulk modification of objects using the list endpoint for a model. Accepts a PATCH action with a list of one
@@ -0,0 +1,100 @@
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_save, pre_save
+from django_prometheus.models import model_inserts
+
+from core.choices import ObjectChangeActionChoices
+from core.events import OBJECT_CREATED
+from core.models import ObjectChange
+from core.signals import handle_change_counter, handle_changed_object
+from extras.events import enqueue_event
+from extras.signals import notify_object_changed
+from extras.utils import is_taggable
+from netbox.context import current_request, events_queue
+from netbox.denormalized import update_denormalized_fields
+from netbox.registry import registry
+from netbox.search.backends import search_backend
+from utilities.changes import increment_change_counter
+from utilities.counters import increment_counters, post_save_receiver
+from utilities.mptt import record_delayed_node
+
+__all__ = (
+    'BULK_CREATE_RECEIVERS',
+    'handle_bulk_create',
+    'has_unhandled_receivers',
+    'register_bulk_create_receiver',
+)
+
+# Signal receivers whose effects upon the creation of an object are replicated by handle_bulk_create(). (Receivers
+# registered by apps using register_bulk_create_receiver() are also considered handled.)
+BULK_CREATE_RECEIVERS = (
+    handle_change_counter,
+    handle_changed_object,
+    notify_object_changed,
+    post_save_receiver,
+    record_delayed_node,
+    search_backend.caching_handler,
+    update_denormalized_fields,
+)
+
+
+def register_bulk_create_receiver(receiver):
+    """
+    Decorator for registering a pre_save or post_save signal receiver which has no effect upon the creation of an
+    object (or whose effect is replicated by the post_bulk_create() method of each model to which it is connected), so
+    that the objects of the models to which it is connected may still be created in bulk.
+    """
+    registry['bulk_create_receivers'].append(receiver)
+    return receiver
+
+
+def has_unhandled_receivers(model, receivers=BULK_CREATE_RECEIVERS):
+    """
+    Return True if any receivers other than those given (or registered using register_bulk_create_receiver()) are
+    connected to the model's pre_save or post_save signals.
+    """
+    receivers = (*receivers, *registry['bulk_create_receivers'])
+    for signal in (pre_save, post_save):
+        if any(receiver not in receivers for receiver in signal._live_receivers(model)[0]):
+            return True
+    return False
+
+
+def handle_bulk_create(instances):
+    """
+    Effect the changes made by post_save receivers upon the creation of each of the given objects (which must all be
+    instances of the same model), for objects created using bulk_create(). Any changes specific to the model are
+    effected by its post_bulk_create() method, if defined.
+    """
+    if not instances:
+        return
+    model = type(instances[0])
+    if is_taggable(model):
+        prefetch_related_objects(instances, 'tags')
+
+    if hasattr(model, 'post_bulk_create'):
+        model.post_bulk_create(instances)
+
+    increment_counters(model, instances)
+    increment_change_counter(model)
+    search_backend.cache(instances, remove_existing=False)
+
+    # Record changes and enqueue events only if a request is being processed
+    if (request := current_request.get()) is None:
+        return
+    if hasattr(model, 'to_objectchange'):
+        objectchanges = []
+        for instance in instances:
+            objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_CREATE)
+            objectchange.user = request.user
+            objectchange.user_name = request.user.username
+            objectchange.request_id = request.id
+            objectchanges.append(objectchange)
+        ObjectChange.objects.bulk_create(objectchanges)
+        increment_change_counter(ObjectChange)
+
+        queue = events_queue.get()
+        for instance in instances:
+            enqueue_event(queue, instance, request.user, request.id, OBJECT_CREATED)
+        events_queue.set(queue)
+
+        model_inserts.labels(model._meta.model_name).inc(len(instances))
@@ -43,3 +43,9 @@ CENSOR_TOKEN_CHANGED = '***CHANGED***'
 
 # Placeholder text for empty tables
 EMPTY_TABLE_TEXT = 'No results found'
+
+# Number of objects to retrieve from the database at a time when streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+# Size (in bytes) of rendered export template output held in memory before it is written to a temporary file
+EXPORT_SPOOL_SIZE = 10 * 1024 * 1024
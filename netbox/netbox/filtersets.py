@@ -9,9 +9,10 @@ from django.utils.translation import gettext as _
 
 from core.choices import ObjectChangeActionChoices
 from core.models import ObjectChange
+from extras.caching import definition_cache, get_custom_fields
 from extras.choices import CustomFieldFilterLogicChoices
 from extras.filters import TagFilter
-from extras.models import CustomField, SavedFilter
+from extras.models import SavedFilter
 from utilities.constants import (
     FILTER_CHAR_BASED_LOOKUP_MAP, FILTER_NEGATION_LOOKUP_MAP, FILTER_TREENODE_NEGATION_LOOKUP_MAP,
     FILTER_NUMERIC_BASED_LOOKUP_MAP
@@ -286,25 +287,33 @@ class NetBoxModelFilterSet(ChangeLoggedModelFilterSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Dynamically add a Filter for each CustomField applicable to the parent model
-        custom_fields = CustomField.objects.filter(
-            object_types=ContentType.objects.get_for_model(self._meta.model)
-        ).exclude(
-            filter_logic=CustomFieldFilterLogicChoices.FILTER_DISABLED
+        # Dynamically add a Filter for each CustomField applicable to the parent model. The filters are built once per
+        # version of the custom field definitions and copied for each FilterSet instance (as with base_filters).
+        custom_field_filters = definition_cache.get(
+            ('filterset', self.__class__), self.get_custom_field_filters
         )
+        self.filters.update(deepcopy(custom_field_filters))
 
+    @classmethod
+    def get_custom_field_filters(cls):
+        """
+        Return a dictionary of Filters for all CustomFields applicable to the parent model, including any additional
+        lookups.
+        """
         custom_field_filters = {}
-        for custom_field in custom_fields:
+        for custom_field in get_custom_fields(cls._meta.model):
+            if custom_field.filter_logic == CustomFieldFilterLogicChoices.FILTER_DISABLED:
+                continue
             filter_name = f'cf_{custom_field.name}'
             filter_instance = custom_field.to_filter()
             if filter_instance:
                 custom_field_filters[filter_name] = filter_instance
 
                 # Add relevant additional lookups
-                additional_lookups = self.get_additional_lookups(filter_name, filter_instance)
+                additional_lookups = cls.get_additional_lookups(filter_name, filter_instance)
                 custom_field_filters.update(additional_lookups)
 
-        self.filters.update(custom_field_filters)
+        return custom_field_filters
 
     def search(self, queryset, name, value):
         """
@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy as _
 from core.models import ObjectType
 from extras.choices import *
 from extras.models import CustomField, Tag
+from netbox.models.features import CustomFieldsMixin as CustomFieldsModelMixin
 from utilities.forms import CSVModelForm
 from utilities.forms.fields import CSVModelMultipleChoiceField, DynamicModelMultipleChoiceField
 from utilities.forms.mixins import CheckLastUpdatedMixin
@@ -34,6 +35,13 @@ class NetBoxModelForm(CheckLastUpdatedMixin, CustomFieldsMixin, TagsMixin, forms
     def _get_content_type(self):
         return ContentType.objects.get_for_model(self._meta.model)
 
+    def _append_customfield_fields(self):
+        # Apply any pending updates to the custom field data of an existing object, so that they are reflected by the
+        # initial values of its custom fields
+        if self.instance.pk and isinstance(self.instance, CustomFieldsModelMixin):
+            self.instance.apply_pending_custom_field_updates()
+        super()._append_customfield_fields()
+
     def _get_form_field(self, customfield):
         if self.instance.pk:
             form_field = customfield.to_form_field(set_initial=False)
@@ -0,0 +1,318 @@
+import datetime
+import json
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from django_redis import get_redis_connection
+from graphql import (
+    FieldNode, FragmentDefinitionNode, FragmentSpreadNode, GraphQLError, GraphQLList, InlineFragmentNode,
+    get_named_type, get_nullable_type,
+)
+from graphql.execution import ExecutionResult
+from graphql.utilities import get_operation_ast, value_from_ast_untyped
+from prometheus_client import Counter, Histogram
+from strawberry.extensions import SchemaExtension
+
+from utilities.query import estimate_table_count
+
+__all__ = (
+    'QueryCostExtension',
+    'get_heaviest_queries',
+)
+
+logger = logging.getLogger('netbox.graphql')
+
+# Redis key of the sorted set which records the heaviest (slowest) GraphQL queries
+HEAVIEST_QUERIES_KEY = 'netbox.graphql.heaviest_queries'
+
+# Number of seconds for which table row estimates are cached
+ROW_ESTIMATE_TTL = 300
+
+QUERY_COST = Histogram(
+    'netbox_graphql_query_cost',
+    'Estimated cost (number of rows) of GraphQL queries',
+    buckets=(1, 10, 100, 1000, 10000, 100000, 1000000, 10000000, math.inf)
+)
+QUERY_DURATION = Histogram(
+    'netbox_graphql_query_duration_seconds',
+    'Execution time of GraphQL queries'
+)
+QUERIES_REJECTED = Counter(
+    'netbox_graphql_queries_rejected_total',
+    'GraphQL queries rejected for exceeding the maximum cost or the user\'s cost budget',
+    ['reason']
+)
+
+
+class QueryCostExtension(SchemaExtension):
+    """
+    Estimate the cost of each GraphQL query as the number of rows it may retrieve, based on the multiplicity of each
+    selected field and the estimated number of rows in each table. Queries which exceed GRAPHQL_MAX_COST are rejected,
+    as are all queries from a user whose total cost within the current GRAPHQL_COST_BUDGET_INTERVAL would exceed
+    GRAPHQL_COST_BUDGET.
+
+    The cost & execution time of each query are exported as Prometheus metrics, and the slowest queries are recorded
+    for review by administrators (if GRAPHQL_HEAVIEST_QUERIES is set). The cost of a query is not estimated if no
+    limits are enforced, and neither metrics nor the slowest queries are recorded.
+    """
+    _row_estimates = {}
+    _type_models = {}
+
+    def on_execute(self):
+        execution_context = self.execution_context
+        operation = get_operation_ast(execution_context.graphql_document, execution_context.operation_name)
+        if operation is None or execution_context.result:
+            yield
+            return
+
+        if not any((
+            settings.GRAPHQL_MAX_COST is not None,
+            settings.GRAPHQL_COST_BUDGET is not None,
+            settings.GRAPHQL_HEAVIEST_QUERIES,
+            settings.METRICS_ENABLED,
+        )):
+            yield
+            return
+
+        user = getattr(getattr(execution_context.context, 'request', None), 'user', None)
+        cost = self.get_cost(operation)
+        QUERY_COST.observe(cost)
+        if error := self.check_cost(user, cost):
+            execution_context.result = ExecutionResult(data=None, errors=[GraphQLError(error)])
+            yield
+            return
+
+        start = time.monotonic()
+        yield
+        duration = time.monotonic() - start
+        QUERY_DURATION.observe(duration)
+        if settings.GRAPHQL_HEAVIEST_QUERIES:
+            record_query(user, execution_context.query, cost, duration)
+
+    #
+    # Cost enforcement
+    #
+
+    def check_cost(self, user, cost):
+        """
+        Return an error message if the query must be rejected, or None if it may proceed.
+        """
+        if settings.GRAPHQL_MAX_COST is not None and cost > settings.GRAPHQL_MAX_COST:
+            logger.info(f"Rejecting GraphQL query with estimated cost {cost} from {user}")
+            QUERIES_REJECTED.labels('max_cost').inc()
+            return (
+                f"Estimated query cost ({cost}) exceeds the maximum allowed cost ({settings.GRAPHQL_MAX_COST}). "
+                f"Consider filtering by ID or by related object, or selecting fewer related objects."
+            )
+
+        if settings.GRAPHQL_COST_BUDGET is not None and user is not None:
+            interval = settings.GRAPHQL_COST_BUDGET_INTERVAL
+            window, elapsed = divmod(int(time.time()), interval)
+            key = f'netbox.graphql.budget.{user.pk or "anonymous"}.{window}'
+            cache.add(key, 0, timeout=interval)
+            if cache.incr(key, cost) > settings.GRAPHQL_COST_BUDGET:
+                cache.decr(key, cost)
+                logger.info(f"Throttling GraphQL query with estimated cost {cost} from {user}")
+                QUERIES_REJECTED.labels('budget').inc()
+                return (
+                    f"Estimated query cost ({cost}) exceeds the remaining query budget. Please retry in "
+                    f"{interval - elapsed} seconds."
+                )
+
+        return None
+
+    #
+    # Cost estimation
+    #
+
+    def get_cost(self, operation):
+        """
+        Return the estimated cost of the given operation.
+        """
+        schema = self.execution_context.schema._schema
+        fragments = {
+            definition.name.value: definition
+            for definition in self.execution_context.graphql_document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        root_type = schema.get_root_type(operation.operation)
+
+        return round(self._get_selection_set_cost(operation.selection_set, root_type, None, 1, fragments))
+
+    def _get_selection_set_cost(self, selection_set, parent_type, parent_model, count, fragments, visited=()):
+        cost = 0
+        for selection in selection_set.selections:
+
+            # Fragments are evaluated against their type condition (if any), with the same multiplicity
+            if isinstance(selection, (InlineFragmentNode, FragmentSpreadNode)):
+                fragment_visited = visited
+                if isinstance(selection, FragmentSpreadNode):
+                    if selection.name.value in visited or selection.name.value not in fragments:
+                        continue
+                    fragment_visited = (*visited, selection.name.value)
+                    selection = fragments[selection.name.value]
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.execution_context.schema._schema.get_type(
+                        selection.type_condition.name.value
+                    ) or parent_type
+                cost += self._get_selection_set_cost(
+                    selection.selection_set, fragment_type, parent_model, count, fragments, fragment_visited
+                )
+                continue
+
+            # Ignore scalar fields, which are retrieved along with their parent object
+            if not isinstance(selection, FieldNode) or not selection.selection_set:
+                continue
+            field = getattr(parent_type, 'fields', {}).get(selection.name.value)
+            if field is None:
+                continue
+
+            field_type = get_named_type(field.type)
+            model = self.get_model(field_type.name)
+            if isinstance(get_nullable_type(field.type), GraphQLList):
+                field_count = count * self.get_multiplicity(parent_model, model, self.get_filters(selection))
+            else:
+                field_count = count
+            cost += field_count + self._get_selection_set_cost(
+                selection.selection_set, field_type, model, field_count, fragments, visited
+            )
+
+        return cost
+
+    def get_model(self, type_name):
+        """
+        Return the model represented by the named GraphQL type, or None.
+        """
+        try:
+            return self._type_models[type_name]
+        except KeyError:
+            definition = self.execution_context.schema.get_type_by_name(type_name)
+            django_definition = getattr(getattr(definition, 'origin', None), '__strawberry_django_definition__', None)
+            model = self._type_models[type_name] = getattr(django_definition, 'model', None)
+            return model
+
+    def get_filters(self, field_node):
+        """
+        Return the filters applied to a list field (as a dictionary), resolving any variables.
+        """
+        for argument in field_node.arguments:
+            if argument.name.value == 'filters':
+                filters = value_from_ast_untyped(argument.value, self.execution_context.variables)
+                if isinstance(filters, dict):
+                    return filters
+        return {}
+
+    def get_multiplicity(self, parent_model, model, filters=None):
+        """
+        Return the estimated number of objects in a list of the given model: the number of rows in its table for a
+        top-level list, or the average number of related rows per parent object for a nested list. The estimate is
+        reduced by any filters which limit the list to specific objects (see get_filtered_rows()).
+        """
+        if model is None:
+            return 1
+        rows = self.get_row_estimate(model)
+        if parent_model is None:
+            multiplicity = rows
+        else:
+            multiplicity = rows / max(self.get_row_estimate(parent_model), 1)
+        if filters and (filtered_rows := self.get_filtered_rows(model, filters)) is not None:
+            multiplicity = min(multiplicity, filtered_rows)
+        return max(multiplicity, 1)
+
+    def get_filtered_rows(self, model, filters):
+        """
+        Return the estimated number of rows matched by the given filters, or None if they cannot be estimated. Only
+        exact matches are considered: a filter on a unique field (such as the ID) matches one row per value, and a
+        filter on a related object matches the average number of rows per related object for each value. Where
+        several filters apply, the most selective is taken.
+        """
+        estimates = []
+        for name, value in filters.items():
+
+            # Determine the number of values matched
+            if isinstance(value, dict):
+                if value.get('exact') is not None:
+                    value_count = 1
+                elif isinstance(value.get('in_list'), list):
+                    value_count = len(value['in_list'])
+                else:
+                    continue
+            elif isinstance(value, list):
+                value_count = len(value)
+            elif value is not None:
+                value_count = 1
+            else:
+                continue
+
+            # Determine the model field filtered (e.g. "site" for "site_id")
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                if not name.endswith('_id'):
+                    continue
+                try:
+                    field = model._meta.get_field(name.removesuffix('_id'))
+                except FieldDoesNotExist:
+                    continue
+
+            if field.primary_key or getattr(field, 'unique', False):
+                estimates.append(value_count)
+            elif field.many_to_one and field.related_model is not None:
+                related_rows = max(self.get_row_estimate(field.related_model), 1)
+                estimates.append(value_count * self.get_row_estimate(model) / related_rows)
+
+        return min(estimates) if estimates else None
+
+    def get_row_estimate(self, model):
+        """
+        Return the estimated number of rows in the model's table, from the table's statistics.
+        """
+        now = time.monotonic()
+        label = model._meta.label_lower
+        if (entry := self._row_estimates.get(label)) and entry[0] > now:
+            return entry[1]
+        rows = estimate_table_count(model) or 0
+        self._row_estimates[label] = (now + ROW_ESTIMATE_TTL, rows)
+        return rows
+
+
+#
+# Heaviest queries
+#
+
+def record_query(user, query, cost, duration):
+    """
+    Record a query in the set of the slowest queries, retaining only the slowest GRAPHQL_HEAVIEST_QUERIES.
+    """
+    entry = json.dumps({
+        'query': query,
+        'user': user.username if user is not None and user.is_authenticated else None,
+        'cost': cost,
+        'duration': round(duration, 6),
+        'time': timezone.now().isoformat(),
+    })
+    connection = get_redis_connection()
+    with connection.pipeline() as pipeline:
+        pipeline.zadd(HEAVIEST_QUERIES_KEY, {entry: duration})
+        pipeline.zremrangebyrank(HEAVIEST_QUERIES_KEY, 0, -settings.GRAPHQL_HEAVIEST_QUERIES - 1)
+        pipeline.execute()
+
+
+def get_heaviest_queries():
+    """
+    Return a list of the slowest GraphQL queries recorded, ordered by decreasing execution time.
+    """
+    connection = get_redis_connection()
+    queries = []
+    for entry in connection.zrevrange(HEAVIEST_QUERIES_KEY, 0, -1):
+        query = json.loads(entry)
+        query['time'] = datetime.datetime.fromisoformat(query['time'])
+        queries.append(query)
+
+    return queries
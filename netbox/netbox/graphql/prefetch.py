@@ -0,0 +1,104 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from graphql import GraphQLObjectType, GraphQLResolveInfo, GraphQLUnionType, get_named_type
+from graphql.execution.collect_fields import collect_sub_fields
+from strawberry_django.optimizer import optimize
+
+__all__ = (
+    'get_selected_fields',
+    'get_union_querysets',
+    'prefetch_related_fields',
+)
+
+
+def get_selected_fields(info):
+    """
+    Return a dictionary mapping the name of each field selected on the object type returned by the current field to a
+    list of its selection nodes (one per alias).
+    """
+    object_type = get_named_type(info.return_type)
+    if not isinstance(object_type, GraphQLObjectType):
+        return {}
+
+    fields = defaultdict(list)
+    selections = collect_sub_fields(info.schema, info.fragments, info.variable_values, object_type, info.field_nodes)
+    for field_nodes in selections.values():
+        fields[field_nodes[0].name.value].extend(field_nodes)
+
+    return fields
+
+
+def get_union_querysets(info, field_nodes):
+    """
+    Return a queryset for each member of the union type of the given field, optimized for the fields selected on that
+    member. These are suitable for prefetching the objects of a generic relation in bulk, using one query per type.
+
+    Args:
+        info: The GraphQLResolveInfo (or strawberry Info) of the parent object type
+        field_nodes: The selection nodes of the field (e.g. those returned by get_selected_fields())
+    """
+    info = getattr(info, '_raw_info', info)
+    parent_type = get_named_type(info.return_type)
+    union_type = get_named_type(parent_type.fields[field_nodes[0].name.value].type)
+    if not isinstance(union_type, GraphQLUnionType):
+        return []
+
+    querysets = []
+    for member_type in union_type.types:
+        type_class = info.schema._strawberry_schema.get_type_by_name(member_type.name).origin
+        model = type_class.__strawberry_django_definition__.model
+        member_info = GraphQLResolveInfo(
+            field_name=field_nodes[0].name.value,
+            field_nodes=field_nodes,
+            return_type=member_type,
+            parent_type=parent_type,
+            path=info.path,
+            schema=info.schema,
+            fragments=info.fragments,
+            root_value=info.root_value,
+            operation=info.operation,
+            variable_values=info.variable_values,
+            context=info.context,
+            is_awaitable=info.is_awaitable,
+        )
+        queryset = prefetch_related_fields(model.objects.all(), member_info, type_class)
+        querysets.append(optimize(queryset, member_info))
+
+    return querysets
+
+
+def prefetch_related_fields(queryset, info, type_class):
+    """
+    Prefetch in bulk the related objects of any selected fields which the query optimizer cannot handle itself: the
+    targets of generic foreign keys resolved by a method (using one query per content type), and any fields handled by
+    the `prefetchers` declared on the GraphQL type or its mixins.
+
+    Each prefetcher is a callable which accepts the GraphQLResolveInfo and the dictionary returned by
+    get_selected_fields(), and returns a lookup for prefetch_related() (or None if none of its fields are selected).
+    """
+    info = getattr(info, '_raw_info', info)
+    if not (fields := get_selected_fields(info)):
+        return queryset
+
+    # Generic foreign keys exposed through a resolver (rather than as plain fields, which the optimizer prefetches
+    # itself) are prefetched along with the fields selected on each type of object
+    resolved_fields = {
+        field.name for field in type_class.__strawberry_definition__.fields if field.base_resolver is not None
+    }
+    lookups = []
+    for model_field in queryset.model._meta.private_fields:
+        if not isinstance(model_field, GenericForeignKey):
+            continue
+        if model_field.name in fields and model_field.name in resolved_fields:
+            if querysets := get_union_querysets(info, fields[model_field.name]):
+                lookups.append(GenericPrefetch(model_field.name, querysets))
+    for cls in reversed(type_class.__mro__):
+        for prefetcher in vars(cls).get('prefetchers', ()):
+            if (lookup := prefetcher(info, fields)) is not None:
+                lookups.append(lookup)
+
+    if lookups:
+        return queryset.prefetch_related(*lookups)
+    return queryset
@@ -1,7 +1,7 @@
 import strawberry
 from django.conf import settings
 from strawberry_django.optimizer import DjangoOptimizerExtension
-from strawberry.extensions import MaxAliasesLimiter
+from strawberry.extensions import MaxAliasesLimiter, QueryDepthLimiter
 from strawberry.schema.config import StrawberryConfig
 
 from circuits.graphql.schema import CircuitsQuery
@@ -9,6 +9,7 @@ from core.graphql.schema import CoreQuery
 from dcim.graphql.schema import DCIMQuery
 from extras.graphql.schema import ExtrasQuery
 from ipam.graphql.schema import IPAMQuery
+from netbox.graphql.extensions import QueryCostExtension
 from netbox.registry import registry
 from tenancy.graphql.schema import TenancyQuery
 from users.graphql.schema import UsersQuery
@@ -34,11 +35,16 @@ class Query(
     pass
 
 
+extensions = [
+    DjangoOptimizerExtension(prefetch_custom_queryset=True),
+    MaxAliasesLimiter(max_alias_count=settings.GRAPHQL_MAX_ALIASES),
+    QueryCostExtension,
+]
+if settings.GRAPHQL_MAX_DEPTH is not None:
+    extensions.append(QueryDepthLimiter(max_depth=settings.GRAPHQL_MAX_DEPTH))
+
 schema = strawberry.Schema(
     query=Query,
     config=StrawberryConfig(auto_camel_case=False),
-    extensions=[
-        DjangoOptimizerExtension(prefetch_custom_queryset=True),
-        MaxAliasesLimiter(max_alias_count=settings.GRAPHQL_MAX_ALIASES),
-    ]
+    extensions=extensions
 )
@@ -5,6 +5,7 @@ from django.contrib.contenttypes.models import ContentType
 from core.graphql.mixins import ChangelogMixin
 from core.models import ObjectType as ObjectType_
 from extras.graphql.mixins import CustomFieldsMixin, JournalEntriesMixin, TagsMixin
+from netbox.graphql.prefetch import prefetch_related_fields
 
 __all__ = (
     'BaseObjectType',
@@ -28,9 +29,10 @@ class BaseObjectType:
     def get_queryset(cls, queryset, info, **kwargs):
         # Enforce object permissions on the queryset
         if hasattr(queryset, 'restrict'):
-            return queryset.restrict(info.context.request.user, 'view')
-        else:
-            return queryset
+            queryset = queryset.restrict(info.context.request.user, 'view')
+
+        # Batch the retrieval of generic relations & other related objects which the optimizer cannot prefetch
+        return prefetch_related_fields(queryset, info, cls)
 
     @strawberry_django.field
     def display(self) -> str:
@@ -7,7 +7,7 @@ from django.utils.translation import gettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
 
 from netbox.models.features import *
-from utilities.mptt import TreeManager
+from utilities.mptt import TreeManager, tree_updates_delayed
 from utilities.querysets import RestrictedQuerySet
 
 
@@ -149,6 +149,8 @@ class NestedGroupModel(NetBoxFeatureSet, MPTTModel):
 
     objects = TreeManager()
 
+    display_field = 'name'
+
     class Meta:
         abstract = True
 
@@ -161,11 +163,17 @@ class NestedGroupModel(NetBoxFeatureSet, MPTTModel):
     def clean(self):
         super().clean()
 
-        # An MPTT model cannot be its own parent
-        if not self._state.adding and self.parent and self.parent in self.get_descendants(include_self=True):
-            raise ValidationError({
-                "parent": "Cannot assign self or child {type} as parent.".format(type=self._meta.verbose_name)
-            })
+        # An MPTT model cannot be its own parent. While tree updates are being delayed (e.g. during a bulk import), the
+        # tree fields are unreliable, so the chain of parents is followed instead.
+        if not self._state.adding and self.parent:
+            if tree_updates_delayed(type(self)):
+                is_cycle = self.pk in self._tree_manager.get_ancestor_ids(self.parent_id)
+            else:
+                is_cycle = self.parent in self.get_descendants(include_self=True)
+            if is_cycle:
+                raise ValidationError({
+                    "parent": "Cannot assign self or child {type} as parent.".format(type=self._meta.verbose_name)
+                })
 
 
 class OrganizationalModel(NetBoxFeatureSet, models.Model):
@@ -195,6 +203,8 @@ class OrganizationalModel(NetBoxFeatureSet, models.Model):
 
     objects = RestrictedQuerySet.as_manager()
 
+    display_field = 'name'
+
     class Meta:
         abstract = True
         ordering = ('name',)
@@ -214,10 +214,10 @@ class CustomFieldsMixin(models.Model):
         Args:
             omit_hidden: If True, custom fields with no UI visibility will be omitted.
         """
-        from extras.models import CustomField
+        from extras.caching import get_custom_fields
         data = {}
 
-        for field in CustomField.objects.get_for_model(self):
+        for field in get_custom_fields(self):
             value = self.custom_field_data.get(field.name)
 
             # Skip hidden fields if 'omit_hidden' is True
@@ -243,11 +243,11 @@ class CustomFieldsMixin(models.Model):
         }
         ```
         """
-        from extras.models import CustomField
+        from extras.caching import get_custom_fields
         groups = defaultdict(dict)
-        visible_custom_fields = CustomField.objects.get_for_model(self).exclude(
-            ui_visible=CustomFieldUIVisibleChoices.HIDDEN
-        )
+        visible_custom_fields = [
+            cf for cf in get_custom_fields(self) if cf.ui_visible != CustomFieldUIVisibleChoices.HIDDEN
+        ]
 
         for cf in visible_custom_fields:
             value = self.custom_field_data.get(cf.name)
@@ -266,14 +266,37 @@ class CustomFieldsMixin(models.Model):
             self.custom_field_data[cf.name] = cf.default
     populate_custom_field_defaults.alters_data = True
 
+    def apply_pending_custom_field_updates(self):
+        """
+        Custom field data may be stale while a background job has yet to update it following a change to a custom
+        field (e.g. the assignment, rename, or removal of a field), or if this object was loaded before the job updated
+        it. If so, apply the pending updates to this object, and populate the default value of any field which remains
+        absent.
+        """
+        from extras.caching import get_custom_fields
+        from extras.jobs import CustomFieldDataJob
+
+        custom_fields = get_custom_fields(self)
+        if self.custom_field_data.keys() - {cf.name for cf in custom_fields} or any(
+            cf.name not in self.custom_field_data for cf in custom_fields
+        ):
+            CustomFieldDataJob.apply_pending_updates(self)
+            for cf in custom_fields:
+                if cf.default is not None:
+                    self.custom_field_data.setdefault(cf.name, cf.default)
+    apply_pending_custom_field_updates.alters_data = True
+
     def clean(self):
         super().clean()
-        from extras.models import CustomField
+        from extras.caching import get_custom_fields
 
         custom_fields = {
-            cf.name: cf for cf in CustomField.objects.get_for_model(self)
+            cf.name: cf for cf in get_custom_fields(self)
         }
 
+        # Apply any pending updates to the custom field data before validating it
+        self.apply_pending_custom_field_updates()
+
         # Validate all field values
         for field_name, value in self.custom_field_data.items():
             if field_name not in custom_fields:
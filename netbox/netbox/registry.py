@@ -22,6 +22,7 @@ class Registry(dict):
 
 # Initialize the global registry
 registry = Registry({
+    'bulk_create_receivers': list(),
     'counter_fields': collections.defaultdict(dict),
     'data_backends': dict(),
     'denormalized_fields': collections.defaultdict(list),
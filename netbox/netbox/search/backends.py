@@ -13,7 +13,8 @@ import netaddr
 from netaddr.core import AddrFormatError
 
 from core.models import ObjectType
-from extras.models import CachedValue, CustomField
+from extras.caching import get_custom_fields
+from extras.models import CachedValue
 from netbox.registry import registry
 from utilities.object_types import object_type_identifier
 from utilities.querysets import RestrictedPrefetch
@@ -206,9 +207,9 @@ class CachedValueSearchBackend(SearchBackend):
                     except KeyError:
                         break
 
-                # Prefetch any associated custom fields
+                # Retrieve any associated custom fields
                 object_type = ObjectType.objects.get_for_model(indexer.model)
-                custom_fields = CustomField.objects.filter(object_types=object_type).exclude(search_weight=0)
+                custom_fields = [cf for cf in get_custom_fields(indexer.model) if cf.search_weight]
 
             # Wipe out any previously cached values for the object
             if remove_existing:
@@ -60,6 +60,8 @@ for parameter in ('ALLOWED_HOSTS', 'DATABASE', 'SECRET_KEY', 'REDIS'):
 ADMINS = getattr(configuration, 'ADMINS', [])
 ALLOW_TOKEN_RETRIEVAL = getattr(configuration, 'ALLOW_TOKEN_RETRIEVAL', True)
 ALLOWED_HOSTS = getattr(configuration, 'ALLOWED_HOSTS')  # Required
+API_JSON_BACKEND = getattr(configuration, 'API_JSON_BACKEND', 'json')
+APPROXIMATE_COUNTS = getattr(configuration, 'APPROXIMATE_COUNTS', {})
 AUTH_PASSWORD_VALIDATORS = getattr(configuration, 'AUTH_PASSWORD_VALIDATORS', [
     {
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
@@ -117,7 +119,12 @@ EVENTS_PIPELINE = getattr(configuration, 'EVENTS_PIPELINE', (
 EXEMPT_VIEW_PERMISSIONS = getattr(configuration, 'EXEMPT_VIEW_PERMISSIONS', [])
 FIELD_CHOICES = getattr(configuration, 'FIELD_CHOICES', {})
 FILE_UPLOAD_MAX_MEMORY_SIZE = getattr(configuration, 'FILE_UPLOAD_MAX_MEMORY_SIZE', 2621440)
+GRAPHQL_COST_BUDGET = getattr(configuration, 'GRAPHQL_COST_BUDGET', None)
+GRAPHQL_COST_BUDGET_INTERVAL = getattr(configuration, 'GRAPHQL_COST_BUDGET_INTERVAL', 60)
+GRAPHQL_HEAVIEST_QUERIES = getattr(configuration, 'GRAPHQL_HEAVIEST_QUERIES', 0)
 GRAPHQL_MAX_ALIASES = getattr(configuration, 'GRAPHQL_MAX_ALIASES', 10)
+GRAPHQL_MAX_COST = getattr(configuration, 'GRAPHQL_MAX_COST', None)
+GRAPHQL_MAX_DEPTH = getattr(configuration, 'GRAPHQL_MAX_DEPTH', None)
 HTTP_PROXIES = getattr(configuration, 'HTTP_PROXIES', None)
 INTERNAL_IPS = getattr(configuration, 'INTERNAL_IPS', ('127.0.0.1', '::1'))
 ISOLATED_DEPLOYMENT = getattr(configuration, 'ISOLATED_DEPLOYMENT', False)
@@ -685,6 +692,21 @@ REST_FRAMEWORK = {
     'VIEW_NAME_FUNCTION': 'utilities.api.get_view_name',
 }
 
+# Employ orjson to render & parse JSON API data
+if API_JSON_BACKEND not in ('json', 'orjson'):
+    raise ImproperlyConfigured(f"API_JSON_BACKEND must be 'json' or 'orjson' (found {API_JSON_BACKEND!r}).")
+if API_JSON_BACKEND == 'orjson':
+    if importlib.util.find_spec('orjson') is None:
+        raise ImproperlyConfigured("API_JSON_BACKEND is 'orjson' but the orjson package is not installed.")
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'netbox.api.parsers.ORJSONParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'netbox.api.renderers.ORJSONRenderer',
+        'netbox.api.renderers.FormlessBrowsableAPIRenderer',
+    )
+
 #
 # DRF Spectacular
 #
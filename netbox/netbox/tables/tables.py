@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 from functools import cached_property
 
 import django_tables2 as tables
@@ -11,15 +11,14 @@ from django.urls import reverse
 from django.urls.exceptions import NoReverseMatch
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
-from django_tables2.data import TableQuerysetData
+from django_tables2.data import TableData, TableQuerysetData
 
-from core.models import ObjectType
+from extras.caching import definition_cache, get_custom_fields, get_custom_links
 from extras.choices import *
-from extras.models import CustomField, CustomLink
 from netbox.constants import EMPTY_TABLE_TEXT
 from netbox.registry import registry
 from netbox.tables import columns
-from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.paginator import CountedTableQuerysetData, EnhancedPaginator, get_paginate_count
 from utilities.html import highlight
 from utilities.string import title
 from utilities.views import get_viewname
@@ -44,14 +43,22 @@ class BaseTable(tables.Table):
     """
     exempt_columns = ()
 
+    # Mapping of column names to callables which return an additional lookup (e.g. a Prefetch) with which to prefetch
+    # the data rendered by each column, where this cannot be inferred from the column's accessor
+    column_prefetches = {}
+
     class Meta:
         attrs = {
             'class': 'table table-hover object-list',
         }
 
-    def __init__(self, *args, user=None, **kwargs):
+    def __init__(self, data=None, *args, user=None, **kwargs):
+
+        # Table rows backed by a QuerySet may be counted approximately when the table is paginated
+        if not isinstance(data, TableData) and TableQuerysetData.validate(data):
+            data = CountedTableQuerysetData(data)
 
-        super().__init__(*args, **kwargs)
+        super().__init__(data, *args, **kwargs)
 
         # Set default empty_text if none was provided
         if self.empty_text is None:
@@ -92,9 +99,12 @@ class BaseTable(tables.Table):
         # Dynamically update the table's QuerySet to ensure related fields are pre-fetched
         if isinstance(self.data, TableQuerysetData):
 
+            prefetch_lookups = []
             prefetch_fields = []
             for column in self.columns:
                 if column.visible:
+                    if column.name in self.column_prefetches:
+                        prefetch_lookups.append(self.column_prefetches[column.name]())
                     model = getattr(self.Meta, 'model')
                     accessor = column.accessor
                     prefetch_path = []
@@ -113,7 +123,8 @@ class BaseTable(tables.Table):
                             break
                     if prefetch_path:
                         prefetch_fields.append('__'.join(prefetch_path))
-            self.data.data = self.data.data.prefetch_related(*prefetch_fields)
+            # Apply any additional lookups first, so that any inferred lookups which they duplicate are ignored
+            self.data.data = self.data.data.prefetch_related(*prefetch_lookups, *prefetch_fields)
 
     def _get_columns(self, visible=True):
         columns = []
@@ -167,7 +178,8 @@ class BaseTable(tables.Table):
         # Paginate the table results
         paginate = {
             'paginator_class': EnhancedPaginator,
-            'per_page': get_paginate_count(request)
+            'per_page': get_paginate_count(request),
+            'exact_count': request.GET.get('exact_count', '').lower() == 'true',
         }
         tables.RequestConfig(request, paginate).configure(self)
 
@@ -206,21 +218,32 @@ class NetBoxTable(BaseTable):
                 (name, deepcopy(column)) for name, column in registered_columns.items()
             ])
 
-        # Add custom field & custom link columns
-        object_type = ObjectType.objects.get_for_model(self._meta.model)
-        custom_fields = CustomField.objects.filter(
-            object_types=object_type
-        ).exclude(ui_visible=CustomFieldUIVisibleChoices.HIDDEN)
+        # Add custom field & custom link columns. These are built once per version of the custom field & custom link
+        # definitions; create a copy of each to avoid modifying the cached Column.
         extra_columns.extend([
-            (f'cf_{cf.name}', columns.CustomFieldColumn(cf)) for cf in custom_fields
-        ])
-        custom_links = CustomLink.objects.filter(object_types=object_type, enabled=True)
-        extra_columns.extend([
-            (f'cl_{cl.name}', columns.CustomLinkColumn(cl)) for cl in custom_links
+            (name, copy(column)) for name, column in definition_cache.get(
+                ('table', self._meta.model), self.get_custom_columns
+            )
         ])
 
         super().__init__(*args, extra_columns=extra_columns, **kwargs)
 
+    @classmethod
+    def get_custom_columns(cls):
+        """
+        Return a list of (name, Column) tuples for all custom fields and custom links applicable to the model.
+        """
+        model = cls._meta.model
+        custom_columns = [
+            (f'cf_{cf.name}', columns.CustomFieldColumn(cf)) for cf in get_custom_fields(model)
+            if cf.ui_visible != CustomFieldUIVisibleChoices.HIDDEN
+        ]
+        custom_columns.extend([
+            (f'cl_{cl.name}', columns.CustomLinkColumn(cl)) for cl in get_custom_links(model) if cl.enabled
+        ])
+
+        return custom_columns
+
     @cached_property
     def htmx_url(self):
         """
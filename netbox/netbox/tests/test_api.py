@@ -1,8 +1,41 @@
+import datetime
+import io
 import uuid
+from decimal import Decimal
+from unittest import skipIf
+from unittest.mock import patch
 
+import netaddr
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 
-from utilities.testing import APITestCase
+from core.models import ObjectChange, ObjectType
+from dcim.choices import InterfaceTypeChoices
+from dcim.models import ConsolePort, Interface, Region, Site
+from extras.models import CachedValue
+from ipam.models import IPAddress, Prefix
+from netbox.api.parsers import ORJSONParser
+from netbox.api.renderers import ORJSONRenderer
+from netbox.api.viewsets import BaseViewSet, NetBoxModelViewSet
+from tenancy.models import Tenant
+from users.models import ObjectPermission
+from utilities import changes
+from utilities.testing import APITestCase, create_tags, create_test_device, disable_warnings
+from wireless.choices import WirelessChannelChoices, WirelessRoleChoices
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class AppTest(APITestCase):
@@ -26,3 +59,511 @@ class AppTest(APITestCase):
         response = self.client.get(f'{url}?format=api', **self.header)
 
         self.assertEqual(response.status_code, 200)
+
+
+class CursorPaginationTest(APITestCase):
+    user_permissions = ['dcim.view_site']
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 8)
+        ])
+
+    def test_cursor_pagination(self):
+        pks = list(Site.objects.order_by('pk').values_list('pk', flat=True))
+        url = f"{reverse('dcim-api:site-list')}?limit=3&cursor="
+
+        # First page
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[0:3])
+        self.assertIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+
+        # Second page
+        response = self.client.get(response.data['next'], **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[3:6])
+
+        # Last page
+        response = self.client.get(response.data['next'], **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[6:])
+        self.assertIsNone(response.data['next'])
+
+        # Walk backward
+        response = self.client.get(response.data['previous'], **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[3:6])
+        response = self.client.get(response.data['previous'], **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[0:3])
+        self.assertIsNone(response.data['previous'])
+
+    def test_cursor_pagination_descending(self):
+        pks = list(Site.objects.order_by('-pk').values_list('pk', flat=True))
+        url = f"{reverse('dcim-api:site-list')}?limit=4&ordering=-id&cursor="
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[0:4])
+        response = self.client.get(response.data['next'], **self.header)
+        self.assertEqual([s['id'] for s in response.data['results']], pks[4:])
+        self.assertIsNone(response.data['next'])
+
+    def test_cursor_pagination_invalid(self):
+        url = reverse('dcim-api:site-list')
+        with disable_warnings('django.request'):
+            response = self.client.get(f'{url}?cursor=invalid', **self.header)
+            self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
+            response = self.client.get(f'{url}?cursor=&ordering=name', **self.header)
+            self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+
+class ApproximateCountTest(APITestCase):
+    user_permissions = ['dcim.view_site']
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', status='active') for i in range(1, 6)
+        ])
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @override_settings(APPROXIMATE_COUNTS={'dcim.site': 60})
+    def test_cached_count(self):
+        url = f"{reverse('dcim-api:site-list')}?status=active&limit=2"
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data['count'], 5)
+
+        # The cached count should be returned for subsequent requests
+        Site.objects.create(name='Site 6', slug='site-6', status='active')
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNotNone(response.data['next'])
+
+        # Request an exact count
+        response = self.client.get(f'{url}&exact_count=true', **self.header)
+        self.assertEqual(response.data['count'], 6)
+
+        # The final page must be reachable even though the count is stale
+        response = self.client.get(f'{url}&offset=4', **self.header)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+
+    def test_exact_count(self):
+        url = f"{reverse('dcim-api:site-list')}?status=active"
+        self.client.get(url, **self.header)
+        Site.objects.create(name='Site 6', slug='site-6', status='active')
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data['count'], 6)
+
+
+class ValuesPlanTest(APITestCase):
+    user_permissions = ['dcim.view_region', 'dcim.view_site', 'ipam.view_prefix', 'tenancy.view_tenant']
+
+    @classmethod
+    def setUpTestData(cls):
+        regions = (
+            Region.objects.create(name='Region 1', slug='region-1'),
+            Region.objects.create(name='Region 2', slug='region-2', description='Ünïcödé'),
+        )
+        Region.objects.create(name='Region 3', slug='region-3', parent=regions[0])
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', region=regions[0], description=f'Description {i}')
+            for i in range(1, 6)
+        ])
+        Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+        Prefix.objects.create(prefix=netaddr.IPNetwork('10.0.0.0/24'))
+
+    def get_responses(self, url):
+        """
+        Return the responses to a request with and without employing a ValuesPlan.
+        """
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        with patch.object(BaseViewSet, 'values_plan', None):
+            expected = self.client.get(url, **self.header)
+        return response, expected
+
+    def test_brief_mode(self):
+        for url in (
+            f"{reverse('dcim-api:site-list')}?brief=true",
+            f"{reverse('dcim-api:site-list')}?brief=true&limit=2&offset=2&ordering=-name",
+            f"{reverse('dcim-api:site-list')}?brief=true&region_id={Region.objects.first().pk}",
+            f"{reverse('dcim-api:region-list')}?brief=true",
+            f"{reverse('tenancy-api:tenant-list')}?brief=true",
+            f"{reverse('dcim-api:site-list')}?fields=id,url,name,facility",
+        ):
+            response, expected = self.get_responses(url)
+            self.assertEqual(response.content, expected.content, url)
+
+    def test_cursor_pagination(self):
+        url = f"{reverse('dcim-api:site-list')}?brief=true&limit=2&cursor="
+        response, expected = self.get_responses(url)
+        self.assertEqual(response.content, expected.content)
+        response, expected = self.get_responses(response.data['next'])
+        self.assertEqual(response.content, expected.content)
+
+    def test_values_query(self):
+        url = f"{reverse('dcim-api:site-list')}?brief=true"
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **self.header)
+        self.assertEqual(len(response.data['results']), 5)
+
+        # Only the columns required by the brief fields should be retrieved
+        sql = ctx.captured_queries[-1]['sql']
+        self.assertIn('"dcim_site"."slug"', sql)
+        self.assertNotIn('"dcim_site"."status"', sql)
+
+    def test_ineligible_fields(self):
+        # Prefixes are represented by netaddr objects; the serializer must be employed
+        url = f"{reverse('ipam-api:prefix-list')}?brief=true"
+        response, expected = self.get_responses(url)
+        self.assertEqual(response.content, expected.content)
+
+
+class ConditionalGetTest(APITestCase):
+    user_permissions = ['dcim.view_site']
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', region=region) for i in range(1, 4)
+        ])
+
+    def setUp(self):
+        super().setUp()
+        # Forget any change counters scheduled by previous tests within the same (test) transaction
+        changes.clear_pending_change_counters()
+
+    def commit(self):
+        """
+        Execute the commit hooks (which increment the change counters) for any changes made within the context.
+        """
+        changes.clear_pending_change_counters()
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def get(self, url, **headers):
+        return self.client.get(url, **self.header, **headers)
+
+    def test_get_object(self):
+        site = Site.objects.first()
+        url = reverse('dcim-api:site-detail', kwargs={'pk': site.pk})
+        response = self.get(url)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Last-Modified', response.headers)
+
+        # A matching ETag or modification time yields a 304 response
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        response = self.get(url, HTTP_IF_MODIFIED_SINCE=response.headers['Last-Modified'])
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        # The ETag depends on the representation requested
+        response = self.get(f'{url}?brief=true', HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        # Modifying the object changes its ETag
+        with self.commit():
+            site.description = 'Changed'
+            site.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.data['description'], 'Changed')
+
+    def test_get_object_related_change(self):
+        site = Site.objects.first()
+        url = reverse('dcim-api:site-detail', kwargs={'pk': site.pk})
+        etag = self.get(url).headers['ETag']
+
+        # Modifying an unrelated object of the same type does not change the ETag
+        with self.commit():
+            Site.objects.last().save()
+        self.assertHttpStatus(self.get(url, HTTP_IF_NONE_MATCH=etag), status.HTTP_304_NOT_MODIFIED)
+
+        # Modifying a related object (represented by a nested serializer) changes the ETag
+        with self.commit():
+            site.region.name = 'Region X'
+            site.region.save()
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['region']['name'], 'Region X')
+
+    def test_list_objects(self):
+        url = reverse('dcim-api:site-list')
+        response = self.get(url)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response.headers['ETag']
+
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers['ETag'], etag)
+
+        # The ETag depends on the query string
+        response = self.get(f'{url}?brief=true', HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        # Creating an object changes the ETag
+        with self.commit():
+            Site.objects.create(name='Site 4', slug='site-4')
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_counter_fields(self):
+        self.add_permissions('dcim.view_device')
+        device = create_test_device('Device 1')
+        urls = (
+            reverse('dcim-api:device-detail', kwargs={'pk': device.pk}),
+            reverse('dcim-api:device-list'),
+        )
+        etags = [self.get(url).headers['ETag'] for url in urls]
+
+        # Creating a component updates the counter field of its device (without sending a signal for the device)
+        with self.commit():
+            Interface.objects.create(device=device, name='Interface 1', type=InterfaceTypeChoices.TYPE_1GE_FIXED)
+        for url, etag in zip(urls, etags):
+            response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['interface_count'], 1)
+
+    def test_increment_change_counter(self):
+        label = 'dcim.site'
+        counter = changes.get_change_counters([label])[label]
+
+        # Counters are incremented once per transaction, upon commit
+        with self.commit():
+            Site.objects.create(name='Site 4', slug='site-4')
+            Site.objects.create(name='Site 5', slug='site-5')
+            self.assertEqual(changes.get_change_counters([label])[label], counter)
+        self.assertEqual(changes.get_change_counters([label])[label], counter + 1)
+
+
+class BulkCreateTest(APITestCase):
+    user_permissions = ['dcim.add_site', 'dcim.add_consoleport']
+
+    @classmethod
+    def setUpTestData(cls):
+        create_tags('Alpha', 'Bravo')
+
+    def get_site_data(self, count=3):
+        return [
+            {'name': f'Site {i}', 'slug': f'site-{i}', 'tags': [{'name': 'Alpha'}, {'name': 'Bravo'}]}
+            for i in range(1, count + 1)
+        ]
+
+    def test_bulk_create(self):
+        url = reverse('dcim-api:site-list')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, self.get_site_data(), format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual([site['name'] for site in response.data], ['Site 1', 'Site 2', 'Site 3'])
+        self.assertEqual([tag['name'] for tag in response.data[0]['tags']], ['Alpha', 'Bravo'])
+
+        # Each table should be written to with a single query
+        inserts = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len([sql for sql in inserts if sql.startswith('INSERT INTO "dcim_site"')]), 1)
+        self.assertEqual(len([sql for sql in inserts if sql.startswith('INSERT INTO "extras_taggeditem"')]), 1)
+        self.assertEqual(len([sql for sql in inserts if sql.startswith('INSERT INTO "core_objectchange"')]), 1)
+
+        for site in Site.objects.filter(pk__in=[site['id'] for site in response.data]):
+            self.assertEqual(sorted(site.tags.names()), ['Alpha', 'Bravo'])
+            objectchange = ObjectChange.objects.get(changed_object_id=site.pk)
+            self.assertEqual(objectchange.action, 'create')
+            self.assertEqual(objectchange.user_name, self.user.username)
+            self.assertEqual(objectchange.postchange_data['tags'], ['Alpha', 'Bravo'])
+            self.assertTrue(CachedValue.objects.filter(object_id=site.pk, field='name', value=site.name).exists())
+
+    def test_bulk_create_sequential(self):
+        url = reverse('dcim-api:site-list')
+        with patch.object(NetBoxModelViewSet, 'can_bulk_create', return_value=False):
+            response = self.client.post(url, self.get_site_data(), format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Objects which are saved individually should produce the same changelog
+        self.assertEqual(
+            ObjectChange.objects.get(changed_object_id=response.data[0]['id']).postchange_data['tags'],
+            ['Alpha', 'Bravo']
+        )
+
+    def test_bulk_create_counter_fields(self):
+        device = create_test_device('Device 1')
+        data = [{'device': device.pk, 'name': f'Console Port {i}'} for i in range(1, 4)]
+        response = self.client.post(reverse('dcim-api:consoleport-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        device.refresh_from_db()
+        self.assertEqual(device.console_port_count, 3)
+        self.assertEqual(ConsolePort.objects.filter(device=device).count(), 3)
+
+    def test_bulk_create_normalized(self):
+        self.add_permissions('ipam.add_ipaddress', 'ipam.add_prefix', 'dcim.add_interface')
+
+        # Models which normalize field values upon save() replicate it for objects created in bulk
+        data = [{'address': f'192.0.2.{i}/24', 'dns_name': f'Host{i}.Example.COM'} for i in range(1, 4)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('ipam-api:ipaddress-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        inserts = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('INSERT INTO "ipam_ip')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            list(IPAddress.objects.order_by('pk').values_list('dns_name', flat=True)),
+            ['host1.example.com', 'host2.example.com', 'host3.example.com']
+        )
+
+        device = create_test_device('Device 1')
+        data = [{
+            'device': device.pk,
+            'name': 'wlan0',
+            'type': InterfaceTypeChoices.TYPE_80211AC,
+            'rf_role': WirelessRoleChoices.ROLE_AP,
+            'rf_channel': WirelessChannelChoices.CHANNEL_5G_32,
+        }]
+        response = self.client.post(reverse('dcim-api:interface-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0]['rf_channel_frequency'], 5160)
+        self.assertEqual(response.data[0]['rf_channel_width'], 20)
+
+    def test_bulk_create_prefixes(self):
+        self.add_permissions('ipam.add_prefix')
+        Prefix.objects.create(prefix='10.0.0.0/8')
+        Prefix.objects.create(prefix='10.1.0.0/24')
+
+        # The prefix hierarchy is updated to reflect prefixes created in bulk
+        data = [{'prefix': '10.1.0.0/16'}, {'prefix': '10.2.0.0/16'}]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('ipam-api:prefix-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        inserts = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('INSERT INTO "ipam_pre')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            {str(prefix.prefix): (prefix._depth, prefix._children) for prefix in Prefix.objects.all()},
+            {
+                '10.0.0.0/8': (0, 3),
+                '10.1.0.0/16': (1, 1),
+                '10.1.0.0/24': (2, 0),
+                '10.2.0.0/16': (1, 0),
+            }
+        )
+
+    def test_bulk_create_restricted_tag(self):
+        tag = create_tags('Charlie')[0]
+        tag.object_types.set([ObjectType.objects.get_for_model(Region)])
+        data = [{'name': 'Site 1', 'slug': 'site-1', 'tags': [{'name': 'Charlie'}]}]
+        response = self.client.post(reverse('dcim-api:site-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Site.objects.exists())
+
+    def test_bulk_create_unknown_receiver(self):
+        def receiver(instance, **kwargs):
+            saved.append(instance.name)
+
+        saved = []
+        post_save.connect(receiver, sender=Site)
+        self.addCleanup(post_save.disconnect, receiver, sender=Site)
+
+        # Objects must be saved individually to trigger the unknown receiver
+        response = self.client.post(reverse('dcim-api:site-list'), self.get_site_data(), format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(saved, ['Site 1', 'Site 2', 'Site 3'])
+
+    def test_bulk_create_permission_denied(self):
+        ObjectPermission.objects.filter(name='dcim.add_site').update(constraints={'name': 'Site 1'})
+        with disable_warnings('django.request'):
+            response = self.client.post(
+                reverse('dcim-api:site-list'), self.get_site_data(), format='json', **self.header
+            )
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Site.objects.exists())
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class ORJSONTest(APITestCase):
+    user_permissions = ['dcim.view_site', 'ipam.view_ipaddress', 'ipam.view_prefix']
+
+    @classmethod
+    def setUpTestData(cls):
+        sites = Site.objects.bulk_create([
+            Site(
+                name=f'Site {i}',
+                slug=f'site-{i}',
+                description='Ünïcödé \u2028 "quoted"',
+                latitude=Decimal('12.345678'),
+                longitude=Decimal('-98.7654'),
+            ) for i in range(1, 4)
+        ])
+        Prefix.objects.create(prefix=netaddr.IPNetwork('10.0.0.0/24'), site=sites[0])
+        IPAddress.objects.create(address=netaddr.IPNetwork('2001:db8::1/64'))
+
+    def assertRenderedEqual(self, data, **kwargs):
+        self.assertEqual(ORJSONRenderer().render(data, **kwargs), JSONRenderer().render(data, **kwargs))
+
+    def test_render_netaddr(self):
+        self.assertEqual(
+            ORJSONRenderer().render([netaddr.IPNetwork('192.0.2.0/24'), netaddr.IPAddress('2001:db8::1')]),
+            b'["192.0.2.0/24","2001:db8::1"]'
+        )
+
+        # Data passed through to the standard library should be rendered in the same manner
+        self.assertEqual(
+            ORJSONRenderer().render([netaddr.IPNetwork('192.0.2.0/24'), 1e16]),
+            b'["192.0.2.0/24",1e+16]'
+        )
+
+    def test_render_api_responses(self):
+        for url in (
+            reverse('api-status'),
+            reverse('dcim-api:site-list'),
+            reverse('ipam-api:prefix-list'),
+            reverse('ipam-api:ipaddress-list'),
+            f"{reverse('dcim-api:site-list')}?brief=true",
+        ):
+            response = self.client.get(url, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(ORJSONRenderer().render(response.data), response.content, url)
+
+    def test_render_values(self):
+        self.assertRenderedEqual({
+            'decimal': Decimal('1.50'),
+            'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2024, 1, 2),
+            'time': datetime.time(12, 30),
+            'lazy': gettext_lazy('Active'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'floats': [0.1, 1e16, 1e-05, 1.5e-10, 0.0001],
+            'big_integer': 2 ** 70,
+            'tuple': (1, 2),
+            1: 'integer key',
+            'separators': 'line\u2028paragraph\u2029',
+        })
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_render_indented(self):
+        self.assertRenderedEqual(
+            {'a': [1, 2], 'b': None},
+            accepted_media_type='application/json; indent=4'
+        )
+
+    def test_parse(self):
+        for data in (
+            b'{"name": "Site 1", "tags": [{"name": "Alpha"}], "latitude": 12.5, "active": true, "x": null}',
+            '{"description": "Ünïcödé \\u2028"}'.encode(),
+            b'[123456789012345678901, -9223372036854775809, 1e400]',
+        ):
+            self.assertEqual(
+                ORJSONParser().parse(io.BytesIO(data)),
+                JSONParser().parse(io.BytesIO(data)),
+            )
+
+        # Invalid JSON should raise the same error as the standard parser
+        with self.assertRaisesMessage(ParseError, 'Expecting value'):
+            ORJSONParser().parse(io.BytesIO(b'{"name": }'))
+        with self.assertRaisesMessage(ParseError, 'Out of range float values are not JSON compliant'):
+            ORJSONParser().parse(io.BytesIO(b'[NaN]'))
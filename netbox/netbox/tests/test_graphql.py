@@ -1,14 +1,24 @@
 import json
+from unittest.mock import patch
 
-from django.test import override_settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django_redis import get_redis_connection
 from django.urls import reverse
 from rest_framework import status
+from strawberry.django.context import StrawberryDjangoContext
 
 from core.models import ObjectType
-from dcim.choices import LocationStatusChoices
-from dcim.models import Site, Location
+from dcim.choices import InterfaceTypeChoices, LocationStatusChoices
+from dcim.models import Cable, Device, Interface, Site, Location
+from ipam.choices import FHRPGroupProtocolChoices
+from ipam.models import FHRPGroup, IPAddress
+from netbox.graphql.extensions import HEAVIEST_QUERIES_KEY, QueryCostExtension, get_heaviest_queries
+from netbox.graphql.schema import schema
 from users.models import ObjectPermission
-from utilities.testing import disable_warnings, APITestCase, TestCase
+from utilities.testing import disable_warnings, APITestCase, TestCase, create_test_device
 
 
 class GraphQLTestCase(TestCase):
@@ -126,3 +136,184 @@ class GraphQLAPITestCase(APITestCase):
         data = json.loads(response.content)
         self.assertNotIn('errors', data)
         self.assertEqual(len(data['data']['site']['locations']), 0)
+
+
+ROW_ESTIMATES = {'region': 5, 'site': 10, 'location': 100}
+
+
+@patch.object(QueryCostExtension, 'get_row_estimate', lambda self, model: ROW_ESTIMATES[model._meta.model_name])
+class QueryCostTestCase(APITestCase):
+    user_permissions = ['dcim.view_site', 'dcim.view_location']
+
+    # 10 sites + 10 x (100 / 10) locations
+    query = '{site_list {id name locations {id}}}'
+    query_cost = 110
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(cache.delete_pattern, 'netbox.graphql.budget.*')
+        get_redis_connection().delete(HEAVIEST_QUERIES_KEY)
+
+    def execute(self, query):
+        response = self.client.post(reverse('graphql'), data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_max_cost(self):
+        with override_settings(GRAPHQL_MAX_COST=self.query_cost):
+            self.assertNotIn('errors', self.execute(self.query))
+        with override_settings(GRAPHQL_MAX_COST=self.query_cost - 1):
+            data = self.execute(self.query)
+        self.assertIsNone(data['data'])
+        self.assertIn(f'Estimated query cost ({self.query_cost}) exceeds', data['errors'][0]['message'])
+
+    @override_settings(GRAPHQL_MAX_COST=query_cost)
+    def test_fragments(self):
+        query = """
+            query {site_list {...SiteFields locations {id}}}
+            fragment SiteFields on SiteType {id ... on SiteType {locations {name}}}
+        """
+        data = self.execute(query)
+        self.assertIn(f'Estimated query cost ({self.query_cost * 2 - 10}) exceeds', data['errors'][0]['message'])
+
+    @override_settings(GRAPHQL_COST_BUDGET=200)
+    def test_cost_budget(self):
+        self.assertNotIn('errors', self.execute(self.query))
+
+        # The second query would exceed the user's budget
+        data = self.execute(self.query)
+        self.assertIn('exceeds the remaining query budget', data['errors'][0]['message'])
+
+        # A cheaper query fits within the remaining budget
+        self.assertNotIn('errors', self.execute('{site_list {id}}'))
+
+    @override_settings(GRAPHQL_MAX_COST=0)
+    def test_filters(self):
+        queries = (
+            # 1 site + 1 x (100 / 10) locations
+            ('{site_list(filters: {id: {exact: "1"}}) {id locations {id}}}', 11),
+            ('query ($ids: [ID!]) {site_list(filters: {id: {in_list: $ids}}) {id}}', 3),
+            ('{site_list(filters: {slug: {exact: "site-1"}}) {id}}', 1),
+            # 2 x (10 / 5) sites per region
+            ('{site_list(filters: {region_id: ["1", "2"]}) {id}}', 4),
+            # Filters on non-unique fields are ignored
+            ('{site_list(filters: {name: {i_contains: "site"}}) {id}}', 10),
+            # 10 sites + 10 x 1 location
+            ('{site_list {id locations(filters: {id: {exact: "1"}}) {id}}}', 20),
+        )
+        for query, cost in queries:
+            with self.subTest(query=query):
+                response = self.client.post(
+                    reverse('graphql'), data={'query': query, 'variables': {'ids': ['1', '2', '3']}}, format='json',
+                    **self.header
+                )
+                data = json.loads(response.content)
+                self.assertIn(f'Estimated query cost ({cost}) exceeds', data['errors'][0]['message'])
+
+    def test_cost_not_estimated(self):
+        # The cost of a query is not estimated if no limits are enforced and nothing is recorded
+        with patch.object(QueryCostExtension, 'get_cost', return_value=0) as get_cost:
+            self.assertNotIn('errors', self.execute(self.query))
+            self.assertFalse(get_cost.called)
+            with override_settings(METRICS_ENABLED=True):
+                self.execute(self.query)
+            self.assertTrue(get_cost.called)
+        self.assertEqual(get_heaviest_queries(), [])
+
+    @override_settings(GRAPHQL_HEAVIEST_QUERIES=20)
+    def test_heaviest_queries(self):
+        self.execute(self.query)
+        queries = get_heaviest_queries()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(queries[0]['query'], self.query)
+        self.assertEqual(queries[0]['cost'], self.query_cost)
+        self.assertEqual(queries[0]['user'], self.user.username)
+
+
+class RelatedObjectBatchingTestCase(APITestCase):
+    user_permissions = [
+        'dcim.view_cable', 'dcim.view_cabletermination', 'dcim.view_device', 'dcim.view_interface',
+        'ipam.view_fhrpgroup', 'ipam.view_ipaddress',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Site 1', slug='site-1')
+        cls.fhrp_group = FHRPGroup.objects.create(protocol=FHRPGroupProtocolChoices.PROTOCOL_VRRP2, group_id=1)
+        IPAddress.objects.create(address='192.168.0.1/24', assigned_object=cls.fhrp_group)
+
+    def create_devices(self, count):
+        start = Device.objects.count()
+        for i in range(start, start + count):
+            device = create_test_device(f'Device {i}', site=self.site)
+            interfaces = Interface.objects.bulk_create([
+                Interface(device=device, name=f'eth{j}', type=InterfaceTypeChoices.TYPE_1GE_FIXED) for j in range(2)
+            ])
+            for j, interface in enumerate(interfaces):
+                IPAddress.objects.create(address=f'10.{i}.{j}.1/24', assigned_object=interface)
+            Cable(a_terminations=[interfaces[0]], b_terminations=[interfaces[1]]).save()
+
+    def execute(self, query):
+        request = RequestFactory().post(reverse('graphql'))
+        request.user = self.user
+        result = schema.execute_sync(query, context_value=StrawberryDjangoContext(request=request, response=None))
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def assertConstantQueries(self, query):
+        """
+        Assert that the number of database queries for the given GraphQL query is independent of the number of
+        objects returned.
+        """
+        self.create_devices(2)
+        self.execute(query)
+        with CaptureQueriesContext(connection) as ctx:
+            self.execute(query)
+        self.create_devices(3)
+        with self.assertNumQueries(len(ctx.captured_queries)):
+            return self.execute(query)
+
+    def test_generic_foreign_key(self):
+        data = self.assertConstantQueries("""{
+            ip_address_list {
+                address
+                assigned_object {... on InterfaceType {name device {name}} ... on FHRPGroupType {group_id}}
+                alias: assigned_object {... on InterfaceType {id}}
+            }
+        }""")
+        ip_addresses = {ip['address']: ip for ip in data['ip_address_list']}
+        self.assertEqual(len(ip_addresses), 11)
+        self.assertEqual(ip_addresses['192.168.0.1/24']['assigned_object'], {'group_id': 1})
+        interface = Interface.objects.get(device__name='Device 4', name='eth1')
+        self.assertEqual(
+            ip_addresses['10.4.1.1/24']['assigned_object'], {'name': 'eth1', 'device': {'name': 'Device 4'}}
+        )
+        self.assertEqual(ip_addresses['10.4.1.1/24']['alias'], {'id': str(interface.pk)})
+
+    def test_cable_terminations(self):
+        data = self.assertConstantQueries("""{
+            cable_list {
+                a_terminations {... on InterfaceType {name device {name}}}
+                b_terminations {... on InterfaceType {name}}
+                terminations {cable_end}
+            }
+        }""")
+        self.assertEqual(len(data['cable_list']), 5)
+        for cable in data['cable_list']:
+            self.assertEqual(cable['a_terminations'][0]['name'], 'eth0')
+            self.assertEqual(cable['b_terminations'], [{'name': 'eth1'}])
+            self.assertEqual(len(cable['terminations']), 2)
+
+    def test_link_peers_and_connected_endpoints(self):
+        data = self.assertConstantQueries("""{
+            interface_list {
+                name
+                link_peers {... on InterfaceType {name device {name}}}
+                connected_endpoints {... on InterfaceType {name device {name}}}
+            }
+        }""")
+        self.assertEqual(len(data['interface_list']), 10)
+        for interface in data['interface_list']:
+            peer_name = 'eth1' if interface['name'] == 'eth0' else 'eth0'
+            self.assertEqual(interface['link_peers'][0]['name'], peer_name)
+            self.assertEqual(interface['connected_endpoints'], interface['link_peers'])
@@ -1,9 +1,18 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
 from django.template import Context, Template
-from django.test import TestCase
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django_tables2.export import TableExport
+from jinja2 import UndefinedError
 
-from dcim.models import Site
+from dcim.models import Cable, Interface, Site
+from dcim.tables import InterfaceTable, SiteTable
+from extras.models import ExportTemplate
 from netbox.tables import NetBoxTable, columns
-from utilities.testing import create_tags
+from utilities.export import stream_table_csv
+from utilities.testing import create_tags, create_test_device
 
 
 class TagColumnTable(NetBoxTable):
@@ -35,3 +44,140 @@ class TagColumnTest(TestCase):
             'table': table
         })
         template.render(context)
+
+
+class CableColumnsTable(InterfaceTable):
+
+    class Meta(InterfaceTable.Meta):
+        default_columns = ('name', 'cable', 'link_peer', 'connection')
+
+
+class CableColumnsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        devices = (create_test_device('Device 1'), create_test_device('Device 2'))
+        for device in devices:
+            Interface.objects.bulk_create([
+                Interface(device=device, name=f'Interface {i}', type='1000base-t') for i in range(1, 11)
+            ])
+        for i in range(1, 11):
+            Cable(
+                a_terminations=[Interface.objects.get(device=devices[0], name=f'Interface {i}')],
+                b_terminations=[Interface.objects.get(device=devices[1], name=f'Interface {i}')]
+            ).save()
+
+    def render_table(self, queryset):
+        template = Template('{% load render_table from django_tables2 %}{% render_table table %}')
+        table = CableColumnsTable(queryset, orderable=False)
+        with CaptureQueriesContext(connection) as queries:
+            html = template.render(Context({'table': table}))
+        return html, len(queries)
+
+    def test_cable_columns(self):
+        """
+        The link peers and connected endpoints of all rows should be resolved using a fixed number of queries.
+        """
+        queryset = Interface.objects.filter(device__name='Device 1').order_by('pk')
+        html, query_count = self.render_table(queryset[:10])
+        self.assertEqual(html.count('Device 2</a>'), 20)
+        self.assertEqual(self.render_table(queryset[:2])[1], query_count)
+
+
+class StreamingExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        tags = create_tags('Alpha', 'Bravo')
+
+        sites = [
+            Site(name=f'Site {i}', slug=f'site-{i}', description='Line 1\r\nLine "2"') for i in range(1, 6)
+        ]
+        Site.objects.bulk_create(sites)
+        for site in sites:
+            site.tags.add(*tags)
+
+    def test_stream_table_csv(self):
+        """
+        Streaming CSV output must be identical to that of TableExport.
+        """
+        exclude_columns = {'pk', 'actions'}
+        table = SiteTable(Site.objects.order_by('name'))
+
+        expected = TableExport(TableExport.CSV, table, exclude_columns=exclude_columns).export()
+        output = ''.join(stream_table_csv(table, exclude_columns=exclude_columns, chunk_size=2))
+
+        self.assertEqual(output, expected)
+
+    def test_stream_export_template(self):
+        export_template = ExportTemplate(
+            name='Test',
+            template_code='{% for site in queryset.iterator(chunk_size=2) %}{{ site.name }}\r\n{% endfor %}'
+        )
+        output = ''.join(export_template.render_stream(Site.objects.order_by('name')))
+
+        self.assertEqual(output, export_template.render(Site.objects.order_by('name')))
+        self.assertEqual(output, ''.join(f'Site {i}\n' for i in range(1, 6)))
+
+    def test_export_template_response(self):
+        export_template = ExportTemplate(
+            name='Test',
+            template_code='{% for site in queryset %}{{ site.name }}\n{% endfor %}',
+            file_extension='txt',
+            as_attachment=True
+        )
+        response = export_template.render_to_response(Site.objects.order_by('name'))
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="netbox_sites.txt"')
+        self.assertEqual(b''.join(response.streaming_content), ''.join(f'Site {i}\n' for i in range(1, 6)).encode())
+
+    def test_export_template_response_error(self):
+        """
+        An error raised after the first chunk of output has been rendered must not yield a truncated response.
+        """
+        export_template = ExportTemplate(
+            name='Test',
+            template_code=(
+                "{% for site in queryset %}{{ 'x' * 100000 }}{% if loop.index == 3 %}{{ site.foo.bar }}{% endif %}"
+                "{% endfor %}"
+            )
+        )
+        with self.assertRaises(UndefinedError):
+            export_template.render_to_response(Site.objects.order_by('name'))
+
+
+class PaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', status='active') for i in range(1, 6)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def paginate(self, query_string=''):
+        request = RequestFactory().get(f'/?status=active&per_page=2{query_string}')
+        request.user = AnonymousUser()
+        table = SiteTable(Site.objects.filter(status='active'))
+        table.configure(request)
+        return table
+
+    @override_settings(APPROXIMATE_COUNTS={'dcim.site': 60})
+    def test_cached_count(self):
+        table = self.paginate()
+        self.assertEqual(table.paginator.count, 5)
+        self.assertTrue(table.paginator.count_is_exact)
+
+        # The cached count is returned for subsequent requests
+        Site.objects.create(name='Site 6', slug='site-6', status='active')
+        table = self.paginate()
+        self.assertEqual(table.paginator.count, 5)
+        self.assertFalse(table.paginator.count_is_exact)
+        self.assertEqual(len(table.rows), 5)
+
+        # Request an exact count
+        table = self.paginate('&exact_count=true')
+        self.assertEqual(table.paginator.count, 6)
+        self.assertTrue(table.paginator.count_is_exact)
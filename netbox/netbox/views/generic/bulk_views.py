@@ -1,32 +1,37 @@
 import logging
 import re
+from contextlib import ExitStack
 from copy import deepcopy
 
 from django.contrib import messages
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, ValidationError
 from django.db import transaction, IntegrityError
 from django.db.models import ManyToManyField, ProtectedError, RestrictedError
 from django.db.models.fields.reverse_related import ManyToManyRel
 from django.forms import ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
-from django_tables2.export import TableExport
+from django_pglocks import advisory_lock
 from mptt.models import MPTTModel
 
+from core.jobs import ExportJob
 from core.models import ObjectType
 from core.signals import clear_events
 from extras.choices import CustomFieldUIEditableChoices
-from extras.models import CustomField, ExportTemplate
+from extras.caching import get_custom_fields
+from extras.models import ExportTemplate
+from netbox.constants import ADVISORY_LOCK_KEYS
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
+from utilities.export import stream_table_csv, stream_yaml
 from utilities.forms import BulkRenameForm, ConfirmationForm, restrict_form_fields
 from utilities.forms.bulk_import import BulkImportForm
 from utilities.htmx import htmx_partial
+from utilities.mptt import TreeManager, delay_tree_updates
 from utilities.permissions import get_permission_for_model
 from utilities.views import GetReturnURLMixin, get_viewname
 from .base import BaseMultiObjectView
@@ -67,21 +72,18 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Returns an iterator which yields one document
+        at a time.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
+        return stream_yaml(self.queryset)
 
-        return '---\n'.join(yaml_data)
-
-    def export_table(self, table, columns=None, filename=None):
+    def get_export_exclude_columns(self, table, columns=None):
         """
-        Export all table data in CSV format.
+        Return the set of table columns to omit from a CSV export.
 
         Args:
-            table: The Table instance to export
+            table: The Table instance being exported
             columns: A list of specific columns to include. If None, all columns will be exported.
-            filename: The name of the file attachment sent to the client. If None, will be determined automatically
-                from the queryset model name.
         """
         exclude_columns = {'pk', 'actions'}
         if columns:
@@ -89,14 +91,27 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             exclude_columns.update({
                 col for col in all_columns if col not in columns
             })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
-            table=table,
-            exclude_columns=exclude_columns
-        )
-        return exporter.response(
-            filename=filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        return exclude_columns
+
+    def export_table(self, table, columns=None, filename=None):
+        """
+        Export all table data in CSV format. The response is streamed, with objects retrieved from the database in
+        chunks.
+
+        Args:
+            table: The Table instance to export
+            columns: A list of specific columns to include. If None, all columns will be exported.
+            filename: The name of the file attachment sent to the client. If None, will be determined automatically
+                from the queryset model name.
+        """
+        response = StreamingHttpResponse(
+            stream_table_csv(table, exclude_columns=self.get_export_exclude_columns(table, columns)),
+            content_type='text/csv; charset=utf-8'
         )
+        filename = filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
 
     def export_template(self, template, request):
         """
@@ -121,6 +136,62 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             query_params.pop('export')
             return redirect(f'{request.path}?{query_params.urlencode()}')
 
+    def export_background(self, request, table=None, columns=None, template=None):
+        """
+        Enqueue a background job to render the export and save it to a file, rather than returning it in the response.
+        The user is notified once the file is ready for download.
+
+        Args:
+            request: The current request
+            table: The Table instance to export as CSV (if any)
+            columns: A list of specific table columns to include. If None, all columns will be exported.
+            template: The ExportTemplate to render (if any). If neither a table nor a template is specified, the
+                objects will be exported as YAML.
+        """
+        model = self.queryset.model
+        verbose_name_plural = model._meta.verbose_name_plural
+        job_kwargs = {}
+        if table is not None:
+            queryset = table.data.data
+            filename = f'netbox_{verbose_name_plural}.csv'
+            content_type = 'text/csv; charset=utf-8'
+            job_kwargs.update({
+                'table': type(table),
+                'exclude_columns': self.get_export_exclude_columns(table, columns),
+            })
+        elif template is not None:
+            queryset = self.queryset
+            filename = template.get_filename(model)
+            content_type = template.mime_type or 'text/plain; charset=utf-8'
+            job_kwargs['template'] = template.pk
+        else:
+            queryset = self.queryset
+            filename = f'netbox_{verbose_name_plural}.yaml'
+            content_type = 'text/yaml'
+
+        job = ExportJob.enqueue(
+            user=request.user,
+            model=model,
+            query=queryset.query,
+            filename=filename,
+            content_type=content_type,
+            compress=request.GET.get('compress', '').lower() == 'true',
+            **job_kwargs
+        )
+        messages.success(
+            request,
+            _("Queued job #{id} to export {model}. You will be notified when the file is ready.").format(
+                id=job.pk,
+                model=verbose_name_plural
+            )
+        )
+
+        # Strip the export parameters and redirect user to the filtered objects list
+        query_params = request.GET.copy()
+        for param in ('export', 'background', 'compress'):
+            query_params.pop(param, None)
+        return redirect(f'{request.path}?{query_params.urlencode()}')
+
     #
     # Request handlers
     #
@@ -143,21 +214,28 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
         has_bulk_actions = any([a.startswith('bulk_') for a in actions])
 
         if 'export' in request.GET:
+            background = request.GET.get('background', '').lower() == 'true'
 
             # Export the current table view
             if request.GET['export'] == 'table':
                 table = self.get_table(self.queryset, request, has_bulk_actions)
                 columns = [name for name, _ in table.selected_columns]
+                if background:
+                    return self.export_background(request, table=table, columns=columns)
                 return self.export_table(table, columns)
 
             # Render an ExportTemplate
             elif request.GET['export']:
                 template = get_object_or_404(ExportTemplate, object_types=object_type, name=request.GET['export'])
+                if background:
+                    return self.export_background(request, template=template)
                 return self.export_template(template, request)
 
             # Check for YAML export support on the model
             elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
+                if background:
+                    return self.export_background(request)
+                response = StreamingHttpResponse(self.export_yaml(), content_type='text/yaml')
                 filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
                 return response
@@ -165,6 +243,8 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             # Fall back to default table/YAML export
             else:
                 table = self.get_table(self.queryset, request, has_bulk_actions)
+                if background:
+                    return self.export_background(request, table=table)
                 return self.export_table(table)
 
         # Render the objects table
@@ -422,10 +502,10 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
             else:
                 # For newly created objects, apply any default custom field values
-                custom_fields = CustomField.objects.filter(
-                    object_types=ContentType.objects.get_for_model(self.queryset.model),
-                    ui_editable=CustomFieldUIEditableChoices.YES
-                )
+                custom_fields = [
+                    cf for cf in get_custom_fields(self.queryset.model)
+                    if cf.ui_editable == CustomFieldUIEditableChoices.YES
+                ]
                 for cf in custom_fields:
                     field_name = f'cf_{cf.name}'
                     if field_name not in record:
@@ -490,7 +570,15 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
             try:
                 # Iterate through data and bind each record to a new model form instance.
-                with transaction.atomic():
+                with transaction.atomic(), ExitStack() as stack:
+
+                    # For MPTT models, rebuild the affected trees once all objects have been saved, rather than
+                    # updating the tree as each is saved (holding the model's advisory lock, if any, throughout)
+                    if isinstance(getattr(model, '_tree_manager', None), TreeManager):
+                        if lock_key := ADVISORY_LOCK_KEYS.get(model._meta.model_name):
+                            stack.enter_context(advisory_lock(lock_key))
+                        stack.enter_context(delay_tree_updates(model))
+
                     new_objs = self.create_and_update_objects(form, request)
 
                     # Enforce object-level permissions
@@ -92,6 +92,8 @@ class Contact(PrimaryModel):
         'group', 'name', 'title', 'phone', 'email', 'address', 'link',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         constraints = (
@@ -61,6 +61,8 @@ class Tenant(ContactsMixin, PrimaryModel):
         'group', 'description',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         constraints = (
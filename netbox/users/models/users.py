@@ -52,6 +52,8 @@ class Group(models.Model):
 
     objects = GroupManager()
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('group')
@@ -1,11 +1,16 @@
+from functools import lru_cache
+from typing import NamedTuple
+
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import (
     FieldDoesNotExist, FieldError, MultipleObjectsReturned, ObjectDoesNotExist, ValidationError,
 )
-from django.db.models.fields.related import ManyToOneRel, RelatedField
+from django.db.models.fields.related import ForeignKey, ManyToOneRel, RelatedField
 from django.urls import reverse
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.reverse import reverse as drf_reverse
 from rest_framework.serializers import Serializer
 from rest_framework.views import get_view_name as drf_get_view_name
 
@@ -15,16 +20,41 @@ from netbox.api.fields import RelatedObjectCountField
 from .query import count_related, dict_to_filter_params
 from .string import title
 
+# The maximum number of serializer query plans to cache (one per combination of serializer and requested fields)
+QUERY_PLAN_CACHE_SIZE = 1024
+
+# A primary key reversed into the URL of an object in place of its own, to be substituted when rendering a ValuesPlan
+URL_PK_SENTINEL = 9223372036854775807
+
 __all__ = (
+    'QueryPlan',
+    'ValuesPlan',
     'get_annotations_for_serializer',
+    'get_display_field',
     'get_graphql_type_for_model',
     'get_prefetches_for_serializer',
+    'get_query_plan_for_serializer',
+    'get_related_fields_for_serializer',
+    'get_related_models_for_serializer',
     'get_related_object_by_attrs',
     'get_serializer_for_model',
+    'get_values_plan_for_serializer',
     'get_view_name',
     'is_api_request',
 )
 
+# Serializer field types which may be rendered directly from a values() query, mapped to the internal types of the
+# model fields they may represent (for which the serializer field's representation is identical to the stored value)
+VALUES_PLAN_FIELD_TYPES = {
+    serializers.BooleanField: ('BooleanField',),
+    serializers.CharField: ('CharField', 'SlugField', 'TextField'),
+    serializers.IntegerField: (
+        'AutoField', 'BigAutoField', 'BigIntegerField', 'IntegerField', 'PositiveBigIntegerField',
+        'PositiveIntegerField', 'PositiveSmallIntegerField', 'SmallAutoField', 'SmallIntegerField',
+    ),
+    serializers.SlugField: ('CharField', 'SlugField'),
+}
+
 
 def get_serializer_for_model(model, prefix=''):
     """
@@ -76,9 +106,11 @@ def get_view_name(view):
     return drf_get_view_name(view)
 
 
-def get_prefetches_for_serializer(serializer_class, fields_to_include=None):
+def get_related_fields_for_serializer(serializer_class, fields_to_include=None):
     """
-    Compile and return a list of fields which should be prefetched on the queryset for a serializer.
+    Compile and return a list of (path, joinable) tuples for all related objects represented by a serializer,
+    including those represented by nested serializers. `joinable` is True if the related object may be retrieved by
+    a join (i.e. every relation along the path is a forward ForeignKey or OneToOneField).
     """
     model = serializer_class.Meta.model
 
@@ -86,7 +118,7 @@ def get_prefetches_for_serializer(serializer_class, fields_to_include=None):
     if not fields_to_include:
         fields_to_include = serializer_class.Meta.fields
 
-    prefetch_fields = []
+    related_fields = []
     for field_name in fields_to_include:
         serializer_field = serializer_class._declared_fields.get(field_name)
 
@@ -99,20 +131,59 @@ def get_prefetches_for_serializer(serializer_class, fields_to_include=None):
         try:
             field = model._meta.get_field(model_field_name)
             if isinstance(field, (RelatedField, ManyToOneRel, GenericForeignKey)):
-                prefetch_fields.append(field.name)
+                joinable = isinstance(field, ForeignKey)
+                related_fields.append((field.name, joinable))
         except FieldDoesNotExist:
             continue
 
-        # If this field is represented by a nested serializer, recurse to resolve prefetches
-        # for the related object.
+        # If this field is represented by a nested serializer, recurse to resolve the related fields of the related
+        # object.
         if serializer_field:
             if issubclass(type(serializer_field), Serializer):
-                # Determine which fields to prefetch for the nested object
+                # Determine which fields to include for the nested object
                 subfields = serializer_field.Meta.brief_fields if serializer_field.nested else None
-                for subfield in get_prefetches_for_serializer(type(serializer_field), subfields):
-                    prefetch_fields.append(f'{field_name}__{subfield}')
+                for subfield, subfield_joinable in get_related_fields_for_serializer(type(serializer_field), subfields):
+                    related_fields.append((f'{field_name}__{subfield}', joinable and subfield_joinable))
+
+    return related_fields
+
 
-    return prefetch_fields
+def get_prefetches_for_serializer(serializer_class, fields_to_include=None):
+    """
+    Compile and return a list of fields which should be prefetched on the queryset for a serializer.
+    """
+    return [
+        path for path, joinable in get_related_fields_for_serializer(serializer_class, fields_to_include)
+    ]
+
+
+@lru_cache(maxsize=QUERY_PLAN_CACHE_SIZE)
+def _get_related_models(serializer_class, fields_to_include):
+    model = serializer_class.Meta.model
+    related_models = set()
+    for path, joinable in get_related_fields_for_serializer(serializer_class, fields_to_include):
+        related_model = model
+        for field_name in path.split('__'):
+            try:
+                related_model = related_model._meta.get_field(field_name).related_model
+            except FieldDoesNotExist:
+                break
+            # Generic foreign keys do not identify a model
+            if related_model is None:
+                break
+            related_models.add(related_model)
+
+    return frozenset(related_models)
+
+
+def get_related_models_for_serializer(serializer_class, fields_to_include=None):
+    """
+    Return the set of models whose objects may be represented as related objects (including those of nested
+    serializers) by a serializer, optionally limited to a subset of its fields.
+    """
+    if fields_to_include:
+        fields_to_include = tuple(sorted(set(fields_to_include)))
+    return _get_related_models(serializer_class, fields_to_include or None)
 
 
 def get_annotations_for_serializer(serializer_class, fields_to_include=None):
@@ -135,6 +206,218 @@ def get_annotations_for_serializer(serializer_class, fields_to_include=None):
     return annotations
 
 
+class QueryPlan(NamedTuple):
+    """
+    The related objects and annotations to be attached to a queryset for a serializer.
+    """
+    select_related: tuple
+    prefetch_related: tuple
+    annotations: dict
+
+    def apply(self, queryset):
+        """
+        Return a copy of the queryset with the plan applied.
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset
+
+
+@lru_cache(maxsize=QUERY_PLAN_CACHE_SIZE)
+def _get_query_plan(serializer_class, fields_to_include):
+    select_related = []
+    prefetch_related = []
+    for path, joinable in get_related_fields_for_serializer(serializer_class, fields_to_include):
+        if joinable:
+            select_related.append(path)
+        else:
+            prefetch_related.append(path)
+
+    return QueryPlan(
+        select_related=tuple(dict.fromkeys(select_related)),
+        prefetch_related=tuple(dict.fromkeys(prefetch_related)),
+        annotations=get_annotations_for_serializer(serializer_class, fields_to_include)
+    )
+
+
+def get_query_plan_for_serializer(serializer_class, fields_to_include=None):
+    """
+    Return the QueryPlan for a serializer, optionally limited to a subset of its fields. Single-valued forward
+    relations (including those of nested serializers) are retrieved by select_related(); all other relations are
+    prefetched. Plans are computed once per combination of serializer and fields, and cached for the life of the
+    process.
+    """
+    if fields_to_include:
+        fields_to_include = tuple(sorted(set(fields_to_include)))
+    return _get_query_plan(serializer_class, fields_to_include or None)
+
+
+class ValuesPlan(NamedTuple):
+    """
+    Describes how a serializer's representation of an object may be built directly from a values() query, without
+    instantiating either the model or the serializer. Each field is a (name, column, view_name) tuple, where
+    view_name is set only for hyperlinked identity fields (whose column is the primary key). `annotations` maps any
+    columns which the view is expected to annotate on the queryset to their permissible internal types.
+    """
+    columns: tuple
+    fields: tuple
+    annotations: dict
+
+    def supports(self, queryset):
+        """
+        Return True if the queryset carries all the annotations required by the plan.
+        """
+        for column, internal_types in self.annotations.items():
+            annotation = queryset.query.annotations.get(column)
+            if annotation is None or annotation.output_field.get_internal_type() not in internal_types:
+                return False
+        return True
+
+    def apply(self, queryset):
+        """
+        Return a values() queryset which retrieves only the columns required by the plan.
+        """
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def render(self, rows, request):
+        """
+        Return a list of dictionaries, identical to the serialized representations of the objects, for the given
+        rows of a values() queryset.
+        """
+        items = []
+        urls = []
+        for name, column, view_name in self.fields:
+            items.append((name, column))
+            if view_name:
+                # Reverse the URL once, and substitute the primary key of each object for the sentinel (unless it
+                # cannot be identified unambiguously, in which case the URL of each object is reversed)
+                url = drf_reverse(view_name, kwargs={'pk': URL_PK_SENTINEL}, request=request)
+                if url.count(str(URL_PK_SENTINEL)) == 1:
+                    urls.append((name, view_name, *url.split(str(URL_PK_SENTINEL))))
+                else:
+                    urls.append((name, view_name, None, None))
+
+        data = []
+        for row in rows:
+            obj = {name: row[column] for name, column in items}
+            for name, view_name, head, tail in urls:
+                if head is None:
+                    obj[name] = drf_reverse(view_name, kwargs={'pk': obj[name]}, request=request)
+                else:
+                    obj[name] = f'{head}{obj[name]}{tail}'
+            data.append(obj)
+
+        return data
+
+
+def get_display_field(model):
+    """
+    Return the name of the field returned by the model's __str__() method, as declared by its `display_field`
+    attribute, or None. A declaration is disregarded if __str__() is overridden by a subclass of the declaring class.
+    """
+    for cls in model.__mro__:
+        if 'display_field' in vars(cls):
+            return cls.display_field
+        if '__str__' in vars(cls):
+            return None
+    return None
+
+
+def _get_values_plan_column(model, source, internal_types):
+    """
+    Return the values() column for the model field identified by `source`, provided that it is a concrete field of
+    one of the specified internal types. Otherwise, return None.
+    """
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+    # Fields which convert values loaded from the database (e.g. to netaddr objects) cannot be rendered directly
+    if not model_field.concrete or model_field.is_relation or hasattr(model_field, 'from_db_value'):
+        return None
+    if model_field.get_internal_type() not in internal_types:
+        return None
+
+    return 'pk' if model_field.primary_key else model_field.attname
+
+
+@lru_cache(maxsize=QUERY_PLAN_CACHE_SIZE)
+def _get_values_plan(serializer_class, fields_to_include):
+    # Avoid circular imports
+    from netbox.api.serializers.base import BaseModelSerializer
+    from netbox.api.serializers.fields import BaseNetBoxHyperlinkedIdentityField
+
+    if not issubclass(serializer_class, BaseModelSerializer):
+        return None
+    if serializer_class.to_representation is not Serializer.to_representation:
+        return None
+
+    model = serializer_class.Meta.model
+    fields = []
+    annotations = {}
+    for name, field in serializer_class(fields=fields_to_include).fields.items():
+        if field.write_only:
+            continue
+
+        # Hyperlinks are derived from the primary key
+        if isinstance(field, BaseNetBoxHyperlinkedIdentityField):
+            if field.lookup_field != 'pk' or field.lookup_url_kwarg != 'pk':
+                return None
+            fields.append((name, 'pk', field.get_view_name(model)))
+
+        # The display value can be retrieved directly if __str__() returns a non-nullable string field
+        elif name == 'display' and isinstance(field, serializers.SerializerMethodField):
+            if serializer_class.get_display is not BaseModelSerializer.get_display:
+                return None
+            display_field = get_display_field(model)
+            internal_types = VALUES_PLAN_FIELD_TYPES[serializers.CharField]
+            if not display_field or not (column := _get_values_plan_column(model, display_field, internal_types)):
+                return None
+            if model._meta.get_field(display_field).null:
+                return None
+            fields.append((name, column, None))
+
+        # Related object counts are annotated on the queryset under the field's name
+        elif type(field) is RelatedObjectCountField:
+            fields.append((name, name, None))
+
+        # Simple model fields, or values annotated on the queryset by the view (e.g. cumulative counts)
+        elif type(field) in VALUES_PLAN_FIELD_TYPES and len(field.source_attrs) == 1:
+            internal_types = VALUES_PLAN_FIELD_TYPES[type(field)]
+            column = _get_values_plan_column(model, field.source, internal_types)
+            if column is None:
+                if not field.read_only or hasattr(model, field.source):
+                    return None
+                column = field.source
+                annotations[column] = internal_types
+            fields.append((name, column, None))
+
+        else:
+            return None
+
+    return ValuesPlan(
+        columns=tuple(dict.fromkeys(['pk', *(column for _, column, _ in fields)])),
+        fields=tuple(fields),
+        annotations=annotations
+    )
+
+
+def get_values_plan_for_serializer(serializer_class, fields_to_include):
+    """
+    Return a ValuesPlan for rendering the specified fields of a serializer, or None if any of the fields cannot be
+    rendered from a values() query (for example, nested serializers, choice fields, or methods). Like query plans,
+    values plans are cached for the life of the process.
+    """
+    if not fields_to_include:
+        return None
+    return _get_values_plan(serializer_class, tuple(sorted(set(fields_to_include))))
+
+
 def get_related_object_by_attrs(queryset, attrs):
     """
     Return an object identified by either a dictionary of attributes or its numeric primary key (ID). This is used
@@ -0,0 +1,80 @@
+import threading
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+__all__ = (
+    'clear_pending_change_counters',
+    'get_change_counters',
+    'increment_change_counter',
+)
+
+# Prefix of the Redis keys which hold the change counter for each model
+CHANGE_COUNTER_KEY_PREFIX = 'changes'
+
+_local = threading.local()
+
+
+def get_change_counter_key(label):
+    return f'{CHANGE_COUNTER_KEY_PREFIX}.{label}'
+
+
+def get_change_counters(labels):
+    """
+    Return a dictionary mapping each of the given model labels (e.g. "dcim.site") to the current value of its change
+    counter. Counters which do not yet exist are seeded with the current time, so that values are not repeated should
+    Redis be flushed.
+    """
+    keys = {get_change_counter_key(label): label for label in labels}
+    values = cache.get_many(keys)
+    for key in keys.keys() - values.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        values[key] = cache.get(key)
+
+    return {
+        keys[key]: value for key, value in values.items()
+    }
+
+
+def _increment(label):
+    key = get_change_counter_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter does not yet exist
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def increment_change_counter(model):
+    """
+    Increment the change counter for a model once the current transaction has been committed (or immediately, if no
+    transaction is open). Each counter is incremented at most once per transaction.
+
+    Args:
+        model: The model (or instance), or the label of an arbitrary counter (e.g. "dcim.rack.123")
+    """
+    label = model if isinstance(model, str) else model._meta.concrete_model._meta.label_lower
+    if not connection.in_atomic_block:
+        _increment(label)
+        return
+
+    # Django replaces its list of commit hooks whenever a transaction is committed or rolled back (fully or to a
+    # savepoint), so the identity of the list indicates whether the counters scheduled thus far remain pending.
+    hooks = connection.run_on_commit
+    if getattr(_local, 'hooks', None) is not hooks:
+        _local.hooks = hooks
+        _local.pending = set()
+    if label not in _local.pending:
+        _local.pending.add(label)
+        transaction.on_commit(partial(_increment, label))
+
+
+def clear_pending_change_counters():
+    """
+    Forget the change counters scheduled to be incremented upon commit of the current transaction, so that they are
+    scheduled anew by subsequent changes. This is intended for tests, which may execute the commit hooks of a
+    transaction (using captureOnCommitCallbacks()) without committing it.
+    """
+    _local.__dict__.clear()
@@ -1,8 +1,11 @@
+from collections import Counter
+
 from django.apps import apps
 from django.db.models import F, Count, OuterRef, Subquery
 from django.db.models.signals import post_delete, post_save, pre_delete
 
 from netbox.registry import registry
+from .changes import increment_change_counter
 from .fields import CounterCacheField
 
 
@@ -21,6 +24,8 @@ def update_counter(model, pk, counter_name, value):
     model.objects.filter(pk=pk).update(
         **{counter_name: F(counter_name) + value}
     )
+    # update() sends no signals, so the model's change counter must be incremented explicitly
+    increment_change_counter(model)
 
 
 def update_counts(model, field_name, related_query):
@@ -41,6 +46,19 @@ def update_counts(model, field_name, related_query):
     })
 
 
+def increment_counters(model, instances):
+    """
+    Increment the counter fields on related objects to account for the creation of the given instances of a model (for
+    example, by bulk_create(), which does not send the post_save signal). Each parent object is updated only once.
+    """
+    for field_name, counter_name in get_counters_for_model(model):
+        parent_model = model._meta.get_field(field_name).related_model
+        counts = Counter(getattr(instance, field_name, None) for instance in instances)
+        counts.pop(None, None)
+        for pk, count in counts.items():
+            update_counter(parent_model, pk, counter_name, count)
+
+
 #
 # Signal handlers
 #
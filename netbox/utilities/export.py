@@ -0,0 +1,75 @@
+import csv
+
+from django.utils.encoding import force_str
+from django_tables2.data import TableQuerysetData
+from django_tables2.rows import BoundRow
+
+from netbox.constants import EXPORT_CHUNK_SIZE
+
+__all__ = (
+    'iter_queryset',
+    'stream_table_csv',
+    'stream_yaml',
+)
+
+
+class Echo:
+    """
+    A file-like object which simply returns the value written to it. This allows csv.writer to produce output
+    incrementally, one row at a time.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_queryset(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterate over a QuerySet in chunks without populating its result cache. Any prefetches are applied per chunk.
+    """
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def get_table_records(table, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Return an iterator over the records underlying a table. Records are streamed from the database if the table is
+    backed by a QuerySet.
+    """
+    if isinstance(table.data, TableQuerysetData):
+        return iter_queryset(table.data.data, chunk_size=chunk_size)
+    return (row.record for row in table.rows)
+
+
+def stream_table_csv(table, exclude_columns=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Render a table as CSV, yielding one line at a time. The output is equivalent to that of django-tables2's
+    TableExport, but objects are retrieved from the database in chunks rather than all at once.
+
+    Args:
+        table: The Table instance to export
+        exclude_columns: An iterable of column names to omit
+        chunk_size: The number of objects to retrieve from the database at a time
+    """
+    exclude_columns = exclude_columns or ()
+    writer = csv.writer(Echo())
+
+    # Resolve the exported columns once, rather than for each row
+    columns = [
+        column for column in table.columns.iterall()
+        if not (column.column.exclude_from_export or column.name in exclude_columns)
+    ]
+    column_names = [column.name for column in columns]
+
+    yield writer.writerow([force_str(column.header, strings_only=True) for column in columns])
+    for record in get_table_records(table, chunk_size=chunk_size):
+        row = BoundRow(record, table=table)
+        yield writer.writerow([
+            force_str(row.get_cell_value(name), strings_only=True) for name in column_names
+        ])
+
+
+def stream_yaml(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Render each object in a QuerySet as a YAML document, yielding one document at a time.
+    """
+    for i, obj in enumerate(iter_queryset(queryset, chunk_size=chunk_size)):
+        yield obj.to_yaml() if not i else f'---\n{obj.to_yaml()}'
@@ -7,6 +7,8 @@ from netbox.config import get_config
 
 __all__ = (
     'DataFileLoader',
+    'render_jinja2',
+    'stream_jinja2',
 )
 
 
@@ -48,10 +50,38 @@ class DataFileLoader(BaseLoader):
 # Utility functions
 #
 
+def get_environment():
+    environment = SandboxedEnvironment()
+    environment.filters.update(get_config().JINJA2_FILTERS)
+    return environment
+
+
 def render_jinja2(template_code, context):
     """
     Render a Jinja2 template with the provided context. Return the rendered content.
     """
-    environment = SandboxedEnvironment()
-    environment.filters.update(get_config().JINJA2_FILTERS)
-    return environment.from_string(source=template_code).render(**context)
+    return get_environment().from_string(source=template_code).render(**context)
+
+
+def stream_jinja2(template_code, context, buffer_size=65536):
+    """
+    Render a Jinja2 template with the provided context, yielding the rendered content in pieces of approximately
+    `buffer_size` characters as it is produced. The template is compiled immediately, so that syntax errors are raised
+    before iteration begins.
+    """
+    template = get_environment().from_string(source=template_code)
+
+    def _generate():
+        buffer = []
+        length = 0
+        for chunk in template.generate(**context):
+            buffer.append(chunk)
+            length += len(chunk)
+            if length >= buffer_size:
+                yield ''.join(buffer)
+                buffer = []
+                length = 0
+        if buffer:
+            yield ''.join(buffer)
+
+    return _generate()
@@ -1,14 +1,60 @@
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
 from mptt.managers import TreeManager as TreeManager_
 from mptt.querysets import TreeQuerySet as TreeQuerySet_
 
-from django.db.models import Manager
+from django.db import transaction
+from django.db.models import Case, Manager, Q, Value, When
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from .querysets import RestrictedQuerySet
 
 __all__ = (
     'TreeManager',
     'TreeQuerySet',
+    'delay_tree_updates',
+    'tree_updates_delayed',
 )
 
+# Mapping of each model for which tree updates are being delayed to a dictionary mapping the PK of each node saved to
+# its prior tree ID (or None, if the node was created)
+delayed_nodes = ContextVar('delayed_nodes', default=None)
+
+# Number of nodes updated per query when rebuilding trees
+REBUILD_BATCH_SIZE = 1000
+
+
+@receiver(post_save)
+def record_delayed_node(sender, instance, created, **kwargs):
+    """
+    Record the saving of a node while tree updates are being delayed for its model.
+    """
+    if (delayed := delayed_nodes.get()) is None or sender not in delayed:
+        return
+    tree_id = None if created else getattr(instance, sender._mptt_meta.tree_id_attr)
+    delayed[sender].setdefault(instance.pk, tree_id)
+
+
+@contextmanager
+def delay_tree_updates(*models):
+    """
+    Delay the updating of the trees of the given MPTT models while nodes are created or moved within the context (see
+    TreeManager.delay_tree_updates()).
+    """
+    with ExitStack() as stack:
+        for model in models:
+            stack.enter_context(model._tree_manager.delay_tree_updates())
+        yield
+
+
+def tree_updates_delayed(model):
+    """
+    Return True if the updating of the tree of the given MPTT model is being delayed (see delay_tree_updates()).
+    """
+    return model._tree_manager.model in (delayed_nodes.get() or {})
+
 
 class TreeQuerySet(TreeQuerySet_, RestrictedQuerySet):
     """
@@ -21,4 +67,234 @@ class TreeManager(Manager.from_queryset(TreeQuerySet), TreeManager_):
     """
     Extend django-mptt's TreeManager to incorporate RestrictedQuerySet().
     """
-    pass
+
+    def bulk_create_nodes(self, nodes):
+        """
+        Create new nodes using bulk_create(), having computed their MPTT fields (tree ID, left and right values, and
+        level) in memory, rather than saving each node individually. Each node must be a root node, a child of another
+        of the given nodes, or a child of an existing node.
+
+        Each new root node is assigned a new tree. The new children of an existing node are appended as its last
+        children, having made space for them within its tree (one query per existing parent). Otherwise, siblings are
+        ordered as given (order_insertion_by is not applied). The nodes are created one level at a time, so that each
+        parent has been assigned a primary key before its children are created.
+
+        Returns the list of nodes created.
+        """
+        opts = self.model._mptt_meta
+        parent_field = self.model._meta.get_field(opts.parent_attr)
+        nodes = list(nodes)
+        new_nodes = {id(node) for node in nodes}
+
+        roots = []
+        children = defaultdict(list)
+        existing_parents = {}
+        existing_children = defaultdict(list)
+        for node in nodes:
+            parent = parent_field.get_cached_value(node, default=None)
+            parent_id = getattr(node, parent_field.attname)
+            if parent is not None and id(parent) in new_nodes:
+                children[id(parent)].append(node)
+            elif parent_id is None:
+                roots.append(node)
+            else:
+                existing_parents.setdefault(parent_id, parent)
+                existing_children[parent_id].append(node)
+
+        def count(node):
+            return 1 + sum(count(child) for child in children[id(node)])
+
+        def populate(node, tree_id, level, left):
+            setattr(node, opts.tree_id_attr, tree_id)
+            setattr(node, opts.level_attr, level)
+            setattr(node, opts.left_attr, left)
+            right = left + 1
+            for child in children[id(node)]:
+                right = populate(child, tree_id, level + 1, right) + 1
+            setattr(node, opts.right_attr, right)
+            return right
+
+        with transaction.atomic(using=self.db):
+
+            # Append subtrees to existing nodes, making space for them to the left of each parent's right value
+            for parent_id, subtree_roots in existing_children.items():
+                tree_id, right, level = self.filter(pk=parent_id).values_list(
+                    opts.tree_id_attr, opts.right_attr, opts.level_attr
+                ).get()
+                size = sum(count(node) for node in subtree_roots) * 2
+                self._create_space(size, right - 1, tree_id)
+                left = right
+                for node in subtree_roots:
+                    left = populate(node, tree_id, level + 1, left) + 1
+                if (parent := existing_parents[parent_id]) is not None:
+                    setattr(parent, opts.right_attr, right + size)
+
+            # Assign each new root node a new tree
+            if roots:
+                tree_id = self._get_next_tree_id()
+                for i, root in enumerate(roots):
+                    populate(root, tree_id + i, 0, 1)
+
+            for level in sorted({getattr(node, opts.level_attr) for node in nodes}):
+                self.bulk_create([node for node in nodes if getattr(node, opts.level_attr) == level])
+
+        return nodes
+
+    @contextmanager
+    def delay_tree_updates(self):
+        """
+        Delay the updating of the tree while nodes are created or moved within the context, then rebuild only those
+        trees affected upon exit (see rebuild_trees()). This avoids rewriting the left and right values of much of the
+        table upon each insertion, as when importing many nodes.
+
+        As with django-mptt's delay_mptt_updates(), the MPTT fields of nodes (and so the results of methods such as
+        get_descendants()) are unreliable until the context has exited. The trees are not rebuilt if an exception is
+        raised. Nodes must not be deleted within the context.
+        """
+        delayed = delayed_nodes.get()
+        if delayed is not None and self.model in delayed:
+            # Updates are already being delayed
+            yield
+            return
+
+        delayed = {**(delayed or {}), self.model: {}}
+        token = delayed_nodes.set(delayed)
+        try:
+            with self.disable_mptt_updates():
+                yield
+        finally:
+            delayed_nodes.reset(token)
+
+        nodes = delayed[self.model]
+        self.rebuild_trees(
+            tree_ids={tree_id for tree_id in nodes.values() if tree_id is not None},
+            nodes=nodes.keys()
+        )
+
+    def get_ancestor_ids(self, pk):
+        """
+        Return the PKs of the given node and each of its ancestors (nearest first) by following the parent of each in
+        turn. Unlike get_ancestors(), this does not rely upon the tree fields, which are unreliable while tree updates
+        are being delayed. The walk stops should a node be encountered twice (i.e. the parents form a cycle).
+
+        :param pk: The PK of a node (or None)
+        """
+        parent_attname = self.model._meta.get_field(self.model._mptt_meta.parent_attr).attname
+        pks = []
+        while pk is not None and pk not in pks:
+            pks.append(pk)
+            pk = self.filter(pk=pk).values_list(parent_attname, flat=True).first()
+        return pks
+
+    def rebuild_trees(self, tree_ids=(), nodes=()):
+        """
+        Rebuild the given trees, and those containing the given nodes (which may have been created or moved without
+        updating the tree), as django-mptt's partial_rebuild() would. The MPTT fields of all nodes in these trees are
+        computed in memory, and only those nodes whose fields have changed are updated.
+
+        Root nodes are ordered by order_insertion_by (if defined) like their children, and so all trees are renumbered
+        if a root node has been created out of order. Otherwise, new trees are assigned the next available tree IDs.
+
+        Raises ValueError if any of the nodes is not reachable from a root node (i.e. its parents form a cycle).
+
+        :param tree_ids: An iterable of tree IDs
+        :param nodes: An iterable of nodes (or their PKs)
+        """
+        opts = self.model._mptt_meta
+        parent_attname = self.model._meta.get_field(opts.parent_attr).attname
+        tree_ids = set(tree_ids)
+        pks = {getattr(node, 'pk', node) for node in nodes}
+
+        # Determine the trees to be rebuilt, including those of any existing nodes to which nodes have been moved
+        parents = {}
+        query = Q(pk__in=pks) | Q(**{f'{opts.tree_id_attr}__in': tree_ids})
+        while True:
+            parents.update(self.filter(query).values_list('pk', parent_attname))
+            missing = {parent_id for parent_id in parents.values() if parent_id and parent_id not in parents}
+            parent_tree_ids = set(
+                self.filter(pk__in=missing).values_list(opts.tree_id_attr, flat=True)
+            ) - tree_ids
+            if not parent_tree_ids:
+                break
+            tree_ids |= parent_tree_ids
+            query = Q(**{f'{opts.tree_id_attr}__in': parent_tree_ids})
+
+        # Retrieve the nodes of the trees, with each node's children in order
+        values = {}
+        children = defaultdict(list)
+        queryset = self.filter(Q(pk__in=pks) | Q(**{f'{opts.tree_id_attr}__in': tree_ids})).order_by(
+            *opts.order_insertion_by, 'pk'
+        ).values_list('pk', parent_attname, opts.tree_id_attr, opts.left_attr, opts.right_attr, opts.level_attr)
+        for pk, parent_id, *tree_fields in queryset:
+            values[pk] = tuple(tree_fields)
+            if parent_id:
+                children[parent_id].append(pk)
+
+        # Determine the ID of each tree. Root nodes whose trees are not being rebuilt have unique tree IDs, as do
+        # those which have not been moved.
+        roots = list(self.filter(**{parent_attname: None}).order_by(
+            *(opts.order_insertion_by or (opts.tree_id_attr,)), 'pk'
+        ).values_list('pk', opts.tree_id_attr))
+        counts = Counter(tree_id for pk, tree_id in roots)
+        current_ids = {pk: tree_id for pk, tree_id in roots if tree_id and counts[tree_id] == 1}
+        if len(current_ids) == len(roots) and list(current_ids.values()) == sorted(current_ids.values()):
+            root_ids = current_ids
+        elif opts.order_insertion_by:
+            root_ids = {pk: i for i, (pk, tree_id) in enumerate(roots, start=1)}
+        else:
+            next_tree_id = self._get_next_tree_id()
+            root_ids = {}
+            for pk, tree_id in roots:
+                if pk in current_ids:
+                    root_ids[pk] = tree_id
+                else:
+                    root_ids[pk] = next_tree_id
+                    next_tree_id += 1
+
+        updated_nodes = []
+        populated = set()
+
+        def populate(pk, tree_id, level, left):
+            populated.add(pk)
+            right = left + 1
+            for child in children[pk]:
+                right = populate(child, tree_id, level + 1, right) + 1
+            if values[pk] != (tree_id, left, right, level):
+                updated_nodes.append(self.model(pk=pk, **{
+                    opts.tree_id_attr: tree_id,
+                    opts.left_attr: left,
+                    opts.right_attr: right,
+                    opts.level_attr: level,
+                }))
+            return right
+
+        for pk, tree_id in roots:
+            if pk in values:
+                populate(pk, root_ids[pk], 0, 1)
+        if unreachable := values.keys() - populated:
+            raise ValueError(
+                f"Cannot rebuild trees of {self.model._meta.verbose_name_plural}: the parents of nodes "
+                f"{sorted(unreachable)} form a cycle."
+            )
+
+        with transaction.atomic(using=self.db):
+
+            # Renumber any other trees
+            renumbered = {
+                tree_id: root_ids[pk] for pk, tree_id in roots if pk not in values and root_ids[pk] != tree_id
+            }
+            if renumbered:
+                self.filter(**{f'{opts.tree_id_attr}__in': renumbered}).update(**{
+                    opts.tree_id_attr: Case(
+                        *[
+                            When(**{opts.tree_id_attr: old_id}, then=Value(new_id))
+                            for old_id, new_id in renumbered.items()
+                        ]
+                    )
+                })
+
+            self.bulk_update(
+                updated_nodes,
+                [opts.tree_id_attr, opts.left_attr, opts.right_attr, opts.level_attr],
+                batch_size=REBUILD_BATCH_SIZE
+            )
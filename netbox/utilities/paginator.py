@@ -1,20 +1,43 @@
+from functools import cached_property
+
 from django.core.paginator import Paginator, Page
+from django_tables2.data import TableQuerysetData
 
 from netbox.config import get_config
+from utilities.query import get_queryset_count
 
 __all__ = (
+    'CountedTableQuerysetData',
     'EnhancedPage',
     'EnhancedPaginator',
     'get_paginate_count',
 )
 
 
+class CountedTableQuerysetData(TableQuerysetData):
+    """
+    Table data backed by a QuerySet, which may be counted approximately when the table is paginated (see
+    APPROXIMATE_COUNTS) unless `exact_count` is set. `count_is_exact` indicates whether the count is exact.
+    """
+    exact_count = False
+    count_is_exact = True
+
+    def __len__(self):
+        if not hasattr(self.table, 'paginator'):
+            return super().__len__()
+        if not hasattr(self, '_count'):
+            self._count, self.count_is_exact = get_queryset_count(self.data, exact=self.exact_count)
+        return self._count
+
+
 class EnhancedPaginator(Paginator):
     default_page_lengths = (
         25, 50, 100, 250, 500, 1000
     )
 
-    def __init__(self, object_list, per_page, orphans=None, **kwargs):
+    def __init__(self, object_list, per_page, orphans=None, exact_count=False, **kwargs):
+        self.exact_count = exact_count
+        self.count_is_exact = True
 
         # Determine the page size
         try:
@@ -32,6 +55,19 @@ class EnhancedPaginator(Paginator):
 
         super().__init__(object_list, per_page, orphans=orphans, **kwargs)
 
+    @cached_property
+    def count(self):
+        # Table rows backed by a QuerySet may be counted approximately (see CountedTableQuerysetData)
+        table_data = getattr(self.object_list, 'data', None)
+        if not isinstance(table_data, CountedTableQuerysetData):
+            return super().count
+
+        table_data.exact_count = self.exact_count
+        count = super().count
+        self.count_is_exact = table_data.count_is_exact
+
+        return count
+
     def _get_page(self, *args, **kwargs):
         return EnhancedPage(*args, **kwargs)
 
@@ -0,0 +1,172 @@
+import datetime
+import re
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+
+__all__ = (
+    'Partition',
+    'create_default_partition',
+    'create_monthly_partition',
+    'drop_partition',
+    'ensure_monthly_partitions',
+    'get_partitions',
+    'is_partitioned',
+    'month_start',
+    'next_month',
+)
+
+DEFAULT_PARTITION_SUFFIX = 'default'
+MONTHLY_PARTITION_RE = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+@dataclass
+class Partition:
+    """
+    A single partition of a table which has been partitioned by range on a timestamp column. The default partition
+    (which catches any rows not covered by a range partition) has neither a start nor an end.
+    """
+    name: str
+    start: datetime.datetime | None = None
+    end: datetime.datetime | None = None
+
+    @property
+    def is_default(self):
+        return self.start is None
+
+
+def month_start(value):
+    """
+    Return the first instant (in UTC) of the month in which the given datetime falls.
+    """
+    value = value.astimezone(datetime.timezone.utc)
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def next_month(value, months=1):
+    """
+    Return the first instant of the month which begins the specified number of months after the given month start.
+    """
+    year, month = divmod(value.month - 1 + months, 12)
+    return value.replace(year=value.year + year, month=month + 1)
+
+
+def _partition_name(table, start):
+    return f'{table}_y{start.year:04d}m{start.month:02d}'
+
+
+def is_partitioned(table):
+    """
+    Return True if the given database table has been declaratively partitioned.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions(table):
+    """
+    Return all partitions attached to the given table, ordered by start time. Partition bounds are derived from the
+    naming scheme applied by create_monthly_partition(). The default partition (if any) is listed last.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+            [table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    default = None
+    for name in names:
+        if name.endswith(f'_{DEFAULT_PARTITION_SUFFIX}'):
+            default = Partition(name=name)
+        elif match := MONTHLY_PARTITION_RE.search(name):
+            start = datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)
+            partitions.append(Partition(name=name, start=start, end=next_month(start)))
+    partitions.sort(key=lambda p: p.start)
+    if default is not None:
+        partitions.append(default)
+
+    return partitions
+
+
+def create_default_partition(table, parent=None):
+    """
+    Attach a default partition to the given table (if one does not already exist). The default partition receives any
+    rows which fall outside the range partitions, ensuring that writes never fail for lack of a partition.
+    """
+    parent = parent or table
+    name = f'{table}_{DEFAULT_PARTITION_SUFFIX}'
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{parent}" DEFAULT')
+
+    return Partition(name=name)
+
+
+def create_monthly_partition(table, start, column='time', parent=None):
+    """
+    Create the partition covering the month in which `start` falls (if it does not already exist). `table` determines
+    the name of the partition; `parent` may be specified to attach it to a differently-named parent table (e.g. while
+    the table is being migrated).
+
+    Any rows which have already been written to the default partition for this range are moved into the new partition
+    before it is attached.
+    """
+    parent = parent or table
+    start = month_start(start)
+    end = next_month(start)
+    name = _partition_name(table, start)
+    default_name = f'{table}_{DEFAULT_PARTITION_SUFFIX}'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return Partition(name=name, start=start, end=end)
+
+        cursor.execute("SELECT to_regclass(%s)", [default_name])
+        has_default = cursor.fetchone()[0] is not None
+
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{parent}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        if has_default:
+            cursor.execute(
+                f'WITH moved AS ('
+                f'DELETE FROM "{default_name}" WHERE "{column}" >= %s AND "{column}" < %s RETURNING *'
+                f') INSERT INTO "{name}" SELECT * FROM moved',
+                [start, end]
+            )
+        cursor.execute(
+            f'ALTER TABLE "{parent}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)',
+            [start, end]
+        )
+
+    return Partition(name=name, start=start, end=end)
+
+
+def ensure_monthly_partitions(table, start, end, column='time', parent=None):
+    """
+    Create any missing monthly partitions covering the period from `start` through `end` (inclusive). Returns a list
+    of all partitions within the period.
+    """
+    partitions = []
+    month = month_start(start)
+    while month <= end:
+        partitions.append(create_monthly_partition(table, month, column=column, parent=parent))
+        month = next_month(month)
+
+    return partitions
+
+
+def drop_partition(partition):
+    """
+    Drop a partition along with all of its rows.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE "{partition.name}"')
@@ -1,9 +1,19 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
 from django.db.models import Count, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 
 __all__ = (
     'count_related',
     'dict_to_filter_params',
+    'estimate_count',
+    'estimate_table_count',
+    'get_annotation_models',
+    'get_queryset_count',
 )
 
 
@@ -54,3 +64,94 @@ def dict_to_filter_params(d, prefix=''):
         else:
             params[k] = val
     return params
+
+
+def estimate_count(queryset):
+    """
+    Return the PostgreSQL query planner's estimate of the number of rows the given QuerySet will return. This is far
+    cheaper than an exact COUNT(*) on large tables, but may deviate from the true count (particularly when the table's
+    statistics are stale).
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_table_count(model, using='default'):
+    """
+    Return the approximate number of rows in the model's database table, as recorded in the table's statistics
+    (pg_class.reltuples). Returns None if no statistics are available (e.g. if the table has never been analyzed).
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+
+    return int(row[0])
+
+
+def get_annotation_models(queryset):
+    """
+    Return the set of models queried by any subqueries (e.g. related object counts) among the annotations of a
+    QuerySet.
+    """
+    models = set()
+    expressions = list(queryset.query.annotations.values())
+    while expressions:
+        expression = expressions.pop()
+        if isinstance(expression, Subquery):
+            models.add(expression.query.model)
+            expressions.extend(expression.query.annotations.values())
+        expressions.extend(expression.get_source_expressions())
+
+    return models
+
+
+def get_approximate_count_timeout(model):
+    """
+    Return the cache timeout (in seconds) configured for approximate counts of the given model under
+    APPROXIMATE_COUNTS, or None if counts for the model are always exact.
+    """
+    label = f'{model._meta.app_label}.{model._meta.model_name}'
+    if label in settings.APPROXIMATE_COUNTS:
+        return settings.APPROXIMATE_COUNTS[label]
+    return settings.APPROXIMATE_COUNTS.get('*')
+
+
+def get_queryset_count(queryset, exact=False):
+    """
+    Return a tuple of the number of objects in the QuerySet, and a boolean indicating whether that number is exact.
+
+    Counts are exact unless the QuerySet's model has been designated in APPROXIMATE_COUNTS. For these models:
+
+        * The count of an unfiltered QuerySet is taken from the table's statistics.
+        * The count of a filtered QuerySet is cached for the configured timeout. The cache key is derived from the
+          compiled query, and thus reflects both the applied filters and any permission constraints.
+
+    Set `exact` to force an exact count.
+    """
+    timeout = get_approximate_count_timeout(queryset.model)
+    if exact or timeout is None:
+        return queryset.count(), True
+
+    if not queryset.query.where:
+        if (count := estimate_table_count(queryset.model, using=queryset.db)) is not None:
+            return count, False
+
+    if not timeout:
+        return queryset.count(), True
+    sql, params = queryset.order_by().query.sql_with_params()
+    query_hash = hashlib.sha256(f'{sql}{params}'.encode()).hexdigest()
+    cache_key = f'count:{queryset.model._meta.label_lower}:{query_hash}'
+    if (count := cache.get(cache_key)) is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+        return count, True
+
+    return count, False
@@ -1,14 +1,22 @@
+from django.apps import apps
+from django.db import connection
 from django.test import Client, TestCase, override_settings
-from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_script_prefix, reverse, set_script_prefix
 from rest_framework import status
+from rest_framework.test import APIRequestFactory
 
 from core.models import ObjectType
-from dcim.models import Region, Site
+from dcim.api.serializers import DeviceTypeSerializer, InterfaceSerializer, RegionSerializer, SiteSerializer
+from dcim.choices import InterfaceTypeChoices
+from dcim.models import Interface, Rack, Region, Site
+from extras.caching import definition_cache
 from extras.choices import CustomFieldTypeChoices
 from extras.models import CustomField
 from ipam.models import VLAN
 from netbox.config import get_config
-from utilities.testing import APITestCase, disable_warnings
+from utilities.api import get_display_field, get_query_plan_for_serializer, get_values_plan_for_serializer
+from utilities.testing import APITestCase, create_test_device, disable_warnings
 
 
 class WritableNestedSerializerTest(APITestCase):
@@ -232,6 +240,121 @@ class APIOrderingTestCase(APITestCase):
         )
 
 
+class APIQueryPlanTestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        # Ensure that custom field definitions are retrieved from the cache
+        definition_cache._local.pending = False
+
+    def test_query_plan(self):
+        plan = get_query_plan_for_serializer(InterfaceSerializer)
+
+        # Single-valued forward relations (including those of nested objects) are joined
+        self.assertIn('device', plan.select_related)
+        self.assertIn('module__module_type__manufacturer', plan.select_related)
+        self.assertNotIn('device', plan.prefetch_related)
+
+        # Reverse and many-to-many relations are prefetched
+        self.assertIn('tagged_vlans', plan.prefetch_related)
+        self.assertIn('tags', plan.prefetch_related)
+
+        # Plans are cached per combination of serializer and fields
+        self.assertIs(plan, get_query_plan_for_serializer(InterfaceSerializer))
+        self.assertIs(
+            get_query_plan_for_serializer(InterfaceSerializer, ['id', 'device']),
+            get_query_plan_for_serializer(InterfaceSerializer, ['device', 'id'])
+        )
+        self.assertEqual(
+            get_query_plan_for_serializer(InterfaceSerializer, ['id', 'device']).select_related,
+            ('device',)
+        )
+
+    def test_list_queries(self):
+        device = create_test_device('Device 1')
+        vlan = VLAN.objects.create(vid=100, name='VLAN 100')
+        lag = Interface.objects.create(device=device, name='LAG 1', type=InterfaceTypeChoices.TYPE_LAG)
+        Interface.objects.bulk_create([
+            Interface(device=device, name=f'Interface {i}', lag=lag, untagged_vlan=vlan, mode='access')
+            for i in range(1, 11)
+        ])
+        self.add_permissions('dcim.view_interface')
+        url = reverse('dcim-api:interface-list')
+
+        # Warm the caches
+        self.client.get(url, **self.header)
+
+        # The number of queries must not depend on the number of objects
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'{url}?limit=5', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        with self.assertNumQueries(len(ctx.captured_queries)):
+            response = self.client.get(url, **self.header)
+
+        # Forward relations are retrieved by joins rather than separate queries
+        for query in ctx.captured_queries:
+            self.assertFalse(query['sql'].startswith(('SELECT "dcim_device"', 'SELECT "ipam_vlan"')), query['sql'])
+        self.assertEqual(response.data['results'][1]['lag']['id'], lag.pk)
+        self.assertEqual(response.data['results'][1]['untagged_vlan']['id'], vlan.pk)
+
+
+    def test_values_plan(self):
+        self.assertEqual(get_display_field(Site), 'name')
+        self.assertIsNone(get_display_field(Rack))
+
+        plan = get_values_plan_for_serializer(SiteSerializer, SiteSerializer.Meta.brief_fields)
+        self.assertEqual(plan.columns, ('pk', 'name', 'slug', 'description'))
+        self.assertEqual(plan.fields[:3], (
+            ('id', 'pk', None),
+            ('url', 'pk', 'dcim-api:site-detail'),
+            ('display', 'name', None),
+        ))
+        self.assertIs(plan, get_values_plan_for_serializer(SiteSerializer, reversed(SiteSerializer.Meta.brief_fields)))
+
+        # Values annotated by the view must be present on the queryset
+        plan = get_values_plan_for_serializer(RegionSerializer, RegionSerializer.Meta.brief_fields)
+        self.assertFalse(plan.supports(Region.objects.all()))
+        self.assertTrue(plan.supports(Region.objects.add_related_count(
+            Region.objects.all(), Site, 'region', 'site_count', cumulative=True
+        )))
+
+        # Nested objects & choice fields require the serializer
+        self.assertIsNone(get_values_plan_for_serializer(DeviceTypeSerializer, DeviceTypeSerializer.Meta.brief_fields))
+        self.assertIsNone(get_values_plan_for_serializer(SiteSerializer, ['id', 'status']))
+        self.assertIsNone(get_values_plan_for_serializer(SiteSerializer, None))
+
+    def test_values_plan_render(self):
+        sites = (
+            Site.objects.create(name='Site 1', slug='site-1'),
+            Site.objects.create(name='Site 2', slug='site-2'),
+        )
+        plan = get_values_plan_for_serializer(SiteSerializer, SiteSerializer.Meta.brief_fields)
+        request = APIRequestFactory().get('/')
+
+        # URLs must be rendered correctly regardless of the path under which NetBox is served
+        for script_prefix in ('/', '/1/'):
+            set_script_prefix(script_prefix)
+            try:
+                data = plan.render(Site.objects.order_by('pk').values(*plan.columns), request)
+                self.assertEqual(data, SiteSerializer(
+                    sites, many=True, nested=True, fields=SiteSerializer.Meta.brief_fields,
+                    context={'request': request}
+                ).data)
+                self.assertEqual(data[0]['url'], f'http://testserver{script_prefix}api/dcim/sites/{sites[0].pk}/')
+            finally:
+                clear_script_prefix()
+
+    def test_display_field(self):
+        """
+        The display field declared by a model must be the value returned by its __str__() method.
+        """
+        for model in apps.get_models():
+            if display_field := get_display_field(model):
+                with self.subTest(model=model):
+                    self.assertEqual(str(model(**{display_field: 'Display Value'})), 'Display Value')
+
+
 class APIDocsTestCase(TestCase):
 
     def setUp(self):
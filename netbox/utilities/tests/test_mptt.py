@@ -0,0 +1,112 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from dcim.models import Region
+from utilities.mptt import delay_tree_updates
+
+
+class TreeManagerTest(TestCase):
+
+    def get_tree_fields(self):
+        return list(Region.objects.order_by('pk').values_list('name', 'parent', 'tree_id', 'lft', 'rght', 'level'))
+
+    def test_bulk_create_nodes(self):
+        # Create an existing tree
+        region_a = Region.objects.create(name='Region A', slug='region-a')
+        region_a1 = Region.objects.create(name='Region A1', slug='region-a1', parent=region_a)
+        Region.objects.create(name='Region A2', slug='region-a2', parent=region_a)
+
+        # Create new subtrees beneath existing nodes, and a new tree
+        region_b = Region(name='Region B', slug='region-b')
+        region_b1 = Region(name='Region B1', slug='region-b1', parent=region_b)
+        regions = (
+            Region(name='Region A1a', slug='region-a1a', parent=region_a1),
+            Region(name='Region A3', slug='region-a3', parent=region_a),
+            region_b,
+            region_b1,
+            Region(name='Region B1a', slug='region-b1a', parent=region_b1),
+            Region(name='Region B2', slug='region-b2', parent=region_b),
+        )
+        with self.assertNumQueries(10):
+            Region.objects.bulk_create_nodes(regions)
+
+        # Confirm that the tree fields match those of a rebuilt tree
+        tree_fields = self.get_tree_fields()
+        Region.objects.rebuild()
+        self.assertEqual(tree_fields, self.get_tree_fields())
+        self.assertEqual(region_a1.get_descendants().get().name, 'Region A1a')
+        self.assertEqual([r.name for r in regions[4].get_ancestors()], ['Region B', 'Region B1'])
+
+    def test_delay_tree_updates(self):
+        # Create existing trees
+        region_b = Region.objects.create(name='Region B', slug='region-b')
+        region_b1 = Region.objects.create(name='Region B1', slug='region-b1', parent=region_b)
+        region_d = Region.objects.create(name='Region D', slug='region-d')
+        region_d1 = Region.objects.create(name='Region D1', slug='region-d1', parent=region_d)
+        Region.objects.create(name='Region D1a', slug='region-d1a', parent=region_d1)
+        region_f = Region.objects.create(name='Region F', slug='region-f')
+        Region.objects.create(name='Region F1', slug='region-f1', parent=region_f)
+        region_f_tree = list(region_f.get_descendants(include_self=True).values_list('pk', 'tree_id', 'lft', 'rght'))
+
+        with delay_tree_updates(Region):
+            # Create a new tree (ordered before existing trees), and new nodes within an existing tree
+            region_a = Region.objects.create(name='Region A', slug='region-a')
+            Region.objects.create(name='Region A1', slug='region-a1', parent=region_a)
+            Region.objects.create(name='Region B0', slug='region-b0', parent=region_b)
+            Region.objects.create(name='Region B1a', slug='region-b1a', parent=region_b1)
+
+            # Move a subtree to another tree, and make an existing node a root node
+            region_d1.parent = region_b
+            region_d1.save()
+            region_b1.parent = None
+            region_b1.save()
+
+            # Trees are not updated within the context
+            self.assertEqual(Region.objects.get(pk=region_d1.pk).tree_id, region_d.tree_id)
+
+        # Confirm that an untouched tree was renumbered but otherwise left intact
+        region_f.refresh_from_db()
+        self.assertEqual(
+            list(region_f.get_descendants(include_self=True).values_list('pk', 'tree_id', 'lft', 'rght')),
+            [(pk, tree_id + 2, lft, rght) for pk, tree_id, lft, rght in region_f_tree]
+        )
+
+        # Confirm that the tree fields match those of a rebuilt tree
+        tree_fields = self.get_tree_fields()
+        Region.objects.rebuild()
+        self.assertEqual(tree_fields, self.get_tree_fields())
+        self.assertEqual(
+            [r.name for r in Region.objects.get(name='Region B').get_descendants()],
+            ['Region B0', 'Region D1', 'Region D1a']
+        )
+
+    def test_delay_tree_updates_exception(self):
+        region_a = Region.objects.create(name='Region A', slug='region-a')
+
+        # Trees are not rebuilt if an exception is raised
+        with self.assertRaises(ValueError):
+            with Region.objects.delay_tree_updates():
+                Region.objects.create(name='Region A1', slug='region-a1', parent=region_a)
+                raise ValueError()
+        region_a.refresh_from_db()
+        self.assertEqual(region_a.rght, 2)
+
+    def test_delay_tree_updates_cycle(self):
+        region_a = Region.objects.create(name='Region A', slug='region-a')
+        region_b = Region.objects.create(name='Region B', slug='region-b')
+
+        # Parent cycles are detected despite the tree fields being stale
+        with self.assertRaises(ValidationError):
+            with delay_tree_updates(Region):
+                region_a.parent = region_b
+                region_a.full_clean()
+                region_a.save()
+                region_b.parent = region_a
+                region_b.full_clean()
+        self.assertIsNone(Region.objects.get(pk=region_b.pk).parent)
+
+        # Rebuilding trees in which the parents of nodes form a cycle fails
+        Region.objects.filter(pk=region_a.pk).update(parent=region_b)
+        Region.objects.filter(pk=region_b.pk).update(parent=region_a)
+        with self.assertRaises(ValueError):
+            Region.objects.rebuild_trees(nodes=[region_a, region_b])
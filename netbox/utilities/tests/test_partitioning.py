@@ -0,0 +1,60 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+
+from utilities.partitioning import *
+
+TABLE = 'test_partitioned'
+UTC = datetime.timezone.utc
+
+
+class PartitioningTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE "{TABLE}" (id integer, time timestamptz NOT NULL) PARTITION BY RANGE (time)')
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            return cursor.fetchone()[0]
+
+    def test_next_month(self):
+        start = datetime.datetime(2024, 11, 1, tzinfo=UTC)
+        self.assertEqual(next_month(start), datetime.datetime(2024, 12, 1, tzinfo=UTC))
+        self.assertEqual(next_month(start, 2), datetime.datetime(2025, 1, 1, tzinfo=UTC))
+        self.assertEqual(next_month(start, 14), datetime.datetime(2026, 1, 1, tzinfo=UTC))
+
+    def test_create_partitions(self):
+        self.assertTrue(is_partitioned(TABLE))
+        partitions = ensure_monthly_partitions(
+            TABLE,
+            start=datetime.datetime(2024, 11, 15, tzinfo=UTC),
+            end=datetime.datetime(2025, 1, 1, tzinfo=UTC)
+        )
+        create_default_partition(TABLE)
+
+        self.assertEqual([p.name for p in partitions], [
+            f'{TABLE}_y2024m11',
+            f'{TABLE}_y2024m12',
+            f'{TABLE}_y2025m01',
+        ])
+        self.assertEqual(get_partitions(TABLE), [*partitions, Partition(name=f'{TABLE}_default')])
+
+    def test_default_partition_rows_moved(self):
+        create_default_partition(TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO "{TABLE}" VALUES (1, %s), (2, %s)', [
+                datetime.datetime(2024, 6, 10, tzinfo=UTC),
+                datetime.datetime(2024, 7, 10, tzinfo=UTC),
+            ])
+
+        partition = create_monthly_partition(TABLE, datetime.datetime(2024, 6, 1, tzinfo=UTC))
+        self.assertEqual(self.count_rows(partition.name), 1)
+        self.assertEqual(self.count_rows(f'{TABLE}_default'), 1)
+
+        drop_partition(partition)
+        self.assertEqual(self.count_rows(TABLE), 1)
+        self.assertEqual([p.name for p in get_partitions(TABLE)], [f'{TABLE}_default'])
@@ -106,6 +106,8 @@ class Cluster(ContactsMixin, PrimaryModel):
         'virtualization.ClusterType',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ['name']
         constraints = (
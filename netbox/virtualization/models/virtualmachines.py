@@ -152,6 +152,8 @@ class VirtualMachine(ContactsMixin, ImageAttachmentsMixin, RenderConfigMixin, Co
         'virtualization.Cluster',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('_name', 'pk')  # Name may be non-unique
         constraints = (
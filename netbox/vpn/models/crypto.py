@@ -54,6 +54,8 @@ class IKEProposal(PrimaryModel):
         'authentication_method', 'encryption_algorithm', 'authentication_algorithm', 'group', 'sa_lifetime',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('IKE proposal')
@@ -99,6 +101,8 @@ class IKEPolicy(PrimaryModel):
         'vpn.IKEProposal',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('IKE policy')
@@ -159,6 +163,8 @@ class IPSecProposal(PrimaryModel):
         'encryption_algorithm', 'authentication_algorithm', 'sa_lifetime_seconds', 'sa_lifetime_data',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('IPSec proposal')
@@ -204,6 +210,8 @@ class IPSecPolicy(PrimaryModel):
         'vpn.IPSecProposal',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('IPSec policy')
@@ -245,6 +253,8 @@ class IPSecProfile(PrimaryModel):
         'vpn.IPSecPolicy',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         verbose_name = _('IPSec profile')
@@ -78,6 +78,8 @@ class Tunnel(PrimaryModel):
         'status', 'encapsulation', 'ipsec_profile', 'tenant',
     )
 
+    display_field = 'name'
+
     class Meta:
         ordering = ('name',)
         constraints = (
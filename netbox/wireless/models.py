@@ -111,6 +111,8 @@ class WirelessLAN(WirelessAuthenticationBase, PrimaryModel):
 
     clone_fields = ('ssid', 'group', 'tenant', 'description')
 
+    display_field = 'ssid'
+
     class Meta:
         ordering = ('ssid', 'pk')
         verbose_name = _('wireless LAN')